@@ -5,6 +5,7 @@ Sistema completo de gestión de proyectos y tareas
 """
 
 import os
+import click
 from flask import Flask, render_template, redirect, url_for
 from flask_login import LoginManager, login_required, current_user
 from config import config
@@ -19,8 +20,56 @@ def create_app(config_name='default'):
     # Cargar configuración
     app.config.from_object(config[config_name])
     
+    # Detrás de proxies de confianza, remote_addr es la IP del cliente (X-Forwarded-For)
+    proxies = app.config.get('PROXY_FIX_X_FOR', 0)
+    if proxies:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+    
     # Inicializar extensiones
+    from utils.db_tuning import configure_engine_options, init_db_tuning
+    configure_engine_options(app)
     db.init_app(app)
+    init_db_tuning(app, db)
+    
+    from utils.replica import init_read_replica
+    init_read_replica(app, db)
+    
+    # Modelos auxiliares (tablas derivadas y eventos de escritura)
+    import models.counters
+    import models.indexes
+    import models.changes
+    import models.bootstrap
+    import models.deadlines
+    import models.archive
+    import models.digests
+    from models.search import ensure_index
+    with app.app_context():
+        ensure_index(app, db.engine)
+    
+    from utils.cache import init_stats_cache
+    init_stats_cache(app)
+    
+    from utils.identity import init_identity_cache
+    identity_cache = init_identity_cache(app)
+    
+    from utils.reports import init_reports
+    init_reports(app, config_name)
+    
+    from utils.passwords import init_password_hasher
+    init_password_hasher(app)
+    
+    from utils.throttle import init_login_throttle
+    init_login_throttle(app)
+    
+    from utils.profiling import init_profiling
+    init_profiling(app)
+    
+    from utils.fragments import init_fragment_cache
+    init_fragment_cache(app)
+    
+    from utils.digests import init_digests
+    init_digests(app)
     
     # Configurar Flask-Login
     login_manager = LoginManager()
@@ -31,7 +80,7 @@ def create_app(config_name='default'):
     
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return identity_cache.load(int(user_id))
     
     # Registrar blueprints
     from routes import register_blueprints
@@ -73,6 +122,205 @@ def create_app(config_name='default'):
         db.create_all()
         print('✓ Base de datos inicializada')
     
+    @app.cli.command()
+    def rebuild_counters():
+        """Recalcula la tabla de contadores de tareas"""
+        from models.counters import rebuild_counters as rebuild
+        rows = rebuild()
+        db.session.commit()
+        print(f'✓ Contadores recalculados ({rows} filas)')
+    
+    @app.cli.command()
+    def create_indexes():
+        """Crea los índices de los caminos calientes en una base de datos existente"""
+        from models.indexes import create_missing_indexes
+        names = create_missing_indexes()
+        print(f'✓ Índices comprobados ({len(names)})')
+    
+    @app.cli.command()
+    def check_query_plans():
+        """Falla si alguna consulta caliente recorre una tabla completa (SQLite)"""
+        from utils.query_plan import check_query_plans as check
+        violations = check()
+        for violation in violations:
+            print(f"✗ {violation['query']}: {'; '.join(violation['scans'])}")
+            print(f"  {violation['sql']}")
+        if violations:
+            raise SystemExit(1)
+        print('✓ Ninguna consulta caliente recorre tablas completas')
+    
+    @app.cli.command()
+    def resume_reports():
+        """Genera los informes PDF que quedaron en cola o a medias tras una caída"""
+        from utils.reports import get_report_service
+        service = get_report_service()
+        service.queue.requeue_stale(service.stale_after)
+        pending = service.queue.pending_ids()
+        for job_id in pending:
+            service.execute(job_id)
+        purged = service.queue.purge(older_than=7 * 24 * 3600)
+        print(f'✓ Informes generados: {len(pending)} (trabajos antiguos borrados: {purged})')
+    
+    @app.cli.command()
+    @click.option('--days', default=30, show_default=True, help='Antigüedad mínima de los cambios a borrar')
+    def prune_changes(days):
+        """Borra el registro de cambios antiguo (los clientes más atrasados harán resincronización completa)"""
+        from datetime import datetime, timedelta
+        from models.changes import prune_changes as prune
+        removed = prune(datetime.now() - timedelta(days=days))
+        print(f'✓ Cambios borrados: {removed}')
+    
+    @app.cli.command()
+    @click.option('--target-ms', default=250, show_default=True, help='Latencia objetivo por hash')
+    def benchmark_kdf(target_ms):
+        """Calibra el coste de bcrypt para este host"""
+        from utils.passwords import calibrate
+        rounds, timings = calibrate(target_ms)
+        for cost, ms in timings.items():
+            print(f'  coste {cost:>2}: {ms} ms')
+        print(f"✓ Coste recomendado: BCRYPT_LOG_ROUNDS={rounds} (actual: {app.config.get('BCRYPT_LOG_ROUNDS', 12)})")
+    
+    @app.cli.command()
+    @click.option('--users', default=1000, show_default=True)
+    @click.option('--projects', default=5000, show_default=True)
+    @click.option('--tasks', default=100000, show_default=True)
+    @click.option('--seed', default=42, show_default=True, help='Semilla del generador aleatorio')
+    def seed_scale(users, projects, tasks, seed):
+        """Genera datos a escala de producción con distribuciones sesgadas"""
+        import time
+        from utils.seed import seed_scale as generate, SEED_PASSWORD, USERNAME_PREFIX
+        if users < 1 or projects < 1:
+            print('✗ Se necesita al menos un usuario y un proyecto')
+            return
+        start = time.perf_counter()
+        counts = generate(users, projects, tasks, seed=seed)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {counts['users']} usuarios, {counts['projects']} proyectos y {counts['tasks']} tareas en {elapsed:.1f}s")
+        print(f'  Usuarios: {USERNAME_PREFIX}N / {SEED_PASSWORD}')
+    
+    @app.cli.command()
+    @click.option('--iterations', default=100, show_default=True)
+    @click.option('--baseline', default='benchmark_baseline.json', show_default=True)
+    @click.option('--save', is_flag=True, help='Guardar los resultados como nueva línea base')
+    @click.option('--tolerance', default=0.2, show_default=True, help='Empeoramiento de p95 admitido')
+    def benchmark(iterations, baseline, save, tolerance):
+        """Mide las rutas calientes y las compara con la línea base"""
+        from utils.benchmarks import compare, load_baseline, run_benchmarks, save_baseline
+        results = run_benchmarks(app, iterations=iterations)
+        print(f"{'escenario':<18}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>9}")
+        for name, stats in results.items():
+            print(f"{name:<18}{stats['throughput_rps']:>10}{stats['p50_ms']:>10}"
+                  f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['errors']:>9}")
+        
+        if save:
+            save_baseline(baseline, results)
+            print(f'✓ Línea base guardada en {baseline}')
+            return
+        
+        reference = load_baseline(baseline)
+        if reference is None:
+            print(f'  Sin línea base en {baseline} (usa --save para crearla)')
+            return
+        regressions = compare(results, reference, tolerance)
+        for item in regressions:
+            print(f"✗ {item['scenario']}: p95 {item['p95_ms']} ms frente a {item['baseline_p95_ms']} ms (x{item['ratio']})")
+        if regressions:
+            raise SystemExit(1)
+        print('✓ Sin regresiones frente a la línea base')
+    
+    @app.cli.command()
+    def db_check():
+        """Muestra la configuración efectiva del motor y del pool de conexiones"""
+        from utils.db_tuning import effective_settings
+        print(f"  URI: {db.engine.url.render_as_string(hide_password=True)}")
+        for key, value in effective_settings(db.engine).items():
+            print(f'  {key}: {value}')
+        for bind_key, engine in db.engines.items():
+            if bind_key is None:
+                continue
+            print(f"  [{bind_key}] {engine.url.render_as_string(hide_password=True)}")
+            for key, value in effective_settings(engine).items():
+                print(f'    {key}: {value}')
+    
+    @app.cli.command()
+    @click.option('--batch-size', default=1000, show_default=True)
+    def reindex(batch_size):
+        """Reconstruye el índice de búsqueda por lotes"""
+        from models.search import fts_enabled, reindex as rebuild
+        if not fts_enabled():
+            print('✗ FTS5 no disponible: la búsqueda usa LIKE y no necesita índice')
+            return
+        print(f'✓ Documentos indexados: {rebuild(batch_size)}')
+    
+    @app.cli.command()
+    @click.option('--rebuild', is_flag=True, help='Reconstruir la tabla completa desde tasks')
+    def sweep_deadlines(rebuild):
+        """Actualiza los cubos de vencimiento (programar cada pocos minutos)"""
+        from models.deadlines import rebuild as rebuild_all, sweep
+        if rebuild:
+            print(f'✓ Cubos reconstruidos ({rebuild_all()} tareas abiertas con fecha límite)')
+        else:
+            print(f'✓ Tareas movidas de cubo: {sweep()}')
+    
+    @app.cli.command()
+    @click.option('--older-than', default=365, show_default=True, help='Días desde que se completó la tarea')
+    @click.option('--batch-size', default=1000, show_default=True)
+    @click.option('--limit', type=int, default=None, help='Máximo de tareas a mover en esta ejecución')
+    @click.option('--rebuild-counters', is_flag=True, help='Recalcular los totales del archivo y salir')
+    def archive(older_than, batch_size, limit, rebuild_counters):
+        """Mueve al archivo las tareas completadas de proyectos archivados"""
+        from datetime import datetime, timedelta
+        from models.archive import archive_tasks, rebuild_archive_counters
+        if rebuild_counters:
+            print(f'✓ Contadores del archivo recalculados ({rebuild_archive_counters()} filas)')
+            return
+        result = archive_tasks(datetime.now() - timedelta(days=older_than), batch_size, limit)
+        print(f"✓ Tareas archivadas: {result['tasks']} en {result['batches']} lotes")
+    
+    @app.cli.command()
+    @click.option('--window-hours', type=int, default=None, help='Horizonte de vencimiento (por defecto DIGEST_WINDOW_HOURS)')
+    def send_digests(window_hours):
+        """Envía los resúmenes de tareas próximas a vencer (idempotente: programar con cron)"""
+        from datetime import datetime
+        from models.digests import prune_sent
+        from utils.digests import get_digest_service
+        service = get_digest_service()
+        if window_hours is not None:
+            service.window_hours = window_hours
+        totals = service.run()
+        prune_sent(datetime.now())
+        print(f"✓ Resúmenes enviados: {totals['users']} ({totals['tasks']} tareas)")
+        if totals['skipped'] or totals['failed']:
+            print(f"  Ya enviados por otra ejecución: {totals['skipped']}  fallidos: {totals['failed']}")
+    
+    @app.cli.command()
+    @click.option('--baseline', default='startup_baseline.json', show_default=True)
+    @click.option('--save', is_flag=True, help='Guardar la medición como nueva línea base')
+    def startup_benchmark(baseline, save):
+        """Mide el arranque en frío de un worker (-X importtime) y su memoria"""
+        import json
+        from utils.startup_bench import measure_startup
+        report = measure_startup()
+        print(f"  create_app: {report['create_app_seconds']}s  imports: {report['import_seconds']}s")
+        print(f"  RSS máximo: {report['max_rss_kb'] // 1024} MiB  módulos: {report['modules']}")
+        print(f"  reportlab cargado: {'sí' if report['reportlab_loaded'] else 'no'}")
+        for item in report['slowest_imports']:
+            print(f"    {item['cumulative_ms']:>8} ms  {item['module']}")
+        
+        if save:
+            with open(baseline, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f'✓ Línea base guardada en {baseline}')
+            return
+        try:
+            with open(baseline, 'r', encoding='utf-8') as f:
+                reference = json.load(f)
+        except FileNotFoundError:
+            return
+        for key in ('create_app_seconds', 'max_rss_kb'):
+            change = (report[key] - reference[key]) / reference[key] * 100 if reference[key] else 0
+            print(f'  {key}: {reference[key]} -> {report[key]} ({change:+.1f}%)')
+    
     @app.cli.command()
     def create_admin():
         """Crea un usuario administrador"""
@@ -91,7 +339,8 @@ def create_app(config_name='default'):
             full_name=full_name,
             role='admin'
         )
-        admin.set_password(password)
+        from utils.passwords import set_user_password
+        set_user_password(admin, password)
         
         db.session.add(admin)
         db.session.commit()
@@ -111,7 +360,8 @@ def create_app(config_name='default'):
                 full_name='Usuario Demo',
                 role='user'
             )
-            demo_user.set_password('Demo123!')
+            from utils.passwords import set_user_password
+            set_user_password(demo_user, 'Demo123!')
             db.session.add(demo_user)
             db.session.commit()
             
@@ -197,14 +447,21 @@ def main():
     # Crear aplicación
     app = create_app(config_name)
     
-    # Crear tablas si no existen
+    # Crear tablas si no existen y recuperar los informes que quedaron pendientes
     with app.app_context():
         db.create_all()
+        app.extensions['reports'].recover(deployment=f'dev:{os.getpid()}')
     
     # Configuración del servidor
     host = os.getenv('HOST', '0.0.0.0')
     port = int(os.getenv('PORT', 5000))
-    debug = os.getenv('DEBUG', 'True').lower() == 'true'
+    # El depurador interactivo ejecuta código arbitrario: solo con DEBUG=True explícito y nunca en producción
+    debug = os.getenv('DEBUG', 'False').lower() == 'true' and config_name != 'production'
+    
+    # Programador de resúmenes: con el recargador solo en el proceso hijo que sirve
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from utils.digests import start_digest_scheduler
+        start_digest_scheduler(app)
     
     print(f"""
     ╔══════════════════════════════════════════════════════════╗
@@ -223,6 +480,23 @@ def main():
     - flask init-db      : Inicializar base de datos
     - flask create-admin : Crear usuario administrador
     - flask seed-data    : Crear datos de ejemplo
+    - flask rebuild-counters : Recalcular contadores de tareas
+    - flask create-indexes   : Crear índices en una base existente
+    - flask check-query-plans : Detectar recorridos completos de tablas
+    - flask resume-reports   : Generar informes PDF pendientes
+    - flask prune-changes    : Borrar el registro de cambios antiguo
+    - flask benchmark-kdf    : Calibrar el coste de bcrypt
+    - flask seed-scale       : Generar datos de carga
+    - flask benchmark        : Medir rutas calientes frente a la línea base
+    - flask db-check         : Ver la configuración efectiva del motor
+    - flask reindex          : Reconstruir el índice de búsqueda
+    - flask sweep-deadlines  : Actualizar los cubos de vencimiento
+    - flask startup-benchmark : Medir arranque en frío y memoria por worker
+    - flask archive          : Archivar tareas completadas antiguas
+    - flask send-digests     : Enviar resúmenes de vencimientos
+    
+    Servidor de desarrollo. En producción, desde el directorio del proyecto:
+                gunicorn -c gunicorn.conf.py wsgi:app
     
     Presiona Ctrl+C para detener el servidor
     """)
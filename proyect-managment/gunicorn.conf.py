@@ -0,0 +1,62 @@
+"""
+Configuración de gunicorn para producción
+Workers e hilos según los núcleos, preload de la aplicación y calentamiento por worker
+
+Recarga sin cortar peticiones:
+- kill -HUP <master>: arranca workers nuevos y cierra los viejos tras terminar sus peticiones
+  (con preload_app el código no se recarga; para desplegar código nuevo usar USR2 y luego
+  QUIT sobre el master antiguo)
+"""
+
+import multiprocessing
+import os
+
+_cores = multiprocessing.cpu_count()
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+# Workers síncronos con hilos: bcrypt y SQLite liberan el GIL
+workers = int(os.getenv('WEB_CONCURRENCY', _cores * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Importar la aplicación y la configuración una sola vez antes del fork
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Reciclar workers periódicamente (con jitter para que no reinicien todos a la vez)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+def post_fork(server, worker):
+    """Las conexiones abiertas en el master no se pueden compartir entre procesos"""
+    from models import db
+    from wsgi import app
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+def post_worker_init(worker):
+    """Calentar el pool de conexiones y las consultas antes de aceptar tráfico"""
+    from utils.warmup import warm_up
+    from wsgi import app
+    report = warm_up(app)
+    worker.log.info('Worker %s calentado: %s', worker.pid, report)
+
+    # Informes huérfanos de un reinicio o caída: los recupera solo el primer worker de este master
+    with app.app_context():
+        resumed = app.extensions['reports'].recover(deployment=f'gunicorn:{worker.ppid}')
+    if resumed is not None:
+        worker.log.info('Informes pendientes reenviados: %s', resumed)
+
+    # El programador de resúmenes vive en un worker, no en el master: un hilo arrancado antes
+    # del fork no pasa a los hijos. Solo lo arranca el worker que obtiene el cerrojo; si ese
+    # worker se recicla o cae, su sustituto lo toma al arrancar
+    from utils.digests import start_digest_scheduler
+    if start_digest_scheduler(app) is not None:
+        worker.log.info('Programador de resúmenes en el worker %s', worker.pid)
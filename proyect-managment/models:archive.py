@@ -0,0 +1,226 @@
+"""
+Archivo frío de tareas completadas de proyectos archivados
+'flask archive' las mueve por lotes a archived_tasks y deja en archive_totals un resumen por proyecto
+y en archive_counters los totales por creador y por usuario que las veía; las consultas habituales
+solo ven tasks (task_counters incluido) y los totales de las vistas suman estos contadores
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from sqlalchemy import case, delete, func, insert, literal, select, union, update
+from models import db, Project, Task
+from models.changes import DELETE, record_changes
+from models.counters import record_task
+from models.events import notify_users_changed
+from models.search import remove_from_index
+
+BATCH_SIZE = 1000
+
+TASK_COLUMNS = (
+    'id', 'title', 'description', 'priority', 'status', 'project_id', 'created_by',
+    'assigned_to', 'due_date', 'created_at', 'updated_at', 'completed_at'
+)
+
+class ArchivedTask(db.Model):
+    """Copia de la fila de Task con el dueño del proyecto para filtrar sin unir con projects"""
+    __tablename__ = 'archived_tasks'
+    __table_args__ = (
+        db.Index('ix_archived_tasks_owner_updated_id', 'owner_id', 'updated_at', 'id'),
+        db.Index('ix_archived_tasks_assigned_updated_id', 'assigned_to', 'updated_at', 'id'),
+        db.Index('ix_archived_tasks_project_id', 'project_id')
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    priority = db.Column(db.String(20))
+    status = db.Column(db.String(20))
+    project_id = db.Column(db.Integer, nullable=False)
+    created_by = db.Column(db.Integer)
+    assigned_to = db.Column(db.Integer)
+    due_date = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    owner_id = db.Column(db.Integer, nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+class ArchiveTotal(db.Model):
+    """Resumen por proyecto de lo archivado: sirve los totales sin leer archived_tasks"""
+    __tablename__ = 'archive_totals'
+    __table_args__ = (
+        db.Index('ix_archive_totals_owner_id', 'owner_id'),
+    )
+
+    project_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    owner_id = db.Column(db.Integer, nullable=False)
+    tasks = db.Column(db.Integer, nullable=False, default=0)
+    first_completed_at = db.Column(db.DateTime)
+    last_completed_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime)
+
+class ArchiveCounter(db.Model):
+    """Tareas archivadas por ámbito: 'creator' (created_by) y 'visible' (dueño del proyecto o asignado)"""
+    __tablename__ = 'archive_counters'
+
+    scope = db.Column(db.String(10), primary_key=True)
+    scope_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    tasks = db.Column(db.Integer, nullable=False, default=0)
+
+def _candidates(cutoff, after_id, batch_size):
+    """Siguiente lote de tareas archivables por id (completadas antes de cutoff en proyectos archivados)"""
+    return db.session.execute(
+        select(
+            Task.id, Task.project_id, Project.owner_id, Task.assigned_to,
+            Task.created_by, Task.completed_at, Task.status, Task.priority, Task.due_date
+        ).join(Project, Task.project_id == Project.id).where(
+            Project.status == 'archived',
+            Project.updated_at < cutoff,
+            Task.status == 'completed',
+            Task.completed_at < cutoff,
+            Task.id > after_id
+        ).order_by(Task.id).limit(batch_size)
+    ).all()
+
+def _extend(column, value, earlier):
+    """Mínimo (earlier) o máximo entre la columna y value; NULL cuenta como ausente"""
+    if value is None:
+        return column
+    return case(
+        (column.is_(None), value),
+        ((column > value) if earlier else (column < value), value),
+        else_=column
+    )
+
+def _add_totals(connection, rows, now):
+    table = ArchiveTotal.__table__
+    per_project = defaultdict(list)
+    for row in rows:
+        per_project[(row.project_id, row.owner_id)].append(row.completed_at)
+
+    for (project_id, owner_id), dates in per_project.items():
+        known = [d for d in dates if d is not None]
+        first, last = (min(known), max(known)) if known else (None, None)
+        result = connection.execute(
+            update(table).where(table.c.project_id == project_id).values(
+                tasks=table.c.tasks + len(dates),
+                first_completed_at=_extend(table.c.first_completed_at, first, earlier=True),
+                last_completed_at=_extend(table.c.last_completed_at, last, earlier=False),
+                archived_at=now
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(
+                project_id=project_id, owner_id=owner_id, tasks=len(dates),
+                first_completed_at=first, last_completed_at=last, archived_at=now
+            ))
+
+def _add_counters(connection, rows):
+    """Suma el lote a los contadores por ámbito; 'visible' cuenta una vez por usuario y tarea"""
+    table = ArchiveCounter.__table__
+    deltas = Counter()
+    for row in rows:
+        if row.created_by is not None:
+            deltas[('creator', row.created_by)] += 1
+        for user_id in {row.owner_id, row.assigned_to} - {None}:
+            deltas[('visible', user_id)] += 1
+
+    for (scope, scope_id), delta in deltas.items():
+        condition = (table.c.scope == scope) & (table.c.scope_id == scope_id)
+        result = connection.execute(update(table).where(condition).values(tasks=table.c.tasks + delta))
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(scope=scope, scope_id=scope_id, tasks=delta))
+
+def _move(rows, now):
+    """Copia, resume y borra un lote en una transacción y la confirma"""
+    connection = db.session.connection()
+    ids = [row.id for row in rows]
+
+    source = select(
+        *[getattr(Task, name) for name in TASK_COLUMNS], Project.owner_id, literal(now)
+    ).join(Project, Task.project_id == Project.id).where(Task.id.in_(ids))
+    connection.execute(
+        insert(ArchivedTask.__table__).from_select(list(TASK_COLUMNS) + ['owner_id', 'archived_at'], source)
+    )
+    _add_totals(connection, rows, now)
+    _add_counters(connection, rows)
+    connection.execute(delete(Task.__table__).where(Task.__table__.c.id.in_(ids)))
+
+    # Para los clientes sincronizados la tarea sale del conjunto activo igual que un borrado;
+    # al estar completada no tiene fila en task_deadlines
+    # Un INSERT (executemany) por conjunto de usuarios: las tareas de un proyecto suelen compartirlo
+    by_users = defaultdict(list)
+    for row in rows:
+        row_users = frozenset(uid for uid in (row.owner_id, row.assigned_to, row.created_by) if uid is not None)
+        by_users[row_users].append(row.id)
+    for row_users, task_ids in by_users.items():
+        record_changes(connection, 'task', task_ids, DELETE, row_users)
+    users = set().union(*by_users)
+    remove_from_index(connection, Task, ids)
+    # Las tareas salen de task_counters con los mismos deltas que un borrado
+    for row in rows:
+        record_task(connection, {
+            'status': row.status, 'priority': row.priority, 'due_date': row.due_date,
+            'project_id': row.project_id, 'created_by': row.created_by, 'assigned_to': row.assigned_to
+        }, -1)
+    db.session.commit()
+    notify_users_changed(users)
+
+def archive_tasks(cutoff, batch_size=BATCH_SIZE, limit=None, now=None):
+    """Mueve al archivo las tareas elegibles por lotes de batch_size; devuelve tareas y lotes
+
+    Cada lote es una transacción corta: el proceso puede interrumpirse y reanudarse
+    """
+    now = now or datetime.now()
+    moved = batches = last_id = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        rows = _candidates(cutoff, last_id, size)
+        if not rows:
+            break
+        _move(rows, now)
+        moved += len(rows)
+        batches += 1
+        last_id = rows[-1].id
+    return {'tasks': moved, 'batches': batches}
+
+def rebuild_archive_counters():
+    """Recalcula archive_counters desde archived_tasks con un GROUP BY por ámbito"""
+    table = ArchiveCounter.__table__
+    db.session.execute(delete(table))
+    creators = select(
+        literal('creator'), ArchivedTask.created_by, func.count()
+    ).where(ArchivedTask.created_by.isnot(None)).group_by(ArchivedTask.created_by)
+    # Dueño y asignado por tarea sin duplicar cuando coinciden
+    visible_rows = union(
+        select(ArchivedTask.id, ArchivedTask.owner_id.label('user_id')),
+        select(ArchivedTask.id, ArchivedTask.assigned_to.label('user_id')).where(
+            ArchivedTask.assigned_to.isnot(None)
+        )
+    ).subquery()
+    visible = select(
+        literal('visible'), visible_rows.c.user_id, func.count()
+    ).group_by(visible_rows.c.user_id)
+    for query in (creators, visible):
+        db.session.execute(insert(table).from_select(['scope', 'scope_id', 'tasks'], query))
+    db.session.commit()
+    return db.session.execute(select(func.count()).select_from(table)).scalar()
+
+def visible_archived_ids(user_id):
+    """Ids archivados de sus proyectos UNION ids archivados asignados a él"""
+    owned = select(ArchivedTask.id).where(ArchivedTask.owner_id == user_id)
+    assigned = select(ArchivedTask.id).where(ArchivedTask.assigned_to == user_id)
+    return union(owned, assigned)
+
+def archived_count(scope, user_id):
+    """Tareas archivadas del usuario en el ámbito ('creator' o 'visible'); lectura por clave primaria"""
+    counter = db.session.get(ArchiveCounter, (scope, user_id))
+    return counter.tasks if counter else 0
+
+def archived_totals(user_id):
+    """Tareas archivadas que el usuario veía (de sus proyectos o asignadas a él)"""
+    return archived_count('visible', user_id)
+
+def project_archive_total(project_id):
+    """Resumen archivado de un proyecto (None si no tiene tareas archivadas)"""
+    return db.session.get(ArchiveTotal, project_id)
@@ -0,0 +1,35 @@
+"""
+Marcas de arranque de la aplicación
+Una fila por clave: la restricción de clave primaria decide qué transacción gana
+"""
+
+from sqlalchemy import exists, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from models import db, User
+
+FIRST_ADMIN = 'first_admin'
+
+class AppBootstrap(db.Model):
+    __tablename__ = 'app_bootstrap'
+
+    key = db.Column(db.String(50), primary_key=True)
+    user_id = db.Column(db.Integer)
+
+def claim_first_admin(user_id):
+    """True si el usuario recién insertado es el primero y obtiene el rol de administrador
+
+    Inserta la marca solo si no hay otros usuarios; si dos registros compiten,
+    el segundo INSERT choca con la clave primaria y se revierte solo su savepoint
+    """
+    table = AppBootstrap.__table__
+    others = exists().where(User.id != user_id)
+    stmt = insert(table).from_select(
+        ['key', 'user_id'],
+        select(literal(FIRST_ADMIN), literal(user_id)).where(~others)
+    )
+    try:
+        with db.session.begin_nested():
+            claimed = db.session.execute(stmt).rowcount == 1
+    except IntegrityError:
+        return False
+    return claimed
@@ -0,0 +1,127 @@
+"""
+Registro de cambios de Project y Task para la sincronización incremental
+Cada escritura añade, en la misma transacción, una fila por usuario afectado con una secuencia monótona
+
+La secuencia solo es visible en orden en SQLite, donde las escrituras se serializan. En PostgreSQL o
+MySQL una transacción con la secuencia N puede confirmarse después de que N+1 sea visible: allí el
+feed solo sirve filas con más de CHANGE_FEED_SETTLE_SECONDS (transacciones más largas pueden perderse)
+"""
+
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, func, insert, select, update
+from models import db, Project, Task
+from models.events import affected_users
+
+UPSERT, DELETE = 'upsert', 'delete'
+
+ENTITIES = {
+    Project: 'project',
+    Task: 'task'
+}
+
+class ChangeLog(db.Model):
+    """Una fila por (cambio, usuario afectado); seq es el token de sincronización"""
+    __tablename__ = 'change_log'
+    __table_args__ = (
+        db.Index('ix_change_log_user_seq', 'user_id', 'seq'),
+        {'sqlite_autoincrement': True}
+    )
+
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    entity = db.Column(db.String(10), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    # Hora local de la aplicación, la misma que usa prune_changes para el corte
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+class ChangeLogState(db.Model):
+    """Marca persistente de la poda: la secuencia más alta borrada del registro"""
+    __tablename__ = 'change_log_state'
+
+    key = db.Column(db.String(20), primary_key=True)
+    seq = db.Column(db.Integer, nullable=False, default=0)
+
+_PRUNED = 'pruned'
+
+def record_changes(connection, entity, entity_ids, op, user_ids):
+    """Añade las filas del registro para escrituras que no pasan por el ORM"""
+    rows = [
+        {'user_id': user_id, 'entity': entity, 'entity_id': entity_id, 'op': op}
+        for entity_id in entity_ids
+        for user_id in user_ids
+        if user_id is not None
+    ]
+    if rows:
+        connection.execute(insert(ChangeLog.__table__), rows)
+
+def _listener(op):
+    def _record(mapper, connection, target):
+        record_changes(
+            connection, ENTITIES[mapper.class_], [target.id], op,
+            affected_users(connection, target)
+        )
+    return _record
+
+for _model in ENTITIES:
+    event.listen(_model, 'after_insert', _listener(UPSERT))
+    event.listen(_model, 'after_update', _listener(UPSERT))
+    event.listen(_model, 'after_delete', _listener(DELETE))
+
+def _settled_before():
+    """Corte de changed_at por debajo del cual todas las filas están confirmadas (None en SQLite)"""
+    if db.engine.dialect.name == 'sqlite':
+        return None
+    return datetime.now() - timedelta(seconds=current_app.config.get('CHANGE_FEED_SETTLE_SECONDS', 30))
+
+def current_token(user_id=None, settled=False):
+    """Última secuencia registrada (del usuario o global), nunca anterior a la marca de poda
+
+    Con settled=True (tokens que se entregan a clientes) no pasa del corte de confirmación
+    """
+    query = select(func.max(ChangeLog.seq))
+    if user_id is not None:
+        query = query.where(ChangeLog.user_id == user_id)
+    horizon = _settled_before() if settled else None
+    if horizon is not None:
+        query = query.where(ChangeLog.changed_at < horizon)
+    return max(db.session.execute(query).scalar() or 0, oldest_token())
+
+def oldest_token():
+    """Token más antiguo aceptado: los anteriores a la última poda exigen resincronización completa
+
+    Se guarda la secuencia podada en lugar de mirar el mínimo del registro, que queda
+    vacío tras una poda completa y dejaría pasar cualquier token antiguo
+    """
+    state = db.session.get(ChangeLogState, _PRUNED)
+    return state.seq if state else 0
+
+def changes_since(user_id, since, limit=500):
+    """Filas del registro del usuario posteriores al token, en orden de secuencia y ya asentadas"""
+    query = select(ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.op).where(
+        ChangeLog.user_id == user_id, ChangeLog.seq > since
+    )
+    horizon = _settled_before()
+    if horizon is not None:
+        query = query.where(ChangeLog.changed_at < horizon)
+    return db.session.execute(query.order_by(ChangeLog.seq).limit(limit + 1)).all()
+
+def prune_changes(before):
+    """Borra las filas registradas antes de la fecha indicada y avanza la marca de poda"""
+    table = ChangeLog.__table__
+    pruned_seq = db.session.execute(
+        select(func.max(table.c.seq)).where(table.c.changed_at < before)
+    ).scalar()
+    if pruned_seq is None:
+        return 0
+
+    result = db.session.execute(table.delete().where(table.c.seq <= pruned_seq))
+    state = ChangeLogState.__table__
+    updated = db.session.execute(
+        update(state).where(state.c.key == _PRUNED, state.c.seq < pruned_seq).values(seq=pruned_seq)
+    )
+    if updated.rowcount == 0 and db.session.get(ChangeLogState, _PRUNED) is None:
+        db.session.execute(insert(state).values(key=_PRUNED, seq=pruned_seq))
+    db.session.commit()
+    return result.rowcount
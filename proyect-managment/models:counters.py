@@ -0,0 +1,209 @@
+"""
+Contadores desnormalizados de tareas por proyecto y por usuario
+Se mantienen en la misma transacción que cada escritura de Task
+"""
+
+from sqlalchemy import case, event, func, inspect, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from models import db, Task
+
+TRACKED_STATUSES = ('pending', 'in_progress', 'completed')
+TRACKED_PRIORITIES = ('high', 'medium', 'low')
+
+# Ámbito del contador -> columna de Task que lo identifica
+SCOPES = {
+    'project': 'project_id',
+    'creator': 'created_by',
+    'assignee': 'assigned_to'
+}
+
+class TaskCounter(db.Model):
+    """Totales por estado y prioridad de un proyecto o usuario (clave: ámbito + id)"""
+    __tablename__ = 'task_counters'
+
+    scope = db.Column(db.String(10), primary_key=True)
+    scope_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    in_progress = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    open_high = db.Column(db.Integer, nullable=False, default=0)
+    open_medium = db.Column(db.Integer, nullable=False, default=0)
+    open_low = db.Column(db.Integer, nullable=False, default=0)
+    # Fecha límite más próxima entre las tareas abiertas: hay vencidas si es < ahora
+    next_due_date = db.Column(db.DateTime)
+
+    def has_overdue(self, now):
+        return self.next_due_date is not None and self.next_due_date < now
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'pending': self.pending,
+            'in_progress': self.in_progress,
+            'completed': self.completed,
+            'open_high': self.open_high,
+            'open_medium': self.open_medium,
+            'open_low': self.open_low,
+            'next_due_date': self.next_due_date.isoformat() if self.next_due_date else None
+        }
+
+def get_counter(scope, scope_id):
+    """Lectura por clave primaria; un usuario o proyecto sin tareas no tiene fila
+
+    Solo cuenta tareas activas: las archivadas están en models.archive (archive_counters)
+    """
+    return db.session.get(TaskCounter, (scope, scope_id))
+
+def _deltas(status, priority, sign):
+    values = {'total': sign}
+    if status in TRACKED_STATUSES:
+        values[status] = sign
+    if status != 'completed' and priority in TRACKED_PRIORITIES:
+        values[f'open_{priority}'] = sign
+    return values
+
+def _open_due_min(scope_column, scope_id, exclude_id=None):
+    query = select(func.min(Task.due_date)).where(
+        scope_column == scope_id,
+        Task.status != 'completed'
+    )
+    if exclude_id is not None:
+        query = query.where(Task.id != exclude_id)
+    return query.scalar_subquery()
+
+def _ensure_row(connection, scope, scope_id):
+    table = TaskCounter.__table__
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        # Sin INSERT ... ON CONFLICT: otro escritor puede haber creado la fila tras el UPDATE;
+        # el savepoint deja que el conflicto se ignore sin abortar la escritura de la tarea
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(table).values(scope=scope, scope_id=scope_id))
+        except IntegrityError:
+            pass
+        return
+    connection.execute(
+        dialect_insert(table).values(scope=scope, scope_id=scope_id).on_conflict_do_nothing()
+    )
+
+def _apply(connection, scope, scope_id, values, due_date, sign, exclude_id=None):
+    """Suma los deltas a la fila del contador y ajusta la marca de vencimiento"""
+    table = TaskCounter.__table__
+    changes = {name: table.c[name] + delta for name, delta in values.items()}
+    condition = (table.c.scope == scope) & (table.c.scope_id == scope_id)
+    is_open = due_date is not None and 'completed' not in values
+
+    if sign > 0 and is_open:
+        changes['next_due_date'] = case(
+            (table.c.next_due_date.is_(None), due_date),
+            (table.c.next_due_date > due_date, due_date),
+            else_=table.c.next_due_date
+        )
+
+    result = connection.execute(update(table).where(condition).values(**changes))
+    if result.rowcount == 0:
+        if sign < 0:
+            return
+        _ensure_row(connection, scope, scope_id)
+        connection.execute(update(table).where(condition).values(**changes))
+
+    if sign < 0 and is_open:
+        # La tarea que marcaba el vencimiento ya no cuenta: recalcular solo esa fila
+        scope_column = getattr(Task, SCOPES[scope])
+        connection.execute(
+            update(table).where(condition, table.c.next_due_date == due_date)
+            .values(next_due_date=_open_due_min(scope_column, scope_id, exclude_id))
+        )
+
+def _snapshot(target, committed):
+    """Valores de la tarea antes (committed=True) o después del flush"""
+    state = inspect(target)
+    values = {}
+    for attr in ('status', 'priority', 'due_date') + tuple(SCOPES.values()):
+        history = state.attrs[attr].history
+        if committed and history.added and not history.unchanged:
+            values[attr] = history.deleted[0] if history.deleted else None
+        else:
+            values[attr] = getattr(target, attr)
+    return values
+
+def record_task(connection, snapshot, sign, exclude_id=None):
+    """Suma (sign=+1) o resta (-1) una tarea a los contadores de su proyecto, creador y asignado
+
+    snapshot: status, priority, due_date, project_id, created_by y assigned_to. La usan los eventos
+    del ORM y las escrituras en bloque que no pasan por ellos, dentro de su propia transacción
+    """
+    values = _deltas(snapshot['status'], snapshot['priority'], sign)
+    for scope, attr in SCOPES.items():
+        if snapshot[attr] is not None:
+            _apply(connection, scope, snapshot[attr], values, snapshot['due_date'], sign, exclude_id)
+
+def _keep_history(target, value, oldvalue, initiator):
+    pass
+
+# Cargar el valor anterior al asignar para que el historial sea fiable aunque la fila esté expirada
+for _attr in ('status', 'priority', 'due_date') + tuple(SCOPES.values()):
+    event.listen(getattr(Task, _attr), 'set', _keep_history, active_history=True)
+
+@event.listens_for(Task, 'after_insert')
+def _task_inserted(mapper, connection, target):
+    record_task(connection, _snapshot(target, committed=False), +1)
+
+@event.listens_for(Task, 'after_update')
+def _task_updated(mapper, connection, target):
+    before = _snapshot(target, committed=True)
+    after = _snapshot(target, committed=False)
+    if before != after:
+        record_task(connection, before, -1)
+        record_task(connection, after, +1)
+
+@event.listens_for(Task, 'before_delete')
+def _task_deleted(mapper, connection, target):
+    # Antes del DELETE la fila sigue cargable; se excluye del recálculo de vencimiento
+    record_task(connection, _snapshot(target, committed=True), -1, exclude_id=target.id)
+
+def rebuild_counters(scope_ids=None):
+    """Recalcula los contadores en bloque con un GROUP BY por ámbito (sin confirmar: decide quien llama)"""
+    table = TaskCounter.__table__
+    is_open = Task.status != 'completed'
+    rebuilt = 0
+
+    for scope, attr in SCOPES.items():
+        column = getattr(Task, attr)
+        ids = None if scope_ids is None else scope_ids.get(scope)
+        if scope_ids is not None and not ids:
+            continue
+
+        delete_stmt = table.delete().where(table.c.scope == scope)
+        aggregate = select(
+            column,
+            func.count(Task.id),
+            *[func.coalesce(func.sum(case((Task.status == s, 1), else_=0)), 0) for s in TRACKED_STATUSES],
+            *[func.coalesce(func.sum(case(((is_open & (Task.priority == p)), 1), else_=0)), 0)
+              for p in TRACKED_PRIORITIES],
+            func.min(case((is_open, Task.due_date)))
+        ).where(column.isnot(None)).group_by(column)
+        if ids is not None:
+            delete_stmt = delete_stmt.where(table.c.scope_id.in_(ids))
+            aggregate = aggregate.where(column.in_(ids))
+
+        db.session.execute(delete_stmt)
+        rows = [
+            dict(zip(
+                ('scope_id', 'total') + TRACKED_STATUSES
+                + tuple(f'open_{p}' for p in TRACKED_PRIORITIES) + ('next_due_date',),
+                row
+            ), scope=scope)
+            for row in db.session.execute(aggregate)
+        ]
+        if rows:
+            db.session.execute(insert(table), rows)
+        rebuilt += len(rows)
+
+    return rebuilt
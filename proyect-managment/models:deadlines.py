@@ -0,0 +1,142 @@
+"""
+Cubos de vencimiento materializados por tarea (overdue / today / week / later)
+Los eventos de Task mantienen la fila en cada escritura y 'flask sweep-deadlines' mueve las que cruzan un límite de tiempo
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import case, delete, event, func, insert, inspect, select, update
+from models import db, Task
+
+OVERDUE, TODAY, WEEK, LATER = 'overdue', 'today', 'week', 'later'
+BUCKETS = (OVERDUE, TODAY, WEEK, LATER)
+
+class TaskDeadline(db.Model):
+    """Solo tareas abiertas con fecha límite; due_date se copia para barrer sin tocar tasks"""
+    __tablename__ = 'task_deadlines'
+    __table_args__ = (
+        db.Index('ix_task_deadlines_bucket_due', 'bucket', 'due_date'),
+        db.Index('ix_task_deadlines_assignee_bucket', 'assigned_to', 'bucket')
+    )
+
+    task_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    assigned_to = db.Column(db.Integer)
+    due_date = db.Column(db.DateTime, nullable=False)
+    bucket = db.Column(db.String(10), nullable=False)
+
+def boundaries(now):
+    """Inicio de mañana y fin de la semana (7 días) respecto a now"""
+    start_of_tomorrow = datetime(now.year, now.month, now.day) + timedelta(days=1)
+    return start_of_tomorrow, start_of_tomorrow + timedelta(days=6)
+
+def bucket_for(due_date, now):
+    tomorrow, week_end = boundaries(now)
+    if due_date < now:
+        return OVERDUE
+    if due_date < tomorrow:
+        return TODAY
+    if due_date < week_end:
+        return WEEK
+    return LATER
+
+def bucket_expression(due_column, now):
+    """El mismo cálculo en SQL (CASE) para barridos y reconstrucciones en bloque"""
+    tomorrow, week_end = boundaries(now)
+    return case(
+        (due_column < now, OVERDUE),
+        (due_column < tomorrow, TODAY),
+        (due_column < week_end, WEEK),
+        else_=LATER
+    )
+
+def _write(connection, task_id, status, due_date, assigned_to, now):
+    table = TaskDeadline.__table__
+    connection.execute(delete(table).where(table.c.task_id == task_id))
+    if status != 'completed' and due_date is not None:
+        connection.execute(insert(table).values(
+            task_id=task_id, assigned_to=assigned_to, due_date=due_date,
+            bucket=bucket_for(due_date, now)
+        ))
+
+@event.listens_for(Task, 'after_insert')
+def _task_inserted(mapper, connection, target):
+    _write(connection, target.id, target.status, target.due_date, target.assigned_to, datetime.now())
+
+@event.listens_for(Task, 'after_update')
+def _task_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ('status', 'due_date', 'assigned_to')):
+        _write(connection, target.id, target.status, target.due_date, target.assigned_to, datetime.now())
+
+@event.listens_for(Task, 'after_delete')
+def _task_deleted(mapper, connection, target):
+    table = TaskDeadline.__table__
+    connection.execute(delete(table).where(table.c.task_id == target.id))
+
+def refresh_deadlines(connection, task_ids, now=None):
+    """Recalcula las filas de tareas escritas sin el ORM (operaciones masivas)"""
+    if not task_ids:
+        return
+    now = now or datetime.now()
+    table = TaskDeadline.__table__
+    connection.execute(delete(table).where(table.c.task_id.in_(list(task_ids))))
+    connection.execute(insert(table).from_select(
+        ['task_id', 'assigned_to', 'due_date', 'bucket'],
+        select(Task.id, Task.assigned_to, Task.due_date, bucket_expression(Task.due_date, now)).where(
+            Task.id.in_(list(task_ids)), Task.status != 'completed', Task.due_date.isnot(None)
+        )
+    ))
+
+def sweep(now=None):
+    """Mueve de cubo las filas que han cruzado un límite; devuelve cuántas cambiaron
+
+    El tiempo solo avanza, así que cada cubo solo puede pasar al siguiente: tres
+    UPDATE por rango sobre el índice (bucket, due_date) en lugar de recorrer la tabla
+    """
+    now = now or datetime.now()
+    tomorrow, week_end = boundaries(now)
+    table = TaskDeadline.__table__
+    moved = 0
+    for bucket, limit in ((LATER, week_end), (WEEK, tomorrow), (TODAY, now)):
+        result = db.session.execute(
+            update(table)
+            .where(table.c.bucket == bucket, table.c.due_date < limit)
+            .values(bucket=bucket_expression(table.c.due_date, now))
+        )
+        moved += result.rowcount
+    db.session.commit()
+    return moved
+
+def rebuild(now=None):
+    """Reconstruye la tabla desde tasks con un INSERT ... SELECT"""
+    now = now or datetime.now()
+    table = TaskDeadline.__table__
+    db.session.execute(delete(table))
+    db.session.execute(insert(table).from_select(
+        ['task_id', 'assigned_to', 'due_date', 'bucket'],
+        select(Task.id, Task.assigned_to, Task.due_date, bucket_expression(Task.due_date, now)).where(
+            Task.status != 'completed', Task.due_date.isnot(None)
+        )
+    ))
+    db.session.commit()
+    return db.session.execute(select(func.count()).select_from(table)).scalar()
+
+def bucket_counts(user_id):
+    """Tareas abiertas asignadas al usuario por cubo (búsqueda por índice assigned_to, bucket)"""
+    rows = db.session.execute(
+        select(TaskDeadline.bucket, func.count())
+        .where(TaskDeadline.assigned_to == user_id)
+        .group_by(TaskDeadline.bucket)
+    ).all()
+    counts = dict.fromkeys(BUCKETS, 0)
+    counts.update({bucket: total for bucket, total in rows})
+    return counts
+
+def tasks_in_buckets(user_id, buckets, limit=None):
+    """Tareas asignadas al usuario en los cubos indicados, por fecha límite"""
+    query = Task.query.join(TaskDeadline, TaskDeadline.task_id == Task.id).filter(
+        TaskDeadline.assigned_to == user_id,
+        TaskDeadline.bucket.in_(buckets)
+    ).order_by(TaskDeadline.due_date.asc())
+    if limit:
+        query = query.limit(limit)
+    return query.all()
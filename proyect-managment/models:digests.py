@@ -0,0 +1,54 @@
+"""
+Registro de avisos de los resúmenes de vencimientos
+Una fila por (usuario, tarea, fecha límite) ya avisada: reejecutar nunca reenvía, y una tarea creada,
+reasignada o con nueva fecha dentro de una ventana ya cubierta se avisa en la siguiente ejecución
+"""
+
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
+from models import db
+
+class DigestSent(db.Model):
+    __tablename__ = 'digest_sent'
+    __table_args__ = (
+        db.Index('ix_digest_sent_due_date', 'due_date'),
+    )
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    task_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    due_date = db.Column(db.DateTime, primary_key=True)
+    sent_at = db.Column(db.DateTime, nullable=False)
+
+def claim(user_id, tasks, now):
+    """Reserva los avisos (task_id, due_date) del usuario; False si otro proceso ya reclamó alguno
+
+    El INSERT contra la clave primaria decide qué ejecución envía: todo o nada por usuario
+    """
+    rows = [
+        {'user_id': user_id, 'task_id': task_id, 'due_date': due_date, 'sent_at': now}
+        for task_id, due_date in tasks
+    ]
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(DigestSent.__table__), rows)
+    except IntegrityError:
+        db.session.rollback()
+        return False
+    db.session.commit()
+    return True
+
+def release(user_id, tasks):
+    """Borra los avisos reservados si el envío falló (se reintentará en la siguiente ejecución)"""
+    table = DigestSent.__table__
+    for task_id, due_date in tasks:
+        db.session.execute(delete(table).where(
+            table.c.user_id == user_id, table.c.task_id == task_id, table.c.due_date == due_date
+        ))
+    db.session.commit()
+
+def prune_sent(before):
+    """Olvida los avisos de fechas límite ya pasadas: la consulta nunca vuelve a verlas"""
+    table = DigestSent.__table__
+    result = db.session.execute(delete(table).where(table.c.due_date < before))
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,139 @@
+"""
+Eventos de escritura sobre Project, Task y User
+Calcula qué usuarios se ven afectados por cada cambio y avisa a los suscriptores tras el commit
+"""
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from models import Project, Task, User
+
+_PENDING_KEY = 'changed_user_ids'
+_IDENTITY_KEY = 'changed_identity_ids'
+_ROWS_KEY = 'affected_rows'
+_EXTENSION = 'model_events'
+
+def _subscribers(app):
+    """Suscriptores de la aplicación: viven en app.extensions, no en el módulo
+
+    Así cada create_app (tests, procesos del pool de informes) tiene su propia lista y una
+    aplicación descartada no sigue recibiendo avisos ni queda retenida
+    """
+    return app.extensions.setdefault(_EXTENSION, {'users': [], 'identity': []})
+
+def on_users_changed(app):
+    """Decorador: registra en la aplicación una función que recibe los ids de usuario afectados por un commit"""
+    def register(callback):
+        _subscribers(app)['users'].append(callback)
+        return callback
+    return register
+
+def on_identity_changed(app):
+    """Decorador: registra en la aplicación una función que recibe los ids de usuario cuya propia fila cambió"""
+    def register(callback):
+        _subscribers(app)['identity'].append(callback)
+        return callback
+    return register
+
+def _notify(kind, user_ids):
+    user_ids = {uid for uid in user_ids if uid is not None}
+    if not user_ids or not has_app_context():
+        return
+    for callback in current_app.extensions.get(_EXTENSION, {}).get(kind, ()):
+        callback(user_ids)
+
+def notify_users_changed(user_ids):
+    """Avisa a los suscriptores de forma explícita (escrituras que no pasan por el ORM)"""
+    _notify('users', user_ids)
+
+def notify_identity_changed(user_ids):
+    """Avisa de cambios en filas de User hechos fuera del ORM (UPDATE masivos)"""
+    _notify('identity', user_ids)
+
+def _values(target, attr):
+    """Valor actual y valores anteriores de un atributo en el flush"""
+    history = inspect(target).attrs[attr].history
+    values = set(history.added or ()) | set(history.deleted or ()) | set(history.unchanged or ())
+    values.add(getattr(target, attr))
+    return values
+
+def _project_owners(connection, project_ids):
+    project_ids = [pid for pid in project_ids if pid is not None]
+    if not project_ids:
+        return set()
+    return set(connection.execute(
+        select(Project.owner_id).where(Project.id.in_(project_ids))
+    ).scalars())
+
+def _project_members(connection, project_ids):
+    """Asignados y creadores de las tareas del proyecto: también ven su nombre y estado"""
+    project_ids = [pid for pid in project_ids if pid is not None]
+    if not project_ids:
+        return set()
+    in_project = Task.project_id.in_(project_ids)
+    return set(connection.execute(
+        select(Task.assigned_to).where(in_project).union(select(Task.created_by).where(in_project))
+    ).scalars())
+
+def affected_user_ids(connection, target):
+    """Dueños de proyecto, asignados y creadores relacionados con la fila modificada
+
+    Un cambio en un proyecto (p. ej. renombrarlo) afecta a todos sus miembros, no solo al dueño
+    """
+    if isinstance(target, Project):
+        users = _values(target, 'owner_id') | _project_members(connection, [target.id])
+    else:
+        users = _values(target, 'assigned_to') | _values(target, 'created_by')
+        users |= _project_owners(connection, _values(target, 'project_id'))
+    users.discard(None)
+    return users
+
+def affected_users(connection, target):
+    """affected_user_ids calculado una sola vez por fila y flush
+
+    Lo comparten los avisos de este módulo y el registro de cambios (models.changes), que si no
+    repetirían las mismas consultas de dueños y miembros para cada fila escrita
+    """
+    session = inspect(target).session
+    if session is None:
+        return affected_user_ids(connection, target)
+    rows = session.info.setdefault(_ROWS_KEY, {})
+    users = rows.get(id(target))
+    if users is None:
+        users = rows[id(target)] = affected_user_ids(connection, target)
+    return users
+
+def _collect(mapper, connection, target):
+    session = inspect(target).session
+    if session is None:
+        return
+    session.info.setdefault(_PENDING_KEY, set()).update(affected_users(connection, target))
+
+for _model in (Project, Task):
+    for _name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _name, _collect)
+
+def _collect_identity(mapper, connection, target):
+    session = inspect(target).session
+    if session is None:
+        return
+    session.info.setdefault(_IDENTITY_KEY, set()).add(target.id)
+
+for _name in ('after_update', 'after_delete'):
+    event.listen(User, _name, _collect_identity)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _forget_rows(session, flush_context):
+    # Una misma fila puede volver a escribirse en otro flush de la transacción
+    session.info.pop(_ROWS_KEY, None)
+
+@event.listens_for(Session, 'after_commit')
+def _flush_notifications(session):
+    notify_users_changed(session.info.pop(_PENDING_KEY, ()))
+    notify_identity_changed(session.info.pop(_IDENTITY_KEY, ()))
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_notifications(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_IDENTITY_KEY, None)
+    session.info.pop(_ROWS_KEY, None)
@@ -0,0 +1,49 @@
+"""
+Índices de los caminos de acceso calientes de Project y Task
+Se registran en los metadatos para que db.create_all los cree junto a las tablas
+"""
+
+from models import db, Project, Task, User
+from models.deadlines import TaskDeadline
+
+_projects = Project.__table__.c
+_tasks = Task.__table__.c
+_users = User.__table__.c
+_deadlines = TaskDeadline.__table__.c
+
+HOT_INDEXES = [
+    # Registro: la unicidad la garantiza la base de datos (IntegrityError en carreras)
+    db.Index('uq_users_username', _users.username, unique=True),
+    db.Index('uq_users_email', _users.email, unique=True),
+    # Listados de administración: filtros por rol / activo y orden por (created_at, id)
+    db.Index('ix_users_created_id', _users.created_at, _users.id),
+    db.Index('ix_users_role_created_id', _users.role, _users.created_at, _users.id),
+    db.Index('ix_users_active_created_id', _users.is_active, _users.created_at, _users.id),
+    db.Index('ix_projects_created_id', _projects.created_at, _projects.id),
+    db.Index('ix_projects_status_created_id', _projects.status, _projects.created_at, _projects.id),
+    # Dashboard y perfil: proyectos por dueño y estado, ordenados por actualización
+    db.Index('ix_projects_owner_status_updated', _projects.owner_id, _projects.status, _projects.updated_at),
+    # Paginación keyset de la API por (updated_at, id)
+    db.Index('ix_projects_owner_updated_id', _projects.owner_id, _projects.updated_at, _projects.id),
+    db.Index('ix_tasks_updated_id', _tasks.updated_at, _tasks.id),
+    # Ramas de la UNION de tareas visibles (dueño del proyecto / asignado)
+    db.Index('ix_tasks_project_id', _tasks.project_id),
+    db.Index('ix_tasks_assigned_to', _tasks.assigned_to, _tasks.status),
+    db.Index('ix_tasks_created_by', _tasks.created_by, _tasks.status),
+    # Vencimientos: tareas abiertas por fecha límite
+    db.Index('ix_tasks_status_due_date', _tasks.status, _tasks.due_date),
+    # Actividad reciente y listados ordenados por fecha
+    db.Index('ix_tasks_created_at', _tasks.created_at),
+    db.Index('ix_tasks_completed_at', _tasks.completed_at),
+    # Resúmenes de vencimientos: rango por fecha límite (cubre el asignado)
+    db.Index('ix_task_deadlines_due_assignee', _deadlines.due_date, _deadlines.assigned_to),
+]
+
+def create_missing_indexes(bind=None):
+    """Crea los índices que falten en una base de datos ya existente"""
+    bind = bind or db.engine
+    created = []
+    for index in HOT_INDEXES:
+        index.create(bind, checkfirst=True)
+        created.append(index.name)
+    return created
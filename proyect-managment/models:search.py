@@ -0,0 +1,191 @@
+"""
+Índice de búsqueda de texto sobre tareas y proyectos
+SQLite FTS5 (rowid = id * 2 + tipo) sincronizado con eventos de los modelos; LIKE como alternativa
+La disponibilidad de FTS5 es de cada aplicación (app.extensions['search']), no del proceso
+"""
+
+import re
+from flask import current_app, has_app_context
+from sqlalchemy.exc import OperationalError
+from sqlalchemy import Integer, column, event, func, inspect, literal, literal_column, or_, select, table, text, union_all
+from models import db, Project, Task
+
+FTS_TABLE = 'search_index'
+KINDS = {Task: 0, Project: 1}
+BATCH_SIZE = 1000
+
+_fts = table(FTS_TABLE, column('rowid', Integer), column('title'), column('body'))
+
+def _rowid(kind, ref_id):
+    return ref_id * 2 + kind
+
+def _document(target):
+    if isinstance(target, Task):
+        return target.title or '', target.description or ''
+    return target.name or '', target.description or ''
+
+def fts_enabled():
+    if not has_app_context():
+        return False
+    return current_app.extensions.get('search', {}).get('fts', False)
+
+def _create_fts(engine):
+    if engine.dialect.name != 'sqlite':
+        return False
+    try:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "title, body, tokenize='unicode61 remove_diacritics 2')"
+            )
+    except OperationalError as exc:
+        # SQLite compilado sin FTS5; cualquier otro error (bloqueo, disco) se propaga
+        if 'no such module: fts5' not in str(exc.orig):
+            raise
+        return False
+    return True
+
+def ensure_index(app, engine):
+    """Crea la tabla FTS5 si el SQLite del sistema la soporta; si no, se usa LIKE"""
+    enabled = _create_fts(engine)
+    app.extensions['search'] = {'fts': enabled}
+    return enabled
+
+def _delete(connection, kind, ref_id):
+    connection.execute(
+        text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :rowid'), {'rowid': _rowid(kind, ref_id)}
+    )
+
+def _upsert(mapper, connection, target):
+    if not fts_enabled():
+        return
+    kind = KINDS[mapper.class_]
+    title, body = _document(target)
+    _delete(connection, kind, target.id)
+    connection.execute(
+        text(f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:rowid, :title, :body)'),
+        {'rowid': _rowid(kind, target.id), 'title': title, 'body': body}
+    )
+
+def _updated(mapper, connection, target):
+    state = inspect(target)
+    fields = ('title', 'description') if isinstance(target, Task) else ('name', 'description')
+    if any(state.attrs[name].history.has_changes() for name in fields):
+        _upsert(mapper, connection, target)
+
+def _removed(mapper, connection, target):
+    if fts_enabled():
+        _delete(connection, KINDS[mapper.class_], target.id)
+
+for _model in KINDS:
+    event.listen(_model, 'after_insert', _upsert)
+    event.listen(_model, 'after_update', _updated)
+    event.listen(_model, 'after_delete', _removed)
+
+def remove_from_index(connection, model, ids):
+    """Para borrados que no pasan por el ORM (operaciones masivas)"""
+    if fts_enabled():
+        for ref_id in ids:
+            _delete(connection, KINDS[model], ref_id)
+
+def refresh_index(connection, model, ids):
+    """Reindexa filas escritas sin el ORM (inserciones y actualizaciones masivas)"""
+    if not fts_enabled() or not ids:
+        return
+    kind = KINDS[model]
+    title_column = Task.title if model is Task else Project.name
+    rows = connection.execute(
+        select(model.id, title_column, model.description).where(model.id.in_(list(ids)))
+    ).all()
+    remove_from_index(connection, model, [row[0] for row in rows])
+    connection.execute(
+        text(f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:rowid, :title, :body)'),
+        [{'rowid': _rowid(kind, ref_id), 'title': title or '', 'body': body or ''}
+         for ref_id, title, body in rows]
+    )
+
+def reindex(batch_size=BATCH_SIZE):
+    """Reconstruye el índice leyendo las tablas por lotes (yield_per); devuelve los documentos"""
+    if not fts_enabled():
+        return 0
+    db.session.execute(text(f'DELETE FROM {FTS_TABLE}'))
+    total = 0
+    sources = (
+        (KINDS[Task], select(Task.id, Task.title, Task.description)),
+        (KINDS[Project], select(Project.id, Project.name, Project.description))
+    )
+    insert_stmt = text(f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:rowid, :title, :body)')
+    for kind, query in sources:
+        result = db.session.execute(query.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            db.session.execute(insert_stmt, [
+                {'rowid': _rowid(kind, ref_id), 'title': title or '', 'body': body or ''}
+                for ref_id, title, body in rows
+            ])
+            total += len(rows)
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"))
+    db.session.commit()
+    return total
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+def fts_query(terms):
+    """Consulta FTS5 con coincidencia por prefijo en cada palabra ("dise"* "web"*)"""
+    tokens = _TOKEN.findall(terms)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+def _fts_search(user_id, terms, limit):
+    from utils.dashboard_stats import visible_task_ids
+
+    match = fts_query(terms)
+    if not match:
+        return []
+    rank = func.bm25(literal_column(FTS_TABLE), 10.0, 1.0)
+    matches = literal_column(FTS_TABLE).match(match)
+
+    tasks = select(
+        literal('task').label('kind'), Task.id.label('id'), Task.title.label('title'), rank.label('rank')
+    ).select_from(_fts).join(Task, Task.id == _fts.c.rowid // 2).where(
+        matches, _fts.c.rowid % 2 == KINDS[Task], Task.id.in_(visible_task_ids(user_id))
+    )
+    projects = select(
+        literal('project').label('kind'), Project.id.label('id'), Project.name.label('title'),
+        rank.label('rank')
+    ).select_from(_fts).join(Project, Project.id == _fts.c.rowid // 2).where(
+        matches, _fts.c.rowid % 2 == KINDS[Project], Project.owner_id == user_id
+    )
+    combined = union_all(tasks, projects).subquery()
+    return db.session.execute(
+        select(combined).order_by(combined.c.rank).limit(limit)
+    ).mappings().all()
+
+def _like_search(user_id, terms, limit):
+    """Alternativa sin FTS: LIKE por prefijo de palabra, sin ranking"""
+    from utils.dashboard_stats import visible_task_ids
+
+    tokens = _TOKEN.findall(terms)
+    if not tokens:
+        return []
+
+    def matches(*columns):
+        return [or_(*[col.ilike(f'%{token}%') for col in columns]) for token in tokens]
+
+    tasks = select(
+        literal('task').label('kind'), Task.id.label('id'), Task.title.label('title'),
+        Task.updated_at.label('updated_at')
+    ).where(Task.id.in_(visible_task_ids(user_id)), *matches(Task.title, Task.description))
+    projects = select(
+        literal('project').label('kind'), Project.id.label('id'), Project.name.label('title'),
+        Project.updated_at.label('updated_at')
+    ).where(Project.owner_id == user_id, *matches(Project.name, Project.description))
+    combined = union_all(tasks, projects).subquery()
+    return db.session.execute(
+        select(combined.c.kind, combined.c.id, combined.c.title)
+        .order_by(combined.c.updated_at.desc()).limit(limit)
+    ).mappings().all()
+
+def search(user_id, terms, limit=20):
+    """Resultados ordenados por relevancia, solo de proyectos propios o tareas visibles"""
+    if fts_enabled():
+        return _fts_search(user_id, terms, limit)
+    return _like_search(user_id, terms, limit)
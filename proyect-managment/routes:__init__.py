@@ -7,6 +7,11 @@ from .projects import projects_bp
 from .tasks import tasks_bp
 from .admin import admin_bp
 from .api import api_bp
+from .admin_tools import admin_tools_bp
+from .exports import exports_bp
+from .reports import reports_bp
+from .api_v2 import api_v2_bp
+from .admin_listings import admin_listings_bp
 
 def register_blueprints(app):
     """Registra todos los blueprints en la aplicación"""
@@ -16,5 +21,10 @@ def register_blueprints(app):
     app.register_blueprint(tasks_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(api_bp)
+    app.register_blueprint(admin_tools_bp)
+    app.register_blueprint(exports_bp)
+    app.register_blueprint(reports_bp)
+    app.register_blueprint(api_v2_bp)
+    app.register_blueprint(admin_listings_bp)
 
 __all__ = ['register_blueprints']
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from flask import Blueprint, abort, jsonify, request
+from flask_login import login_required, current_user
+from utils.decorators import admin_required
+from utils.admin_listings import (
+    MAX_BATCH,
+    list_projects,
+    list_users,
+    project_filters,
+    set_users_active,
+    user_filters
+)
+from utils.pagination import InvalidCursor, parse_limit, serialize
+from utils.replica import read_only
+
+admin_listings_bp = Blueprint('admin_listings', __name__, url_prefix='/admin/listings')
+
+def _error(message, status=400):
+    return jsonify({'error': message}), status
+
+def _bool_arg(name):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    abort(400)
+
+def _date_arg(name, end=False):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        abort(400)
+    # 'created_to' incluye el día completo
+    return parsed + timedelta(days=1) if end else parsed
+
+def _page(listing, where):
+    limit = parse_limit(request.args.get('limit'))
+    try:
+        rows, next_cursor = listing(
+            where,
+            sort=request.args.get('sort') or '-created_at',
+            cursor=request.args.get('cursor'),
+            limit=limit
+        )
+    except InvalidCursor:
+        return _error('Cursor inválido')
+    except ValueError as e:
+        return _error(str(e))
+    return jsonify({'data': serialize(rows), 'next_cursor': next_cursor, 'limit': limit})
+
+@admin_listings_bp.route('/users')
+@login_required
+@admin_required
+@read_only
+def users():
+    """Usuarios con totales (?role, ?is_active, ?created_from, ?created_to, ?sort, ?cursor, ?limit)"""
+    where = user_filters(
+        role=request.args.get('role') or None,
+        is_active=_bool_arg('is_active'),
+        created_from=_date_arg('created_from'),
+        created_to=_date_arg('created_to', end=True)
+    )
+    return _page(list_users, where)
+
+@admin_listings_bp.route('/projects')
+@login_required
+@admin_required
+@read_only
+def projects():
+    """Proyectos con dueño y totales (?status, ?owner_id, ?created_from, ?created_to, ?sort, ?cursor, ?limit)"""
+    where = project_filters(
+        status=request.args.get('status') or None,
+        owner_id=request.args.get('owner_id', type=int),
+        created_from=_date_arg('created_from'),
+        created_to=_date_arg('created_to', end=True)
+    )
+    return _page(list_projects, where)
+
+def _set_active(active):
+    payload = request.get_json(silent=True) or {}
+    ids = payload.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return _error('Se esperaba una lista no vacía de ids')
+    if len(ids) > MAX_BATCH:
+        return _error(f'Máximo {MAX_BATCH} usuarios por acción')
+    try:
+        user_ids = sorted({int(uid) for uid in ids})
+    except (TypeError, ValueError):
+        return _error('Ids inválidos')
+    updated = set_users_active(user_ids, active, current_user.id)
+    return jsonify({'updated': updated})
+
+@admin_listings_bp.route('/users/activate', methods=['POST'])
+@login_required
+@admin_required
+def activate_users():
+    """Activa varios usuarios ({"ids": [...]}) con un único UPDATE"""
+    return _set_active(True)
+
+@admin_listings_bp.route('/users/deactivate', methods=['POST'])
+@login_required
+@admin_required
+def deactivate_users():
+    """Desactiva varios usuarios ({"ids": [...]}); el propio administrador se excluye"""
+    return _set_active(False)
@@ -0,0 +1,56 @@
+from flask import Blueprint, Response, abort, jsonify
+from flask_login import login_required
+from utils.decorators import admin_required
+from utils.cache import get_stats_cache
+from utils.identity import get_identity_cache
+from utils.passwords import get_password_hasher
+from utils.throttle import get_login_throttle
+from utils.profiling import get_profiling_metrics
+from utils.fragments import get_fragment_store
+
+admin_tools_bp = Blueprint('admin_tools', __name__, url_prefix='/admin/tools')
+
+@admin_tools_bp.route('/cache')
+@login_required
+@admin_required
+def cache_stats():
+    """Aciertos, fallos e invalidaciones de la caché de estadísticas"""
+    return jsonify(get_stats_cache().stats())
+
+@admin_tools_bp.route('/identity-cache')
+@login_required
+@admin_required
+def identity_cache_stats():
+    """Aciertos y fallos del user_loader cacheado"""
+    return jsonify(get_identity_cache().stats())
+
+@admin_tools_bp.route('/kdf')
+@login_required
+@admin_required
+def kdf_stats():
+    """Hashes, verificaciones, rehashes y rechazos del pool de bcrypt"""
+    return jsonify(get_password_hasher().stats())
+
+@admin_tools_bp.route('/login-throttle')
+@login_required
+@admin_required
+def login_throttle_stats():
+    """Comprobaciones, fallos registrados y rechazos por IP y por usuario"""
+    return jsonify(get_login_throttle().stats())
+
+@admin_tools_bp.route('/metrics')
+@login_required
+@admin_required
+def metrics():
+    """Métricas por endpoint en formato Prometheus (requiere PROFILING_ENABLED)"""
+    profiling = get_profiling_metrics()
+    if profiling is None:
+        abort(404)
+    return Response(profiling.prometheus(), mimetype='text/plain; version=0.0.4')
+
+@admin_tools_bp.route('/fragment-cache')
+@login_required
+@admin_required
+def fragment_cache_stats():
+    """Aciertos, fallos, expulsiones y bytes de la caché de fragmentos"""
+    return jsonify(get_fragment_store().stats())
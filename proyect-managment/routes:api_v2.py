@@ -0,0 +1,223 @@
+from flask import Blueprint, Response, jsonify, request
+from flask_login import login_required, current_user
+from sqlalchemy import select
+from models import db, Project, Task
+from models.archive import ArchivedTask, visible_archived_ids
+from models.changes import DELETE, UPSERT, changes_since, current_token, oldest_token
+from models.search import search
+from utils.bulk_tasks import BulkError, bulk_create, bulk_delete, bulk_reassign, bulk_update
+from utils.dashboard_stats import visible_task_ids
+from utils.replica import read_only
+from utils.pagination import (
+    InvalidCursor,
+    keyset_select,
+    page_etag,
+    parse_fields,
+    parse_limit,
+    serialize,
+    split_page
+)
+
+api_v2_bp = Blueprint('api_v2', __name__, url_prefix='/api/v2')
+
+TASK_FIELDS = {
+    'id': Task.id,
+    'title': Task.title,
+    'description': Task.description,
+    'status': Task.status,
+    'priority': Task.priority,
+    'project_id': Task.project_id,
+    'assigned_to': Task.assigned_to,
+    'created_by': Task.created_by,
+    'due_date': Task.due_date,
+    'created_at': Task.created_at,
+    'updated_at': Task.updated_at,
+    'completed_at': Task.completed_at
+}
+
+PROJECT_FIELDS = {
+    'id': Project.id,
+    'name': Project.name,
+    'description': Project.description,
+    'status': Project.status,
+    'priority': Project.priority,
+    'owner_id': Project.owner_id,
+    'created_at': Project.created_at,
+    'updated_at': Project.updated_at
+}
+
+ARCHIVED_TASK_FIELDS = {
+    name: getattr(ArchivedTask, name) for name in TASK_FIELDS
+}
+ARCHIVED_TASK_FIELDS['archived_at'] = ArchivedTask.archived_at
+
+def _error(message, status=400):
+    return jsonify({'error': message}), status
+
+def _list_response(available, updated_column, id_column, where):
+    """Página keyset con campos seleccionables y ETag / If-None-Match"""
+    try:
+        fields = parse_fields(request.args.get('fields'), available)
+    except ValueError as e:
+        return _error(str(e))
+
+    limit = parse_limit(request.args.get('limit'))
+    try:
+        stmt = keyset_select(
+            {name: available[name] for name in fields},
+            updated_column, id_column, where,
+            cursor=request.args.get('cursor'), limit=limit
+        )
+    except InvalidCursor:
+        return _error('Cursor inválido')
+
+    rows, next_cursor = split_page(db.session.execute(stmt), limit)
+    etag = page_etag(rows, fields, next_cursor)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    response = jsonify({
+        'data': serialize(rows),
+        'next_cursor': next_cursor,
+        'limit': limit
+    })
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@api_v2_bp.route('/tasks')
+@login_required
+@read_only
+def list_tasks():
+    """Tareas visibles (?cursor, ?limit, ?fields, ?project_id, ?status)"""
+    where = [Task.id.in_(visible_task_ids(current_user.id))]
+    project_id = request.args.get('project_id', type=int)
+    if project_id is not None:
+        where.append(Task.project_id == project_id)
+    if request.args.get('status'):
+        where.append(Task.status == request.args['status'])
+    return _list_response(TASK_FIELDS, Task.updated_at, Task.id, where)
+
+@api_v2_bp.route('/tasks/archived')
+@login_required
+@read_only
+def list_archived_tasks():
+    """Histórico: tareas archivadas visibles (?cursor, ?limit, ?fields, ?project_id)"""
+    where = [ArchivedTask.id.in_(visible_archived_ids(current_user.id))]
+    project_id = request.args.get('project_id', type=int)
+    if project_id is not None:
+        where.append(ArchivedTask.project_id == project_id)
+    return _list_response(ARCHIVED_TASK_FIELDS, ArchivedTask.updated_at, ArchivedTask.id, where)
+
+@api_v2_bp.route('/projects')
+@login_required
+@read_only
+def list_projects():
+    """Proyectos propios (?cursor, ?limit, ?fields, ?status)"""
+    where = [Project.owner_id == current_user.id]
+    if request.args.get('status'):
+        where.append(Project.status == request.args['status'])
+    return _list_response(PROJECT_FIELDS, Project.updated_at, Project.id, where)
+
+def _current_rows(fields, id_column, ids, where):
+    if not ids:
+        return {}
+    stmt = select(*[column.label(name) for name, column in fields.items()]).where(
+        id_column.in_(ids), *where
+    )
+    return {row.id: dict(row._mapping) for row in db.session.execute(stmt)}
+
+@api_v2_bp.route('/changes')
+@login_required
+@read_only
+def list_changes():
+    """Cambios desde ?since=<token> en lotes (?limit); sin since devuelve el token actual"""
+    since = request.args.get('since', type=int)
+    if since is None:
+        return jsonify({'sync_token': current_token(current_user.id, settled=True), 'full_sync_required': True})
+    if since < oldest_token():
+        return _error('Token demasiado antiguo, se requiere sincronización completa', 410)
+
+    limit = parse_limit(request.args.get('limit'))
+    log = changes_since(current_user.id, since, limit)
+    has_more = len(log) > limit
+    log = log[:limit]
+
+    # La última operación de cada fila en el lote es la que cuenta
+    latest = {}
+    for entry in log:
+        latest[(entry.entity, entry.entity_id)] = entry.op
+    upserts = {
+        entity: [entity_id for (kind, entity_id), op in latest.items() if kind == entity and op == UPSERT]
+        for entity in ('project', 'task')
+    }
+
+    projects = _current_rows(PROJECT_FIELDS, Project.id, upserts['project'],
+                             [Project.owner_id == current_user.id])
+    tasks = _current_rows(TASK_FIELDS, Task.id, upserts['task'],
+                          [Task.id.in_(visible_task_ids(current_user.id))])
+
+    # Borradas, o que el usuario ha dejado de ver (reasignadas, proyecto transferido)
+    deleted = {'projects': [], 'tasks': []}
+    for (entity, entity_id), op in latest.items():
+        visible = projects if entity == 'project' else tasks
+        if op == DELETE or entity_id not in visible:
+            deleted[f'{entity}s'].append(entity_id)
+
+    return jsonify({
+        'projects': serialize(projects.values()),
+        'tasks': serialize(tasks.values()),
+        'deleted': deleted,
+        'sync_token': log[-1].seq if log else since,
+        'has_more': has_more
+    })
+
+def _bulk(operation):
+    payload = request.get_json(silent=True) or {}
+    try:
+        results = operation(current_user.id, payload.get('items'))
+    except BulkError as e:
+        db.session.rollback()
+        return jsonify({'applied': False, 'results': e.results}), 400
+    return jsonify({'applied': True, 'results': results})
+
+@api_v2_bp.route('/tasks/bulk', methods=['POST'])
+@login_required
+def bulk_create_tasks():
+    """Crea hasta MAX_BATCH tareas ({"items": [...]}) en una transacción"""
+    return _bulk(bulk_create)
+
+@api_v2_bp.route('/tasks/bulk', methods=['PATCH'])
+@login_required
+def bulk_update_tasks():
+    """Actualiza título, descripción, prioridad, estado o fecha límite de varias tareas"""
+    return _bulk(bulk_update)
+
+@api_v2_bp.route('/tasks/bulk/assign', methods=['POST'])
+@login_required
+def bulk_reassign_tasks():
+    """Reasigna varias tareas ({"items": [{"id", "assigned_to"}]})"""
+    return _bulk(bulk_reassign)
+
+@api_v2_bp.route('/tasks/bulk', methods=['DELETE'])
+@login_required
+def bulk_delete_tasks():
+    """Borra varias tareas de proyectos propios ({"items": [id, ...]})"""
+    return _bulk(bulk_delete)
+
+@api_v2_bp.route('/search')
+@login_required
+@read_only
+def search_items():
+    """Búsqueda por prefijo en títulos y descripciones (?q, ?limit) de tareas y proyectos visibles"""
+    terms = request.args.get('q', '').strip()
+    if not terms:
+        return _error('Falta el parámetro q')
+    limit = min(parse_limit(request.args.get('limit') or '20'), 100)
+    results = [
+        {'kind': row['kind'], 'id': row['id'], 'title': row['title']}
+        for row in search(current_user.id, terms, limit)
+    ]
+    return jsonify({'query': terms, 'results': results})
@@ -1,10 +1,27 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, login_required, current_user
+from sqlalchemy import case, func, or_
+from sqlalchemy.exc import IntegrityError
 from models import db, User
+from models.bootstrap import claim_first_admin
 from utils.validators import validate_email, validate_username, validate_password
+from utils.passwords import HasherBusy, set_user_password, verify_user_password
+from utils.throttle import get_login_throttle
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+def _taken_message(username, email):
+    """Comprueba nombre de usuario y email en una sola consulta"""
+    username_taken, email_taken = db.session.query(
+        func.coalesce(func.max(case((User.username == username, 1), else_=0)), 0),
+        func.coalesce(func.max(case((User.email == email, 1), else_=0)), 0)
+    ).filter(or_(User.username == username, User.email == email)).one()
+    if username_taken:
+        return 'El nombre de usuario ya está en uso.'
+    if email_taken:
+        return 'El email ya está registrado.'
+    return None
+
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     """Página de inicio de sesión"""
@@ -20,9 +37,26 @@ def login():
             flash('Por favor completa todos los campos.', 'danger')
             return render_template('auth/login.html')
         
+        throttle = get_login_throttle()
+        allowed, retry_after = throttle.check(request.remote_addr, username)
+        if not allowed:
+            flash('Demasiados intentos fallidos. Inténtalo de nuevo más tarde.', 'danger')
+            return render_template('auth/login.html'), 429, {'Retry-After': str(retry_after)}
+        
         user = User.query.filter_by(username=username).first()
         
-        if user and user.check_password(password):
+        try:
+            valid = user is not None and verify_user_password(user, password)
+        except HasherBusy:
+            flash('El servidor está ocupado, inténtalo de nuevo en unos segundos.', 'warning')
+            return render_template('auth/login.html'), 503
+        
+        if valid:
+            throttle.record_success(request.remote_addr, username)
+            if db.session.dirty:
+                # Hash rehecho con el coste configurado
+                db.session.commit()
+            
             if not user.is_active:
                 flash('Tu cuenta ha sido desactivada.', 'danger')
                 return render_template('auth/login.html')
@@ -33,6 +67,7 @@ def login():
             next_page = request.args.get('next')
             return redirect(next_page) if next_page else redirect(url_for('dashboard.index'))
         else:
+            throttle.record_failure(request.remote_addr, username)
             flash('Usuario o contraseña incorrectos.', 'danger')
     
     return render_template('auth/login.html')
@@ -72,23 +107,32 @@ def register():
             flash('Las contraseñas no coinciden.', 'danger')
             return render_template('auth/register.html')
         
-        if User.query.filter_by(username=username).first():
-            flash('El nombre de usuario ya está en uso.', 'danger')
-            return render_template('auth/register.html')
-        
-        if User.query.filter_by(email=email).first():
-            flash('El email ya está registrado.', 'danger')
+        message = _taken_message(username, email)
+        if message:
+            flash(message, 'danger')
             return render_template('auth/register.html')
         
         user = User(username=username, email=email, full_name=full_name)
-        user.set_password(password)
+        try:
+            set_user_password(user, password)
+        except HasherBusy:
+            flash('El servidor está ocupado, inténtalo de nuevo en unos segundos.', 'warning')
+            return render_template('auth/register.html'), 503
         
-        if User.query.count() == 0:
-            user.role = 'admin'
-            flash('¡Bienvenido! Has sido registrado como administrador.', 'success')
+        try:
+            db.session.add(user)
+            db.session.flush()
+            if claim_first_admin(user.id):
+                user.role = 'admin'
+            db.session.commit()
+        except IntegrityError:
+            # Otro registro concurrente ganó la restricción única
+            db.session.rollback()
+            flash(_taken_message(username, email) or 'El usuario ya existe.', 'danger')
+            return render_template('auth/register.html')
         
-        db.session.add(user)
-        db.session.commit()
+        if user.role == 'admin':
+            flash('¡Bienvenido! Has sido registrado como administrador.', 'success')
         
         flash('¡Registro exitoso! Ahora puedes iniciar sesión.', 'success')
         return redirect(url_for('auth.login'))
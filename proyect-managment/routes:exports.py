@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from flask import Blueprint, Response, abort, request, stream_with_context
+from flask_login import login_required, current_user
+from utils.streaming_export import stream_tasks_csv, stream_projects_csv
+
+exports_bp = Blueprint('exports', __name__, url_prefix='/exports')
+
+def _int_arg(name):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        abort(400)
+
+def _date_arg(name, end=False):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        abort(400)
+    # 'to' incluye el día completo
+    return parsed + timedelta(days=1) if end else parsed
+
+def _csv_response(chunks, filename):
+    response = Response(stream_with_context(chunks), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@exports_bp.route('/tasks.csv')
+@login_required
+def tasks_csv():
+    """Tareas visibles en CSV por streaming (filtros: project_id, status, from, to; reanudar con after)"""
+    after_id = _int_arg('after')
+    chunks = stream_tasks_csv(
+        current_user.id,
+        header=after_id is None,
+        project_id=_int_arg('project_id'),
+        status=request.args.get('status') or None,
+        date_from=_date_arg('from'),
+        date_to=_date_arg('to', end=True),
+        after_id=after_id
+    )
+    return _csv_response(chunks, 'tasks.csv')
+
+@exports_bp.route('/projects.csv')
+@login_required
+def projects_csv():
+    """Proyectos propios en CSV por streaming (filtros: status, from, to; reanudar con after)"""
+    after_id = _int_arg('after')
+    chunks = stream_projects_csv(
+        current_user.id,
+        header=after_id is None,
+        status=request.args.get('status') or None,
+        date_from=_date_arg('from'),
+        date_to=_date_arg('to', end=True),
+        after_id=after_id
+    )
+    return _csv_response(chunks, 'projects.csv')
@@ -0,0 +1,64 @@
+from flask import Blueprint, abort, jsonify, request, send_file, url_for
+from flask_login import login_required, current_user
+from utils.reports import get_report_service
+
+reports_bp = Blueprint('reports', __name__, url_prefix='/reports')
+
+def _filters():
+    data = request.get_json(silent=True) or request.form or request.args
+    filters = {}
+    if data.get('project_id') not in (None, ''):
+        try:
+            filters['project_id'] = int(data['project_id'])
+        except (TypeError, ValueError):
+            abort(400)
+    if data.get('status'):
+        filters['status'] = data['status']
+    return filters
+
+def _own_job(job_id):
+    job = get_report_service().queue.get(job_id)
+    if job is None or job['user_id'] != current_user.id:
+        abort(404)
+    return job
+
+def _job_payload(job):
+    payload = {
+        'id': job['id'],
+        'status': job['status'],
+        'filters': job['filters'],
+        'status_url': url_for('reports.status', job_id=job['id'])
+    }
+    if job['status'] == 'done':
+        payload['download_url'] = url_for('reports.download', job_id=job['id'])
+    if job['error']:
+        payload['error'] = job['error']
+    return payload
+
+@reports_bp.route('/tasks', methods=['POST'])
+@login_required
+def create_tasks_report():
+    """Encola el informe PDF de tareas; responde 202 con la URL de estado"""
+    service = get_report_service()
+    job_id = service.submit(current_user.id, _filters())
+    return jsonify(_job_payload(service.queue.get(job_id))), 202
+
+@reports_bp.route('/<job_id>')
+@login_required
+def status(job_id):
+    """Estado del trabajo (queued, running, done, failed)"""
+    return jsonify(_job_payload(_own_job(job_id)))
+
+@reports_bp.route('/<job_id>/download')
+@login_required
+def download(job_id):
+    """PDF generado; 409 si aún no está listo, 410 si la caché ya lo expulsó"""
+    job = _own_job(job_id)
+    if job['status'] != 'done':
+        return jsonify(_job_payload(job)), 409
+
+    path = get_report_service().result_path(job)
+    if path is None:
+        abort(410)
+    return send_file(path, mimetype='application/pdf', as_attachment=True,
+                     download_name='tareas.pdf')
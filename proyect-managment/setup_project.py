@@ -82,7 +82,54 @@ DATABASE_URL=sqlite:///project_manager.db
 # Configuración del servidor
 HOST=0.0.0.0
 PORT=5000
-DEBUG=True
+# True solo en local: activa el depurador interactivo de Werkzeug
+DEBUG=False
+
+# Caché de estadísticas (memory | file, file se comparte entre workers)
+STATS_CACHE_BACKEND=memory
+STATS_CACHE_TTL=60
+
+# Caché de identidades del user_loader (segundos hasta ver una desactivación en otros workers)
+USER_CACHE_BACKEND=memory
+USER_CACHE_TTL=30
+
+# Informes PDF en segundo plano
+REPORTS_WORKERS=2
+REPORTS_CACHE_MAX_BYTES=209715200
+
+# Hashing de contraseñas (calibrar con: flask benchmark-kdf)
+BCRYPT_LOG_ROUNDS=12
+PASSWORD_HASH_MAX_PENDING=64
+
+# Límite de intentos de login (memory | sqlite, sqlite se comparte entre workers)
+LOGIN_THROTTLE_BACKEND=memory
+LOGIN_THROTTLE_WINDOW=900
+LOGIN_MAX_FAILURES_PER_IP=20
+LOGIN_MAX_FAILURES_PER_USER=5
+# Número de proxies inversos delante (nginx: 1) para que el límite por IP use la IP real
+PROXY_FIX_X_FOR=0
+
+# Perfilado de peticiones (métricas en /admin/tools/metrics y cabecera Server-Timing)
+PROFILING_ENABLED=False
+
+# Resúmenes de vencimientos (file | smtp; en local: python -m aiosmtpd -n -l localhost:1025)
+DIGEST_SENDER=file
+DIGEST_WINDOW_HOURS=24
+DIGEST_SCHEDULER_ENABLED=False
+DIGEST_INTERVAL_SECONDS=3600
+
+# Réplica de lectura (en local, otra copia SQLite: sqlite:///project_manager_replica.db)
+# DATABASE_REPLICA_URL=
+READ_REPLICA_PIN_SECONDS=5
+READ_REPLICA_MAX_LAG_SECONDS=5
+
+# Feed de cambios en PostgreSQL/MySQL: segundos que una fila espera antes de servirse
+# (cubre transacciones confirmadas fuera de orden de secuencia; en SQLite no aplica)
+CHANGE_FEED_SETTLE_SECONDS=30
+
+# gunicorn (producción: gunicorn -c gunicorn.conf.py wsgi:app desde el directorio del proyecto)
+# WEB_CONCURRENCY=9
+# GUNICORN_THREADS=4
 ''')
     
     # .gitignore
@@ -115,17 +162,111 @@ load_dotenv()
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
-    DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
+    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///project_manager.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    
+    # Caché de estadísticas del dashboard ('memory' o 'file')
+    STATS_CACHE_ENABLED = os.getenv('STATS_CACHE_ENABLED', 'True').lower() == 'true'
+    STATS_CACHE_BACKEND = os.getenv('STATS_CACHE_BACKEND', 'memory')
+    STATS_CACHE_DIR = os.getenv('STATS_CACHE_DIR')
+    STATS_CACHE_TTL = int(os.getenv('STATS_CACHE_TTL', 60))
+    STATS_CACHE_MAX_ENTRIES = int(os.getenv('STATS_CACHE_MAX_ENTRIES', 1024))
+    
+    # Caché de identidades del user_loader ('memory' o 'file')
+    USER_CACHE_ENABLED = os.getenv('USER_CACHE_ENABLED', 'True').lower() == 'true'
+    USER_CACHE_BACKEND = os.getenv('USER_CACHE_BACKEND', 'memory')
+    USER_CACHE_DIR = os.getenv('USER_CACHE_DIR')
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 30))
+    USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', 4096))
+    
+    # Informes PDF: cola SQLite y caché en disco (por defecto en instance/reports)
+    REPORTS_DIR = os.getenv('REPORTS_DIR')
+    REPORTS_WORKERS = int(os.getenv('REPORTS_WORKERS', 2))
+    REPORTS_CACHE_MAX_BYTES = int(os.getenv('REPORTS_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+    # Trabajos 'running' más antiguos que esto se consideran huérfanos al arrancar
+    REPORTS_STALE_AFTER = int(os.getenv('REPORTS_STALE_AFTER', 600))
+    
+    # Hashing de contraseñas: coste de bcrypt y tamaño del pool
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0)) or None
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+    
+    # Límite de intentos de login por ventana deslizante ('memory' o 'sqlite')
+    LOGIN_THROTTLE_ENABLED = os.getenv('LOGIN_THROTTLE_ENABLED', 'True').lower() == 'true'
+    LOGIN_THROTTLE_BACKEND = os.getenv('LOGIN_THROTTLE_BACKEND', 'memory')
+    LOGIN_THROTTLE_PATH = os.getenv('LOGIN_THROTTLE_PATH')
+    LOGIN_THROTTLE_WINDOW = int(os.getenv('LOGIN_THROTTLE_WINDOW', 900))
+    LOGIN_MAX_FAILURES_PER_IP = int(os.getenv('LOGIN_MAX_FAILURES_PER_IP', 20))
+    LOGIN_MAX_FAILURES_PER_USER = int(os.getenv('LOGIN_MAX_FAILURES_PER_USER', 5))
+    LOGIN_THROTTLE_MAX_KEYS = int(os.getenv('LOGIN_THROTTLE_MAX_KEYS', 100000))
+    LOGIN_THROTTLE_PURGE_INTERVAL = int(os.getenv('LOGIN_THROTTLE_PURGE_INTERVAL', 300))
+    
+    # Proxies inversos de confianza delante de la aplicación: remote_addr sale de X-Forwarded-For
+    # (0 = sin proxy; con proxy y 0, el límite por IP agrupa a todos los clientes en la IP del proxy)
+    PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', 0))
+    
+    # Perfilado de peticiones e instrumentación SQL (desactivado: sin coste)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILING_N_PLUS_ONE_THRESHOLD = int(os.getenv('PROFILING_N_PLUS_ONE_THRESHOLD', 5))
+    
+    # Caché de fragmentos de plantilla ({% cache 'nombre', ttl %})
+    FRAGMENT_CACHE_ENABLED = os.getenv('FRAGMENT_CACHE_ENABLED', 'True').lower() == 'true'
+    FRAGMENT_CACHE_TTL = int(os.getenv('FRAGMENT_CACHE_TTL', 300))
+    FRAGMENT_CACHE_MAX_BYTES = int(os.getenv('FRAGMENT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    
+    # Resúmenes de vencimientos ('file' escribe .eml en instance/outbox; 'smtp' envía)
+    DIGEST_SENDER = os.getenv('DIGEST_SENDER', 'file')
+    DIGEST_OUTBOX_DIR = os.getenv('DIGEST_OUTBOX_DIR')
+    DIGEST_FROM = os.getenv('DIGEST_FROM', 'no-reply@localhost')
+    DIGEST_SMTP_HOST = os.getenv('DIGEST_SMTP_HOST', 'localhost')
+    DIGEST_SMTP_PORT = int(os.getenv('DIGEST_SMTP_PORT', 1025))
+    DIGEST_SMTP_USERNAME = os.getenv('DIGEST_SMTP_USERNAME')
+    DIGEST_SMTP_PASSWORD = os.getenv('DIGEST_SMTP_PASSWORD')
+    DIGEST_SMTP_TLS = os.getenv('DIGEST_SMTP_TLS', 'False').lower() == 'true'
+    DIGEST_WINDOW_HOURS = int(os.getenv('DIGEST_WINDOW_HOURS', 24))
+    # Hilo programador en proceso: lo arrancan los workers de gunicorn (post_worker_init) o main()
+    DIGEST_SCHEDULER_ENABLED = os.getenv('DIGEST_SCHEDULER_ENABLED', 'False').lower() == 'true'
+    DIGEST_INTERVAL_SECONDS = int(os.getenv('DIGEST_INTERVAL_SECONDS', 3600))
+    
+    # Motor de base de datos (ver utils/db_tuning.py; comprobar con: flask db-check)
+    # SQLite: PRAGMAs aplicados en cada conexión
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64000))
+    SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+    # PostgreSQL/MySQL: QueuePool
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    
+    # Réplica de lectura para endpoints @read_only (sin URL no se enruta nada)
+    SQLALCHEMY_BINDS = (
+        {'replica': os.getenv('DATABASE_REPLICA_URL')} if os.getenv('DATABASE_REPLICA_URL') else {}
+    )
+    READ_REPLICA_PIN_SECONDS = int(os.getenv('READ_REPLICA_PIN_SECONDS', 5))
+    # Vida máxima en caché de un valor calculado con lecturas de la réplica (su retraso tolerado)
+    READ_REPLICA_MAX_LAG_SECONDS = int(os.getenv('READ_REPLICA_MAX_LAG_SECONDS', 5))
+    
+    # Feed de cambios en PostgreSQL/MySQL: solo se sirven filas más antiguas que esto (en SQLite no aplica)
+    CHANGE_FEED_SETTLE_SECONDS = int(os.getenv('CHANGE_FEED_SETTLE_SECONDS', 30))
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
 class ProductionConfig(Config):
     DEBUG = False
+    # Un pool por worker: pool_size x workers debe caber en max_connections del servidor
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 15000))
 
 config = {
     'development': DevelopmentConfig,
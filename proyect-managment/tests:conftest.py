@@ -0,0 +1,78 @@
+"""
+Fixtures comunes: aplicación sobre una base SQLite temporal y datos mínimos
+La configuración se lee del entorno al importar config, así que se fija antes de importar la app
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+_TMP = tempfile.mkdtemp(prefix='pm-tests-')
+os.environ.update({
+    'DATABASE_URL': f"sqlite:///{os.path.join(_TMP, 'test.db')}",
+    'REPORTS_DIR': os.path.join(_TMP, 'reports'),
+    'DIGEST_OUTBOX_DIR': os.path.join(_TMP, 'outbox'),
+    'BCRYPT_LOG_ROUNDS': '4',
+    'DIGEST_SCHEDULER_ENABLED': 'False',
+    'PROFILING_ENABLED': 'False'
+})
+
+import pytest
+from app import create_app
+from models import db, User, Project, Task
+
+@pytest.fixture
+def app():
+    app = create_app('default')
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def make_user(app):
+    def make(username, role='user', password='Secreto123!'):
+        from utils.passwords import set_user_password
+        user = User(username=username, email=f'{username}@example.com', full_name=username.title(), role=role)
+        set_user_password(user, password)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make
+
+@pytest.fixture
+def make_project(app):
+    def make(owner, name='Proyecto', status='active'):
+        project = Project(name=name, description='', priority='medium', status=status, owner_id=owner.id)
+        db.session.add(project)
+        db.session.commit()
+        return project
+    return make
+
+@pytest.fixture
+def make_task(app):
+    def make(project, creator, assignee=None, title='Tarea', status='pending', due_in=None, priority='medium'):
+        task = Task(
+            title=title, description='', priority=priority, status=status,
+            project_id=project.id, created_by=creator.id,
+            assigned_to=assignee.id if assignee else None,
+            due_date=datetime.now() + due_in if due_in is not None else None,
+            completed_at=datetime.now() if status == 'completed' else None
+        )
+        db.session.add(task)
+        db.session.commit()
+        return task
+    return make
+
+@pytest.fixture
+def login(app):
+    """Cliente autenticado como el usuario dado (sesión de Flask-Login sin pasar por el formulario)"""
+    def login_as(user):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user.id)
+            session['_fresh'] = True
+        return client
+    return login_as
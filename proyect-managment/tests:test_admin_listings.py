@@ -0,0 +1,54 @@
+"""Listados de administración: páginas keyset, filtros, totales y activación masiva"""
+
+import pytest
+from models import db
+from utils.admin_listings import (
+    list_projects, list_users, project_filters, set_users_active, user_filters
+)
+
+def _walk(listing, where=(), sort='-created_at', limit=2):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = listing(where, sort=sort, cursor=cursor, limit=limit)
+        seen.extend(rows)
+        if cursor is None:
+            return seen
+
+def test_user_pages_cover_every_row_once(make_user):
+    users = [make_user(f'user{i}') for i in range(5)]
+    for sort in ('-created_at', 'created_at', 'username', '-username'):
+        rows = _walk(list_users, sort=sort)
+        assert sorted(row['id'] for row in rows) == sorted(user.id for user in users)
+    assert [row['username'] for row in _walk(list_users, sort='username')] == sorted(u.username for u in users)
+
+def test_user_totals_from_counters(make_user, make_project, make_task):
+    ana, luis = make_user('ana'), make_user('luis')
+    project = make_project(ana)
+    make_project(ana, name='Vacío')
+    make_task(project, ana, assignee=luis)
+    make_task(project, luis, assignee=luis)
+
+    rows = {row['username']: row for row in _walk(list_users)}
+    assert (rows['ana']['projects'], rows['ana']['tasks'], rows['ana']['assigned_tasks']) == (2, 2, 0)
+    assert (rows['luis']['projects'], rows['luis']['tasks'], rows['luis']['assigned_tasks']) == (0, 0, 2)
+
+def test_filters(make_user, make_project):
+    admin, ana = make_user('jefa', role='admin'), make_user('ana')
+    make_project(ana, name='Activo')
+    make_project(ana, name='Cerrado', status='archived')
+
+    assert [row['id'] for row in _walk(list_users, user_filters(role='admin'))] == [admin.id]
+    archived = _walk(list_projects, project_filters(status='archived', owner_id=ana.id))
+    assert [(row['name'], row['owner']) for row in archived] == [('Cerrado', 'ana')]
+
+def test_unknown_sort_rejected(app):
+    with pytest.raises(ValueError):
+        list_users(sort='email')
+
+def test_set_users_active_excludes_acting_admin(make_user):
+    admin, ana, luis = make_user('jefa', role='admin'), make_user('ana'), make_user('luis')
+    assert set_users_active([admin.id, ana.id, luis.id], False, admin.id) == 2
+    assert set_users_active([ana.id], False, admin.id) == 0
+    db.session.expire_all()
+    assert [user.is_active for user in (admin, ana, luis)] == [True, False, False]
+    assert set_users_active([admin.id], False, admin.id) == 0
@@ -0,0 +1,62 @@
+"""API v2: paginación keyset completa y estable, selección de campos y ETag"""
+
+from datetime import datetime
+import pytest
+from models import db, Task
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+def _walk(client, url):
+    ids, cursor = [], None
+    while True:
+        body = client.get(url + (f'&cursor={cursor}' if cursor else '')).get_json()
+        ids += [row['id'] for row in body['data']]
+        cursor = body['next_cursor']
+        if cursor is None:
+            return ids
+
+def test_pages_cover_every_task_once(make_user, make_project, make_task, login):
+    ana = make_user('ana')
+    project = make_project(ana)
+    tasks = [make_task(project, ana) for _ in range(7)]
+    # Mismo updated_at en varias filas: el id desempata
+    db.session.query(Task).filter(Task.id.in_([t.id for t in tasks[:4]])).update(
+        {Task.updated_at: datetime(2030, 1, 1)}, synchronize_session=False
+    )
+    db.session.commit()
+
+    ids = _walk(login(ana), '/api/v2/tasks?limit=3')
+    assert sorted(ids) == sorted(t.id for t in tasks)
+    assert len(ids) == len(set(ids))
+
+def test_fields_selection_keeps_cursor_columns(make_user, make_project, make_task, login):
+    ana = make_user('ana')
+    make_task(make_project(ana), ana)
+    client = login(ana)
+
+    row = client.get('/api/v2/tasks?fields=title').get_json()['data'][0]
+    assert set(row) == {'title', 'id', 'updated_at'}
+    assert client.get('/api/v2/tasks?fields=secreto').status_code == 400
+
+def test_etag_returns_304_until_page_changes(make_user, make_project, make_task, login):
+    ana = make_user('ana')
+    task = make_task(make_project(ana), ana)
+    client = login(ana)
+
+    response = client.get('/api/v2/tasks')
+    etag = response.headers['ETag']
+    assert client.get('/api/v2/tasks', headers={'If-None-Match': etag}).status_code == 304
+
+    task.title = 'Cambiada'
+    task.updated_at = datetime(2031, 1, 1)
+    db.session.commit()
+    assert client.get('/api/v2/tasks', headers={'If-None-Match': etag}).status_code == 200
+
+def test_invalid_cursor_is_rejected(make_user, login):
+    client = login(make_user('ana'))
+    assert client.get('/api/v2/tasks?cursor=no-es-un-cursor').status_code == 400
+
+def test_cursor_round_trip():
+    value = datetime(2030, 5, 1, 12, 30)
+    assert decode_cursor(encode_cursor((value, 42))) == (value, 42)
+    with pytest.raises(InvalidCursor):
+        decode_cursor('x')
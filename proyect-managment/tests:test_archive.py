@@ -0,0 +1,62 @@
+"""Archivo de tareas completadas: movimiento por lotes, contadores y registro de cambios"""
+
+from datetime import datetime, timedelta
+from models import db, Task
+from models.archive import ArchivedTask, archive_tasks, archived_count, project_archive_total
+from models.changes import DELETE, ChangeLog
+from models.counters import TaskCounter, get_counter, rebuild_counters
+
+def _counters():
+    return {
+        (row.scope, row.scope_id): (row.total, row.pending, row.completed, row.open_high)
+        for row in TaskCounter.query.all() if row.total
+    }
+
+def _seed(make_user, make_project, make_task):
+    ana, luis = make_user('ana'), make_user('luis')
+    old = make_project(ana, name='Antiguo', status='archived')
+    live = make_project(ana, name='Vivo')
+    done = [make_task(old, ana, assignee=luis, status='completed') for _ in range(3)]
+    done.append(make_task(old, luis, status='completed'))
+    make_task(old, ana, assignee=luis, priority='high')
+    make_task(live, ana, assignee=luis, status='completed')
+    return ana, luis, old, done
+
+def test_moves_only_completed_tasks_of_archived_projects(make_user, make_project, make_task):
+    ana, luis, old, done = _seed(make_user, make_project, make_task)
+    result = archive_tasks(datetime.now() + timedelta(days=1), batch_size=3)
+
+    assert result == {'tasks': 4, 'batches': 2}
+    assert sorted(row.id for row in ArchivedTask.query.all()) == sorted(task.id for task in done)
+    assert Task.query.filter(Task.project_id == old.id).count() == 1
+    assert project_archive_total(old.id).tasks == 4
+    assert archived_count('visible', ana.id) == 4
+    assert archived_count('visible', luis.id) == 3
+    assert archived_count('creator', luis.id) == 1
+
+def test_counters_stay_in_sync(make_user, make_project, make_task):
+    ana, luis, old, _ = _seed(make_user, make_project, make_task)
+    archive_tasks(datetime.now() + timedelta(days=1), batch_size=2)
+    db.session.expire_all()
+
+    incremental = _counters()
+    assert get_counter('project', old.id).total == 1
+    rebuild_counters()
+    db.session.commit()
+    assert _counters() == incremental
+
+def test_change_log_has_one_delete_per_task_and_user(make_user, make_project, make_task):
+    ana, luis, _, done = _seed(make_user, make_project, make_task)
+    archive_tasks(datetime.now() + timedelta(days=1))
+
+    deletes = {
+        (row.entity_id, row.user_id)
+        for row in ChangeLog.query.filter_by(entity='task', op=DELETE).all()
+    }
+    expected = {(task.id, ana.id) for task in done}
+    expected |= {(task.id, luis.id) for task in done}
+    assert deletes == expected
+
+def test_nothing_to_archive_before_cutoff(make_user, make_project, make_task):
+    _seed(make_user, make_project, make_task)
+    assert archive_tasks(datetime.now() - timedelta(days=1)) == {'tasks': 0, 'batches': 0}
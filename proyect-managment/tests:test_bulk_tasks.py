@@ -0,0 +1,109 @@
+"""Operaciones masivas sobre tareas: validación por elemento y lotes todo o nada"""
+
+import pytest
+from models import db, Task
+from utils.bulk_tasks import BulkError, bulk_create, bulk_delete, bulk_reassign, bulk_update
+
+def _errors(excinfo):
+    return {r['index']: r.get('errors') for r in excinfo.value.results if r['status'] == 'error'}
+
+def test_bulk_create_applies_whole_batch(make_user, make_project):
+    owner = make_user('owner')
+    project = make_project(owner)
+    results = bulk_create(owner.id, [
+        {'title': 'Una', 'project_id': project.id},
+        {'title': 'Otra', 'project_id': project.id, 'assigned_to': owner.id, 'due_date': '2030-01-01'}
+    ])
+    assert [r['status'] for r in results] == ['ok', 'ok']
+    assert Task.query.filter_by(project_id=project.id).count() == 2
+
+@pytest.mark.parametrize('item', [
+    {'title': 'X', 'project_id': [1]},
+    {'title': 'X', 'project_id': '1'},
+    {'title': 'X', 'project_id': True},
+    {'title': 'X', 'assigned_to': {'id': 1}},
+    {'title': ['X']},
+    {'title': 'X', 'priority': 3},
+    {'title': 'X', 'due_date': 20300101}
+])
+def test_bulk_create_rejects_wrong_types(make_user, make_project, item):
+    owner = make_user('owner')
+    project = make_project(owner)
+    item = dict(item)
+    item.setdefault('project_id', project.id)
+    with pytest.raises(BulkError) as excinfo:
+        bulk_create(owner.id, [{'title': 'Válida', 'project_id': project.id}, item])
+    assert list(_errors(excinfo)) == [1]
+    db.session.rollback()
+    assert Task.query.count() == 0
+
+def test_bulk_create_rejects_foreign_project(make_user, make_project):
+    owner, other = make_user('owner'), make_user('other')
+    project = make_project(other)
+    with pytest.raises(BulkError):
+        bulk_create(owner.id, [{'title': 'X', 'project_id': project.id}])
+
+@pytest.mark.parametrize('operation, item', [
+    (bulk_update, lambda task: {'id': task.id, 'status': 'completed'}),
+    (bulk_reassign, lambda task: {'id': task.id, 'assigned_to': None}),
+    (bulk_delete, lambda task: task.id)
+])
+def test_bulk_rejects_duplicate_ids(make_user, make_project, make_task, operation, item):
+    owner = make_user('owner')
+    task = make_task(make_project(owner), owner)
+    with pytest.raises(BulkError) as excinfo:
+        operation(owner.id, [item(task), item(task)])
+    assert _errors(excinfo) == {1: ['Tarea repetida en el lote']}
+    db.session.rollback()
+    assert db.session.get(Task, task.id).status == 'pending'
+
+def test_bulk_update_sets_completed_at(make_user, make_project, make_task):
+    owner = make_user('owner')
+    task = make_task(make_project(owner), owner)
+    bulk_update(owner.id, [{'id': task.id, 'status': 'completed'}])
+    db.session.expire_all()
+    assert db.session.get(Task, task.id).completed_at is not None
+
+def test_bulk_endpoint_reports_per_item_errors(make_user, make_project, login):
+    owner = make_user('owner')
+    project = make_project(owner)
+    response = login(owner).post('/api/v2/tasks/bulk', json={'items': [
+        {'title': 'Bien', 'project_id': project.id},
+        {'title': '', 'project_id': project.id}
+    ]})
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['applied'] is False
+    assert [r['status'] for r in body['results']] == ['ok', 'error']
+
+def test_bulk_keeps_counters_in_sync(make_user, make_project, make_task):
+    from models.counters import TaskCounter, rebuild_counters
+
+    owner, luis = make_user('owner'), make_user('luis')
+    project = make_project(owner)
+    created = bulk_create(owner.id, [
+        {'title': f'T{i}', 'project_id': project.id, 'priority': 'high', 'due_date': '2030-01-0%d' % (i + 1)}
+        for i in range(4)
+    ])
+    ids = [r['id'] for r in created]
+    bulk_update(owner.id, [{'id': ids[0], 'status': 'completed'}, {'id': ids[1], 'priority': 'low'}])
+    bulk_reassign(owner.id, [{'id': ids[2], 'assigned_to': luis.id}])
+    bulk_delete(owner.id, [ids[3]])
+
+    def snapshot():
+        return {
+            (c.scope, c.scope_id): (c.total, c.pending, c.completed, c.open_high, c.open_low, c.next_due_date)
+            for c in TaskCounter.query.all() if c.total
+        }
+
+    incremental = snapshot()
+    rebuild_counters()
+    db.session.commit()
+    assert snapshot() == incremental
+
+def test_bulk_commits_its_own_transaction(make_user, make_project):
+    owner = make_user('owner')
+    project = make_project(owner)
+    bulk_create(owner.id, [{'title': 'X', 'project_id': project.id}])
+    db.session.rollback()
+    assert Task.query.filter_by(project_id=project.id).count() == 1
@@ -0,0 +1,54 @@
+"""Contadores de tareas mantenidos en cada escritura frente a un recálculo completo"""
+
+from datetime import timedelta
+from models import db, Task
+from models.counters import TaskCounter, get_counter, rebuild_counters
+
+COLUMNS = ('total', 'pending', 'in_progress', 'completed', 'open_high', 'open_medium', 'open_low', 'next_due_date')
+
+def _counters():
+    return {
+        (row.scope, row.scope_id): tuple(getattr(row, name) for name in COLUMNS)
+        for row in TaskCounter.query.all()
+    }
+
+def test_incremental_counters_match_rebuild(make_user, make_project, make_task):
+    ana, luis = make_user('ana'), make_user('luis')
+    project = make_project(ana)
+    tasks = [
+        make_task(project, ana, assignee=luis, priority='high', due_in=timedelta(days=1)),
+        make_task(project, ana, assignee=ana, priority='low', due_in=timedelta(days=-1)),
+        make_task(project, luis, priority='medium', due_in=timedelta(days=3))
+    ]
+
+    tasks[0].status = 'completed'
+    tasks[1].assigned_to = luis.id
+    tasks[2].priority = 'high'
+    db.session.commit()
+    db.session.delete(tasks[1])
+    db.session.commit()
+
+    incremental = {key: value for key, value in _counters().items() if value[0]}
+    rebuild_counters()
+    db.session.commit()
+    assert _counters() == incremental
+
+def test_counter_tracks_status_and_next_due(make_user, make_project, make_task):
+    ana = make_user('ana')
+    project = make_project(ana)
+    soon = make_task(project, ana, due_in=timedelta(hours=1))
+    later = make_task(project, ana, due_in=timedelta(days=2))
+
+    counter = get_counter('project', project.id)
+    assert (counter.total, counter.pending) == (2, 2)
+    assert counter.next_due_date == soon.due_date
+
+    soon.status = 'completed'
+    db.session.commit()
+    db.session.expire_all()
+    counter = get_counter('project', project.id)
+    assert (counter.pending, counter.completed) == (1, 1)
+    assert counter.next_due_date == later.due_date
+
+def test_user_without_tasks_has_no_counter(make_user):
+    assert get_counter('assignee', make_user('nadie').id) is None
@@ -0,0 +1,59 @@
+"""Estadísticas del dashboard: los agregados SQL coinciden con un recuento en Python"""
+
+from datetime import datetime, timedelta
+from models import db, Project, Task
+from utils.dashboard_stats import (
+    PRIORITIES,
+    TASK_STATUSES,
+    get_dashboard_stats,
+    get_task_stats,
+    visible_task_ids
+)
+
+def _seed(make_user, make_project, make_task):
+    """Tareas propias, asignadas por otros y propias asignadas a sí mismo (solapamiento dueño-asignado)"""
+    ana, luis = make_user('ana'), make_user('luis')
+    mine, theirs = make_project(ana, 'Propio'), make_project(luis, 'Ajeno')
+    statuses = TASK_STATUSES * 3
+    for i, status in enumerate(statuses):
+        priority = PRIORITIES[i % len(PRIORITIES)]
+        due_in = timedelta(days=(i % 5) - 2)
+        make_task(mine, ana, assignee=ana, status=status, priority=priority, due_in=due_in)
+        make_task(mine, ana, assignee=luis if i % 2 else None, status=status, priority=priority, due_in=due_in)
+        make_task(theirs, luis, assignee=ana if i % 3 == 0 else luis, status=status, priority=priority)
+    return ana
+
+def _expected(user_id, now):
+    """Recuento de referencia recorriendo todas las tareas en Python"""
+    tasks = [
+        task for task in Task.query.all()
+        if db.session.get(Project, task.project_id).owner_id == user_id or task.assigned_to == user_id
+    ]
+    open_tasks = [t for t in tasks if t.status != 'completed']
+    expected = {'total': len(tasks)}
+    expected.update({s: sum(t.status == s for t in tasks) for s in TASK_STATUSES})
+    expected.update({f'open_{p}': sum(t.priority == p for t in open_tasks) for p in PRIORITIES})
+    expected['overdue'] = sum(t.due_date is not None and t.due_date < now for t in open_tasks)
+    return expected, {t.id for t in tasks}
+
+def test_visible_task_ids_counts_overlap_once(make_user, make_project, make_task):
+    ana = _seed(make_user, make_project, make_task)
+    _, expected_ids = _expected(ana.id, datetime.now())
+    ids = list(db.session.execute(visible_task_ids(ana.id)).scalars())
+    assert len(ids) == len(set(ids))
+    assert set(ids) == expected_ids
+
+def test_task_stats_match_python_count(make_user, make_project, make_task):
+    ana = _seed(make_user, make_project, make_task)
+    now = datetime.now()
+    expected, _ = _expected(ana.id, now)
+    stats = get_task_stats(ana.id, now)
+    assert {key: stats[key] for key in expected} == expected
+
+def test_dashboard_progress(make_user, make_project, make_task):
+    ana = _seed(make_user, make_project, make_task)
+    stats = get_dashboard_stats(ana.id)
+    task_stats = stats['task_stats']
+    assert task_stats['total'] == task_stats['pending'] + task_stats['in_progress'] + task_stats['completed']
+    assert stats['overall_progress'] == int(task_stats['completed'] / task_stats['total'] * 100)
+    assert stats['project_stats']['total'] == 1
@@ -0,0 +1,22 @@
+"""Perfiles del motor: PRAGMAs de SQLite aplicados y configuración de binds sin efectos entre aplicaciones"""
+
+from models import db
+from utils.db_tuning import configure_engine_options, effective_settings
+
+def test_sqlite_pragmas_applied(app):
+    settings = effective_settings(db.engine)
+    assert settings['journal_mode'].lower() == 'wal'
+    assert settings['busy_timeout'] == app.config['SQLITE_BUSY_TIMEOUT_MS']
+
+def test_binds_not_mutated_in_place():
+    from flask import Flask
+
+    shared = {'replica': 'sqlite:///replica.db'}
+    first, second = Flask('a'), Flask('b')
+    for app in (first, second):
+        app.config.update(SQLALCHEMY_DATABASE_URI='sqlite:///main.db', SQLALCHEMY_BINDS=shared)
+        configure_engine_options(app)
+
+    assert shared == {'replica': 'sqlite:///replica.db'}
+    assert first.config['SQLALCHEMY_BINDS']['replica']['url'] == 'sqlite:///replica.db'
+    assert first.config['SQLALCHEMY_BINDS'] is not second.config['SQLALCHEMY_BINDS']
@@ -0,0 +1,53 @@
+"""Cubos de vencimiento: cálculo, mantenimiento por eventos y barrido"""
+
+from datetime import datetime, timedelta
+from models import db
+from models.deadlines import (
+    LATER, OVERDUE, TODAY, WEEK, TaskDeadline, bucket_counts, bucket_for, rebuild, sweep
+)
+
+NOW = datetime(2024, 3, 4, 12, 0)
+
+def test_bucket_for_boundaries():
+    assert bucket_for(NOW - timedelta(minutes=1), NOW) == OVERDUE
+    assert bucket_for(datetime(2024, 3, 4, 23, 59), NOW) == TODAY
+    assert bucket_for(datetime(2024, 3, 5), NOW) == WEEK
+    assert bucket_for(datetime(2024, 3, 10, 23, 59), NOW) == WEEK
+    assert bucket_for(datetime(2024, 3, 11), NOW) == LATER
+
+def test_events_keep_only_open_tasks_with_due_date(make_user, make_project, make_task):
+    ana = make_user('ana')
+    project = make_project(ana)
+    open_task = make_task(project, ana, assignee=ana, due_in=timedelta(days=3))
+    make_task(project, ana, assignee=ana)
+    make_task(project, ana, assignee=ana, status='completed', due_in=timedelta(days=1))
+    assert [row.task_id for row in TaskDeadline.query.all()] == [open_task.id]
+
+    open_task.status = 'completed'
+    db.session.commit()
+    assert TaskDeadline.query.count() == 0
+
+def test_sweep_moves_rows_across_boundaries(make_user, make_project, make_task):
+    ana = make_user('ana')
+    project = make_project(ana)
+    make_task(project, ana, assignee=ana, due_in=timedelta(hours=1))
+    make_task(project, ana, assignee=ana, due_in=timedelta(days=3))
+    make_task(project, ana, assignee=ana, due_in=timedelta(days=30))
+    before = bucket_counts(ana.id)
+
+    assert sweep(datetime.now()) == 0
+    assert sweep(datetime.now() + timedelta(days=10)) == 2
+    counts = bucket_counts(ana.id)
+    assert counts[OVERDUE] == 2 and counts[LATER] == 1
+    assert sum(counts.values()) == sum(before.values()) == 3
+
+def test_sweep_matches_rebuild(make_user, make_project, make_task):
+    ana = make_user('ana')
+    project = make_project(ana)
+    for days in (-2, 0, 1, 5, 9, 40):
+        make_task(project, ana, assignee=ana, due_in=timedelta(days=days, hours=1))
+    later = datetime.now() + timedelta(days=6)
+    sweep(later)
+    swept = bucket_counts(ana.id)
+    rebuild(later)
+    assert bucket_counts(ana.id) == swept
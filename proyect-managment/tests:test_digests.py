@@ -0,0 +1,117 @@
+"""Resúmenes de vencimientos: nunca se reenvía y lo nuevo dentro de una ventana ya cubierta sí se avisa"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from models import db
+from models.digests import DigestSent, prune_sent
+from utils.digests import DigestSender, DigestService, _elect_runner, start_digest_scheduler
+
+class RecordingSender(DigestSender):
+    def __init__(self, fail=False):
+        self.messages = []
+        self.fail = fail
+
+    def send(self, message):
+        if self.fail:
+            raise OSError('SMTP caído')
+        self.messages.append(message)
+
+def _sent_to(sender):
+    return sorted(message['To'] for message in sender.messages)
+
+@pytest.fixture
+def service():
+    return DigestService(RecordingSender(), window_hours=24)
+
+def test_sender_requires_send():
+    class Incomplete(DigestSender):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_one_digest_per_user(service, make_user, make_project, make_task):
+    owner, ana, luis = make_user('owner'), make_user('ana'), make_user('luis')
+    project = make_project(owner)
+    make_task(project, owner, assignee=ana, due_in=timedelta(hours=2))
+    make_task(project, owner, assignee=ana, due_in=timedelta(hours=5))
+    make_task(project, owner, assignee=luis, due_in=timedelta(hours=3))
+    make_task(project, owner, assignee=luis, due_in=timedelta(days=3))
+    make_task(project, owner, assignee=luis, due_in=timedelta(hours=1), status='completed')
+
+    totals = service.run()
+    assert totals['users'] == 2
+    assert totals['tasks'] == 3
+    assert _sent_to(service.sender) == ['ana@example.com', 'luis@example.com']
+
+def test_rerun_never_resends(service, make_user, make_project, make_task):
+    owner, ana = make_user('owner'), make_user('ana')
+    make_task(make_project(owner), owner, assignee=ana, due_in=timedelta(hours=2))
+
+    service.run()
+    now = datetime.now() + timedelta(minutes=30)
+    assert service.run(now=now)['users'] == 0
+    assert len(service.sender.messages) == 1
+
+def test_new_task_inside_covered_window_is_sent(service, make_user, make_project, make_task):
+    owner, ana = make_user('owner'), make_user('ana')
+    project = make_project(owner)
+    make_task(project, owner, assignee=ana, due_in=timedelta(hours=20))
+    service.run()
+
+    # Vence antes que la tarea ya avisada: con una marca de agua por horizonte se perdía
+    late = make_task(project, owner, assignee=ana, due_in=timedelta(hours=4), title='Nueva')
+    totals = service.run()
+    assert totals['users'] == 1 and totals['tasks'] == 1
+    assert 'Nueva' in service.sender.messages[-1].get_content()
+    assert db.session.get(DigestSent, (ana.id, late.id, late.due_date)) is not None
+
+def test_reassigned_task_is_sent_to_new_assignee(service, make_user, make_project, make_task):
+    owner, ana, luis = make_user('owner'), make_user('ana'), make_user('luis')
+    task = make_task(make_project(owner), owner, assignee=ana, due_in=timedelta(hours=6))
+    service.run()
+
+    task.assigned_to = luis.id
+    db.session.commit()
+    service.run()
+    assert [m['To'] for m in service.sender.messages] == ['ana@example.com', 'luis@example.com']
+
+def test_failed_send_is_retried(make_user, make_project, make_task):
+    owner, ana = make_user('owner'), make_user('ana')
+    make_task(make_project(owner), owner, assignee=ana, due_in=timedelta(hours=2))
+
+    failing = DigestService(RecordingSender(fail=True))
+    assert failing.run()['failed'] == 1
+    assert DigestSent.query.count() == 0
+
+    service = DigestService(RecordingSender())
+    assert service.run()['users'] == 1
+
+def test_prune_sent_forgets_past_due_dates(service, make_user, make_project, make_task):
+    owner, ana = make_user('owner'), make_user('ana')
+    make_task(make_project(owner), owner, assignee=ana, due_in=timedelta(hours=2))
+    service.run()
+    assert prune_sent(datetime.now()) == 0
+    assert prune_sent(datetime.now() + timedelta(hours=3)) == 1
+
+def test_create_app_does_not_start_scheduler(app):
+    assert 'digest_scheduler' not in app.extensions
+
+def test_single_scheduler_runner(app, tmp_path):
+    app.instance_path = str(tmp_path)
+    app.config.update(DIGEST_SCHEDULER_ENABLED=True, DIGEST_INTERVAL_SECONDS=3600)
+    other = SimpleNamespace(instance_path=str(tmp_path), config=app.config, extensions={})
+    runner = start_digest_scheduler(app)
+    try:
+        assert runner is not None
+        assert start_digest_scheduler(app) is runner
+        assert start_digest_scheduler(other) is None
+    finally:
+        runner.stop()
+        app.extensions.pop('digest_scheduler')
+        app.extensions.pop('digest_scheduler_lock').close()
+    # Al soltarse el cerrojo (el worker elegido terminó) el siguiente lo toma
+    assert 'digest_scheduler_lock' not in other.extensions
+    assert _elect_runner(other)
+    other.extensions['digest_scheduler_lock'].close()
@@ -0,0 +1,64 @@
+"""Caché de fragmentos: versión de datos por usuario y coste solo cuando se renderiza una etiqueta"""
+
+from datetime import timedelta
+from flask import g
+from flask_login import login_user
+from models import db
+from utils.fragments import data_version, get_fragment_store
+
+def _version(user_id):
+    g.pop('_data_versions', None)
+    return data_version(user_id)
+
+def _render(app, source, **context):
+    return app.jinja_env.from_string(source).render(**context)
+
+def test_data_version_bumps_on_task_change(make_user, make_project, make_task):
+    owner, member = make_user('owner'), make_user('member')
+    project = make_project(owner)
+    before = _version(member.id)
+    task = make_task(project, owner, assignee=member)
+    assert _version(member.id) > before
+
+    before = _version(member.id)
+    task.title = 'Renombrada'
+    db.session.commit()
+    assert _version(member.id) > before
+
+def test_project_rename_bumps_every_member(make_user, make_project, make_task):
+    owner, assignee, creator = make_user('owner'), make_user('assignee'), make_user('creator')
+    project = make_project(owner)
+    make_task(project, creator, assignee=assignee, due_in=timedelta(days=1))
+    before = {user.id: _version(user.id) for user in (owner, assignee, creator)}
+
+    project.name = 'Nuevo nombre'
+    db.session.commit()
+
+    for user_id, version in before.items():
+        assert _version(user_id) > version
+
+def test_version_only_computed_when_a_tag_renders(app, make_user, monkeypatch):
+    import models.changes
+    calls = []
+    real = models.changes.current_token
+    monkeypatch.setattr(models.changes, 'current_token', lambda *a, **kw: calls.append(a) or real(*a, **kw))
+    user = make_user('ana')
+    with app.test_request_context('/'):
+        login_user(user)
+        assert _render(app, '<p>{{ n }}</p>', n=1) == '<p>1</p>'
+        assert calls == []
+        _render(app, "{% cache 'a' %}x{% endcache %}{% cache 'b' %}y{% endcache %}")
+        assert len(calls) == 1
+
+def test_fragment_served_until_data_changes(app, make_user, make_project):
+    user = make_user('ana')
+    get_fragment_store().clear()
+    source = "{% cache 'panel' %}{{ value }}{% endcache %}"
+    with app.test_request_context('/'):
+        login_user(user)
+        assert _render(app, source, value='uno') == 'uno'
+        assert _render(app, source, value='dos') == 'uno'
+    make_project(user)
+    with app.test_request_context('/'):
+        login_user(user)
+        assert _render(app, source, value='dos') == 'dos'
@@ -0,0 +1,48 @@
+"""Caché de identidades del user_loader: instantáneas sin secretos e invalidación por fila"""
+
+from sqlalchemy import update
+from models import db, User
+from utils.identity import get_identity_cache, snapshot
+from utils.passwords import get_password_hasher, verify_user_password
+
+def test_snapshot_has_no_password_hash(make_user):
+    assert 'password_hash' not in snapshot(make_user('alice'))
+
+def test_cache_hit_skips_query(make_user):
+    user = make_user('bob')
+    cache = get_identity_cache()
+    cache.load(user.id)
+    db.session.expunge_all()
+    assert cache.load(user.id).username == 'bob'
+    assert cache.stats()['hits'] == 1
+
+def test_invalidated_on_user_change(make_user):
+    user = make_user('bob')
+    cache = get_identity_cache()
+    cache.load(user.id)
+    db.session.expunge_all()
+
+    user = db.session.get(User, user.id)
+    user.full_name = 'Roberto'
+    db.session.commit()
+    db.session.expunge_all()
+    assert cache.load(user.id).full_name == 'Roberto'
+
+def test_password_checked_against_current_hash(make_user):
+    user = make_user('carol', password='Viejo123!')
+    cache = get_identity_cache()
+    cache.load(user.id)
+
+    # Cambio fuera del ORM: no pasa por la invalidación, la instantánea sigue en la caché
+    db.session.execute(
+        update(User).where(User.id == user.id)
+        .values(password_hash=get_password_hasher().hash('Nuevo123!'))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    db.session.expunge_all()
+
+    cached = cache.load(user.id)
+    assert cache.stats()['hits'] == 1
+    assert not verify_user_password(cached, 'Viejo123!')
+    assert verify_user_password(cached, 'Nuevo123!')
@@ -0,0 +1,37 @@
+"""Servicio de hashing: verificación, rehash al cambiar el coste y contrapresión"""
+
+import threading
+import pytest
+from models import db, User
+from utils.passwords import HasherBusy, PasswordHasher, get_password_hasher, verify_user_password
+
+def test_hash_and_verify():
+    hasher = PasswordHasher(rounds=4, workers=1)
+    password_hash = hasher.hash('Secreto123!')
+    assert hasher.verify('Secreto123!', password_hash)
+    assert not hasher.verify('otra', password_hash)
+    assert not hasher.needs_rehash(password_hash)
+
+def test_rehash_when_cost_changes(make_user):
+    user = make_user('ana', password='Secreto123!')
+    hasher = get_password_hasher()
+    hasher.rounds = 5
+
+    assert verify_user_password(user, 'Secreto123!')
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(User, user.id).password_hash.split('$')[2] == '05'
+    assert hasher.stats()['rehashes'] == 1
+
+def test_full_pool_raises_busy():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1, timeout=5)
+    release = threading.Event()
+    hasher._pool.submit(release.wait)
+    blocked = threading.Thread(target=lambda: hasher._run(release.wait))
+    blocked.start()
+    try:
+        with pytest.raises(HasherBusy):
+            hasher.hash('x')
+    finally:
+        release.set()
+        blocked.join()
@@ -0,0 +1,25 @@
+"""Regresión de índices: ninguna consulta caliente del dashboard recorre una tabla completa"""
+
+from datetime import timedelta
+from models import db
+from models.indexes import create_missing_indexes
+from utils.query_plan import check_query_plans, full_scans
+
+def test_hot_queries_use_indexes(make_user, make_project, make_task):
+    create_missing_indexes()
+    ana, luis = make_user('ana'), make_user('luis')
+    for owner in (ana, luis):
+        project = make_project(owner)
+        for days in range(-2, 5):
+            make_task(project, owner, assignee=luis, due_in=timedelta(days=days))
+    db.session.execute(db.text('ANALYZE'))
+
+    violations = check_query_plans(ana.id)
+    assert violations == [], '\n'.join(f"{v['query']}: {v['scans']}\n{v['sql']}" for v in violations)
+
+def test_full_scan_detection():
+    tables = {'tasks', 'projects'}
+    assert full_scans(['SCAN tasks'], tables) == ['SCAN tasks']
+    assert full_scans(['SCAN TABLE projects'], tables) == ['SCAN TABLE projects']
+    assert full_scans(['SEARCH tasks USING INDEX ix_tasks_project_id (project_id=?)'], tables) == []
+    assert full_scans(['SCAN sqlite_master'], tables) == []
@@ -0,0 +1,39 @@
+"""Enrutado a la réplica: qué escrituras fijan al primario y cuánto vive lo leído de la réplica"""
+
+from flask import g
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models import db, Project
+from utils.replica import _install_listeners, _route_reads, cache_ttl, reading_replica
+
+def test_listeners_installed_once(app):
+    _install_listeners()
+    _install_listeners()
+    assert event.contains(Session, 'do_orm_execute', _route_reads)
+    assert sum(fn is _route_reads for fn in Session.dispatch.do_orm_execute) <= 1
+
+def test_flush_of_tracked_model_marks_write(app, make_user):
+    ana = make_user('ana')
+    _install_listeners()
+    with app.test_request_context('/'):
+        db.session.add(Project(name='P', description='', priority='medium', status='active', owner_id=ana.id))
+        db.session.flush()
+        assert g.get('_wrote')
+        db.session.rollback()
+
+def test_untracked_write_does_not_pin(app):
+    _install_listeners()
+    with app.test_request_context('/'):
+        from models.digests import DigestSent
+        db.session.query(DigestSent).delete()
+        assert not g.get('_wrote')
+
+def test_cache_ttl_capped_while_reading_replica(app):
+    app.config['READ_REPLICA_MAX_LAG_SECONDS'] = 3
+    with app.test_request_context('/'):
+        assert cache_ttl(60) == 60
+        g._replica_engine = object()
+        assert reading_replica()
+        assert cache_ttl(60) == 3
+        g._wrote = True
+        assert cache_ttl(60) == 60
@@ -0,0 +1,58 @@
+"""Cola de informes: un único proceso ejecuta cada trabajo y la recuperación no duplica trabajos vivos"""
+
+import os
+from utils import reports as reports_module
+from utils.reports import DONE, QUEUED, RUNNING, ReportCache, ReportQueue
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+def _queue(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(reports_module.time, 'time', clock.time)
+    return ReportQueue(str(tmp_path / 'jobs.db')), clock
+
+def test_claim_is_exclusive(tmp_path, monkeypatch):
+    queue, _ = _queue(tmp_path, monkeypatch)
+    job_id = queue.enqueue(1, {}, 'k')
+    assert queue.claim(job_id)
+    assert not queue.claim(job_id)
+    assert queue.get(job_id)['status'] == RUNNING
+
+def test_stale_counts_from_start_not_enqueue(tmp_path, monkeypatch):
+    queue, clock = _queue(tmp_path, monkeypatch)
+    waited = queue.enqueue(1, {}, 'a')
+    clock.now += 900
+    queue.claim(waited)
+
+    clock.now += 10
+    # Encolado hace 910 s pero ejecutándose desde hace 10 s: sigue vivo
+    assert queue.requeue_stale(600) == 0
+    clock.now += 600
+    assert queue.requeue_stale(600) == 1
+    assert queue.get(waited)['status'] == QUEUED
+
+def test_recovery_claimed_once_per_deployment(tmp_path, monkeypatch):
+    queue, _ = _queue(tmp_path, monkeypatch)
+    assert queue.claim_recovery('gunicorn:1')
+    assert not queue.claim_recovery('gunicorn:1')
+    assert queue.claim_recovery('gunicorn:2')
+
+def test_finished_jobs_are_purged(tmp_path, monkeypatch):
+    queue, clock = _queue(tmp_path, monkeypatch)
+    job_id = queue.enqueue(1, {}, 'k', status=DONE)
+    clock.now += 100
+    assert queue.purge(50) == 1
+    assert queue.get(job_id) is None
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ReportCache(str(tmp_path / 'cache'), max_bytes=10)
+    cache.put('old', b'12345')
+    os.utime(cache.path('old'), (1, 1))
+    cache.put('new', b'123456')
+    assert cache.get('old') is None
+    assert cache.get('new') is not None
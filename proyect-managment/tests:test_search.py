@@ -0,0 +1,48 @@
+"""Búsqueda de texto: visibilidad de resultados, índice FTS5 y alternativa LIKE"""
+
+import pytest
+from flask import current_app
+from sqlalchemy import text
+from models import db
+from models.search import FTS_TABLE, fts_enabled, fts_query, reindex, search
+
+@pytest.fixture
+def seeded(app, make_user, make_project, make_task):
+    if fts_enabled():
+        db.session.execute(text(f'DELETE FROM {FTS_TABLE}'))
+        db.session.commit()
+    ana, bea = make_user('ana'), make_user('bea')
+    web = make_project(ana, name='Diseño web')
+    make_task(web, ana, title='Maquetar portada')
+    make_task(web, ana, assignee=bea, title='Revisar diseño de la portada')
+    ajena = make_project(bea, name='Privado')
+    make_task(ajena, bea, title='Portada secreta')
+    return ana, bea
+
+def _titles(results):
+    return sorted(row['title'] for row in results)
+
+def test_fts_query_prefix_per_word():
+    assert fts_query('dise web!') == '"dise"* "web"*'
+    assert fts_query('  ') == ''
+
+def test_flag_belongs_to_app(app):
+    assert current_app.extensions['search']['fts'] == fts_enabled()
+
+@pytest.mark.parametrize('fts', [True, False])
+def test_search_only_visible(seeded, fts):
+    if fts and not fts_enabled():
+        pytest.skip('SQLite sin FTS5')
+    current_app.extensions['search']['fts'] = fts
+    ana, bea = seeded
+    assert _titles(search(ana.id, 'portada')) == ['Maquetar portada', 'Revisar diseño de la portada']
+    assert _titles(search(bea.id, 'portada')) == ['Portada secreta', 'Revisar diseño de la portada']
+
+def test_reindex_rebuilds_documents(seeded):
+    if not fts_enabled():
+        pytest.skip('SQLite sin FTS5')
+    db.session.execute(text(f'DELETE FROM {FTS_TABLE}'))
+    db.session.commit()
+    assert reindex(batch_size=2) == 5
+    ana, _ = seeded
+    assert _titles(search(ana.id, 'maquet')) == ['Maquetar portada']
@@ -0,0 +1,46 @@
+"""Caché de estadísticas por usuario invalidada por las escrituras"""
+
+from flask import Flask
+from models.events import _subscribers
+from utils.cache import MemoryBackend, StatsCache, get_stats_cache
+
+def test_stats_cache_invalidated_for_assignee_and_owner(make_user, make_project, make_task):
+    owner, member = make_user('owner'), make_user('member')
+    project = make_project(owner)
+    cache = get_stats_cache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'total': len(calls)}
+
+    for user in (owner, member):
+        cache.get_or_set('dashboard', user.id, compute)
+        cache.get_or_set('dashboard', user.id, compute)
+    assert len(calls) == 2
+
+    make_task(project, owner, assignee=member)
+    cache.get_or_set('dashboard', owner.id, compute)
+    cache.get_or_set('dashboard', member.id, compute)
+    assert len(calls) == 4
+
+def test_unrelated_user_keeps_cache(make_user, make_project, make_task):
+    owner, other = make_user('owner'), make_user('other')
+    cache = get_stats_cache()
+    cache.get_or_set('dashboard', other.id, lambda: {'total': 0})
+    make_task(make_project(owner), owner)
+    assert cache.backend.get(cache.key('dashboard', other.id)) == {'total': 0}
+
+def test_memory_backend_expires_and_is_bounded():
+    backend = MemoryBackend(max_entries=2)
+    for user_id in range(3):
+        backend.set(StatsCache.key('dashboard', user_id), {'total': 1}, 60)
+    assert len(backend) == 2
+    assert backend.get(StatsCache.key('dashboard', 0)) is None
+    backend.set('k', 1, -1)
+    assert backend.get('k') is None
+
+def test_subscribers_are_per_app(app):
+    other = Flask(__name__)
+    assert _subscribers(other) == {'users': [], 'identity': []}
+    assert _subscribers(app)['users']
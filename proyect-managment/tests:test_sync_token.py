@@ -0,0 +1,65 @@
+"""Tokens de sincronización: poda del registro y respuesta 410 para tokens anteriores"""
+
+from datetime import datetime, timedelta
+from models import db
+from models.changes import current_token, oldest_token, prune_changes
+
+def test_changes_since_token(make_user, make_project, make_task, login):
+    owner = make_user('owner')
+    project = make_project(owner)
+    client = login(owner)
+
+    token = client.get('/api/v2/changes').get_json()['sync_token']
+    task = make_task(project, owner, assignee=owner)
+
+    body = client.get(f'/api/v2/changes?since={token}').get_json()
+    assert [t['id'] for t in body['tasks']] == [task.id]
+    assert body['sync_token'] > token
+
+def test_pruned_token_requires_full_sync(make_user, make_project, make_task, login):
+    owner = make_user('owner')
+    project = make_project(owner)
+    make_task(project, owner)
+    client = login(owner)
+    old_token = 0
+
+    assert prune_changes(datetime.now() + timedelta(seconds=1)) > 0
+    # Tras una poda completa el registro está vacío y aun así el token viejo se rechaza
+    assert oldest_token() > old_token
+    response = client.get(f'/api/v2/changes?since={old_token}')
+    assert response.status_code == 410
+
+    body = client.get('/api/v2/changes').get_json()
+    assert body['sync_token'] >= oldest_token()
+    assert client.get(f"/api/v2/changes?since={body['sync_token']}").status_code == 200
+
+def test_current_token_never_behind_prune_mark(make_user, make_project):
+    owner = make_user('owner')
+    make_project(owner)
+    prune_changes(datetime.now() + timedelta(seconds=1))
+    db.session.expire_all()
+    assert current_token(owner.id) == oldest_token()
+
+def test_affected_users_computed_once_per_row(make_user, make_project, make_task, monkeypatch):
+    import models.events as events
+
+    owner = make_user('owner')
+    project = make_project(owner)
+    calls = []
+    original = events.affected_user_ids
+
+    def counting(connection, target):
+        calls.append(target)
+        return original(connection, target)
+
+    monkeypatch.setattr(events, 'affected_user_ids', counting)
+    make_task(project, owner, assignee=owner)
+    assert len(calls) == 1
+
+def test_settle_window_only_on_server_databases(app, make_user, make_project):
+    from models.changes import _settled_before
+
+    owner = make_user('owner')
+    make_project(owner)
+    assert _settled_before() is None
+    assert current_token(owner.id, settled=True) == current_token(owner.id)
@@ -0,0 +1,85 @@
+"""Límite de intentos de login: ventana deslizante, Retry-After y purga de claves"""
+
+import pytest
+from utils import throttle as throttle_module
+from utils.throttle import LoginThrottle, MemoryWindowStore, SQLiteWindowStore
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(throttle_module.time, 'time', clock.time)
+    return clock
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteWindowStore(str(tmp_path / 'attempts.db'))
+    return MemoryWindowStore(max_keys=100)
+
+def test_rejects_user_after_limit(store, clock):
+    throttle = LoginThrottle(store, window=60, max_per_ip=100, max_per_user=3)
+    for _ in range(3):
+        assert throttle.check('10.0.0.1', 'ana')[0]
+        throttle.record_failure('10.0.0.1', 'ana')
+    allowed, _ = throttle.check('10.0.0.2', 'ANA')
+    assert not allowed
+    assert throttle.check('10.0.0.2', 'luis')[0]
+
+def test_retry_after_counts_from_oldest_failure(store, clock):
+    throttle = LoginThrottle(store, window=60, max_per_ip=100, max_per_user=2)
+    throttle.record_failure('ip', 'ana')
+    clock.now += 30
+    throttle.record_failure('ip', 'ana')
+    clock.now += 5
+
+    allowed, retry_after = throttle.check('ip', 'ana')
+    assert not allowed
+    # La primera marca sale de la ventana en 60 - 35 = 25 s, no en la ventana completa
+    assert retry_after == 25
+
+    clock.now += retry_after + 1
+    assert throttle.check('ip', 'ana')[0]
+
+def test_success_resets_user_but_not_ip(store, clock):
+    throttle = LoginThrottle(store, window=60, max_per_ip=2, max_per_user=2)
+    throttle.record_failure('ip', 'ana')
+    throttle.record_success('ip', 'ana')
+    throttle.record_failure('ip', 'luis')
+    assert throttle.check('ip', 'ana')[0] is False
+
+def test_purge_forgets_expired_keys(store, clock):
+    throttle = LoginThrottle(store, window=60, max_per_ip=100, max_per_user=5, purge_interval=10)
+    for i in range(5):
+        throttle.record_failure(f'10.0.0.{i}', f'user{i}')
+    assert len(store) == 10
+
+    clock.now += 120
+    throttle.record_failure('10.0.0.9', 'otro')
+    assert len(store) == 2
+    assert throttle.stats()['purged'] > 0
+
+def test_memory_store_bounded_by_max_keys(clock):
+    store = MemoryWindowStore(max_keys=3)
+    throttle = LoginThrottle(store, window=60, max_per_ip=100, max_per_user=5)
+    for i in range(10):
+        throttle.record_failure('ip', f'user{i}')
+    assert len(store) == 3
+
+def test_login_returns_429_with_retry_after(app, make_user):
+    from utils.throttle import get_login_throttle
+
+    make_user('ana')
+    throttle = get_login_throttle()
+    throttle.limits['user'] = 1
+    throttle.record_failure('127.0.0.1', 'ana')
+
+    response = app.test_client().post('/auth/login', data={'username': 'ana', 'password': 'x'})
+    assert response.status_code == 429
+    assert 1 <= int(response.headers['Retry-After']) <= throttle.window
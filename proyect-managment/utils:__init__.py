@@ -1,4 +1,6 @@
 # Utilidades del proyecto
+import importlib
+
 from .decorators import admin_required, active_user_required
 from .validators import (
     validate_email,
@@ -8,11 +10,24 @@ from .validators import (
     validate_priority,
     validate_status
 )
-from .exports import (
-    export_tasks_to_csv,
-    export_projects_to_csv,
-    export_tasks_to_pdf
-)
+
+# Exportaciones: reportlab solo se carga en el primer uso (menos arranque y memoria por worker)
+_LAZY = {
+    'export_tasks_to_csv': '.exports',
+    'export_projects_to_csv': '.exports',
+    'export_tasks_to_pdf': '.exports'
+}
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
 
 __all__ = [
     'admin_required',
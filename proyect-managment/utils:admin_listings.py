@@ -0,0 +1,146 @@
+"""
+Listados de administración de usuarios y proyectos
+Páginas keyset sobre columnas indexadas; los totales por usuario salen de un único subquery agrupado
+limitado a los ids de la página, y las acciones masivas son un solo UPDATE
+"""
+
+from sqlalchemy import and_, func, select, update
+from models import db, Project, User
+from models.counters import TaskCounter
+from models.events import notify_identity_changed
+from utils.pagination import DEFAULT_LIMIT, decode_keyset, encode_cursor, keyset_after
+
+MAX_BATCH = 1000
+
+USER_SORTS = {
+    'created_at': User.created_at,
+    'username': User.username
+}
+
+PROJECT_SORTS = {
+    'created_at': Project.created_at
+}
+
+USER_COLUMNS = (
+    User.id, User.username, User.email, User.full_name, User.role, User.is_active, User.created_at
+)
+
+PROJECT_COLUMNS = (
+    Project.id, Project.name, Project.status, Project.priority, Project.owner_id,
+    Project.created_at, Project.updated_at
+)
+
+def _page_select(columns, sorts, sort, id_column, where, cursor, limit):
+    """SELECT de la página (limit + 1 filas) ordenada por (sort, id); sort con '-' es descendente"""
+    descending = sort.startswith('-')
+    name = sort.lstrip('-')
+    if name not in sorts:
+        raise ValueError(f'Orden no admitido: {name}')
+    sort_column = sorts[name]
+
+    stmt = select(*columns).where(*where)
+    if cursor:
+        value, row_id = decode_keyset(cursor, sort_is_datetime=name.endswith('_at'))
+        stmt = stmt.where(keyset_after(sort_column, id_column, value, row_id, descending))
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column, id_column)
+    return stmt.limit(limit + 1), name, descending
+
+def _split(rows, sort_name, limit):
+    rows = [dict(row._mapping) for row in rows]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor((rows[-1][sort_name], rows[-1]['id'])) if has_more else None
+    return rows, next_cursor
+
+def user_filters(role=None, is_active=None, created_from=None, created_to=None):
+    where = []
+    if role:
+        where.append(User.role == role)
+    if is_active is not None:
+        where.append(User.is_active == is_active)
+    if created_from is not None:
+        where.append(User.created_at >= created_from)
+    if created_to is not None:
+        where.append(User.created_at < created_to)
+    return where
+
+def list_users(where=(), sort='-created_at', cursor=None, limit=DEFAULT_LIMIT):
+    """Página de usuarios con sus proyectos, tareas de esos proyectos y tareas asignadas
+
+    Los totales se agregan solo para los ids de la página (GROUP BY owner_id sobre el índice
+    de dueño) y las tareas salen de task_counters por clave primaria, sin contar en Python
+    """
+    page_stmt, sort_name, descending = _page_select(
+        USER_COLUMNS, USER_SORTS, sort, User.id, where, cursor, limit
+    )
+    page = page_stmt.subquery('page')
+
+    project_counter = and_(TaskCounter.scope == 'project', TaskCounter.scope_id == Project.id)
+    counts = select(
+        Project.owner_id.label('user_id'),
+        func.count(Project.id).label('projects'),
+        func.coalesce(func.sum(TaskCounter.total), 0).label('tasks')
+    ).outerjoin(TaskCounter, project_counter).where(
+        Project.owner_id.in_(select(page.c.id))
+    ).group_by(Project.owner_id).subquery('counts')
+
+    assigned = TaskCounter.__table__.alias('assigned')
+    sort_column = page.c[sort_name]
+    stmt = select(
+        page,
+        func.coalesce(counts.c.projects, 0).label('projects'),
+        func.coalesce(counts.c.tasks, 0).label('tasks'),
+        func.coalesce(assigned.c.total, 0).label('assigned_tasks')
+    ).outerjoin(counts, counts.c.user_id == page.c.id).outerjoin(
+        assigned, and_(assigned.c.scope == 'assignee', assigned.c.scope_id == page.c.id)
+    ).order_by(
+        *((sort_column.desc(), page.c.id.desc()) if descending else (sort_column, page.c.id))
+    )
+    return _split(db.session.execute(stmt), sort_name, limit)
+
+def project_filters(status=None, owner_id=None, created_from=None, created_to=None):
+    where = []
+    if status:
+        where.append(Project.status == status)
+    if owner_id is not None:
+        where.append(Project.owner_id == owner_id)
+    if created_from is not None:
+        where.append(Project.created_at >= created_from)
+    if created_to is not None:
+        where.append(Project.created_at < created_to)
+    return where
+
+def list_projects(where=(), sort='-created_at', cursor=None, limit=DEFAULT_LIMIT):
+    """Página de proyectos con el dueño y los totales de tareas (task_counters por clave primaria)"""
+    columns = PROJECT_COLUMNS + (
+        User.username.label('owner'),
+        func.coalesce(TaskCounter.total, 0).label('tasks'),
+        func.coalesce(TaskCounter.completed, 0).label('completed_tasks')
+    )
+    stmt, sort_name, _ = _page_select(
+        columns, PROJECT_SORTS, sort, Project.id, where, cursor, limit
+    )
+    stmt = stmt.join(User, User.id == Project.owner_id).outerjoin(
+        TaskCounter, and_(TaskCounter.scope == 'project', TaskCounter.scope_id == Project.id)
+    )
+    return _split(db.session.execute(stmt), sort_name, limit)
+
+def set_users_active(user_ids, active, acting_user_id):
+    """Activa o desactiva usuarios con un único UPDATE; nunca al propio administrador
+
+    Devuelve cuántas filas cambiaron
+    """
+    user_ids = [uid for uid in user_ids if uid != acting_user_id]
+    if not user_ids:
+        return 0
+    result = db.session.execute(
+        update(User).where(
+            User.id.in_(user_ids), User.is_active != active
+        ).values(is_active=active).execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    notify_identity_changed(user_ids)
+    return result.rowcount
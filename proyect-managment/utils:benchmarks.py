@@ -0,0 +1,118 @@
+"""
+Benchmarks de las rutas calientes con el cliente de pruebas de Flask
+Mide throughput y latencias p50/p95/p99 y las compara con una línea base guardada en JSON
+"""
+
+import json
+import time
+from flask import url_for
+from models import User
+from utils.seed import SEED_PASSWORD, USERNAME_PREFIX
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples, elapsed):
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(samples, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 2)
+    }
+
+def _heaviest_user():
+    """El primer usuario generado es el más cargado (distribución de Zipf de utils.seed)"""
+    return User.query.filter(User.username.like(f'{USERNAME_PREFIX}%')).order_by(User.id).first()
+
+def _login(client, username):
+    response = client.post('/auth/login', data={'username': username, 'password': SEED_PASSWORD})
+    if response.status_code not in (200, 302):
+        raise RuntimeError(f'Login del benchmark fallido ({response.status_code})')
+    return response
+
+def _scenarios(app, username):
+    with app.test_request_context():
+        urls = {
+            'dashboard': url_for('dashboard.index'),
+            'profile': url_for('dashboard.profile'),
+            'export_tasks_csv': url_for('exports.tasks_csv'),
+            'api_tasks': url_for('api_v2.list_tasks', limit=100)
+        }
+
+    client = app.test_client()
+    _login(client, username)
+
+    def get(url):
+        def run():
+            response = client.get(url)
+            # Consumir todo el cuerpo: las exportaciones se envían por streaming
+            response.get_data()
+            response.close()
+            return response.status_code
+        return run
+
+    def login():
+        return _login(app.test_client(), username).status_code
+
+    scenarios = {name: get(url) for name, url in urls.items()}
+    scenarios['login'] = login
+    return scenarios
+
+def run_benchmarks(app, iterations=100, warmup=5, only=None):
+    """Ejecuta cada escenario y devuelve sus estadísticas"""
+    with app.app_context():
+        user = _heaviest_user()
+        if user is None:
+            raise RuntimeError('No hay datos de carga: ejecuta antes flask seed-scale')
+        username = user.username
+
+    results = {}
+    for name, run in _scenarios(app, username).items():
+        if only and name not in only:
+            continue
+        for _ in range(warmup):
+            run()
+        samples = []
+        errors = 0
+        started = time.perf_counter()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            if run() >= 400:
+                errors += 1
+            samples.append(time.perf_counter() - start)
+        results[name] = summarize(samples, time.perf_counter() - started)
+        results[name]['errors'] = errors
+    return results
+
+def compare(results, baseline, tolerance=0.2):
+    """Escenarios cuyo p95 supera la línea base en más de la tolerancia"""
+    regressions = []
+    for name, stats in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference.get('p95_ms'):
+            continue
+        ratio = stats['p95_ms'] / reference['p95_ms']
+        if ratio > 1 + tolerance:
+            regressions.append({
+                'scenario': name,
+                'p95_ms': stats['p95_ms'],
+                'baseline_p95_ms': reference['p95_ms'],
+                'ratio': round(ratio, 2)
+            })
+    return regressions
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_baseline(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
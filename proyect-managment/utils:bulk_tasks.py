@@ -0,0 +1,319 @@
+"""
+Operaciones masivas sobre tareas
+Valida todo el lote antes de escribir y aplica los cambios con executemany en una sola transacción
+"""
+
+from datetime import datetime
+from sqlalchemy import delete, insert, select
+from models import db, Project, Task, User
+from models.changes import DELETE, UPSERT, record_changes
+from models.counters import record_task
+from models.deadlines import refresh_deadlines
+from models.events import notify_users_changed
+from models.search import refresh_index, remove_from_index
+from utils.dashboard_stats import visible_task_ids
+from utils.validators import validate_date, validate_priority, validate_status
+
+MAX_BATCH = 1000
+UPDATABLE_FIELDS = ('title', 'description', 'priority', 'status', 'due_date')
+# Columnas de las que dependen los contadores de tareas
+COUNTED_FIELDS = ('status', 'priority', 'due_date', 'project_id', 'created_by', 'assigned_to')
+
+class BulkError(ValueError):
+    """El lote no se aplica: contiene los resultados por elemento con los errores"""
+
+    def __init__(self, results):
+        super().__init__('El lote contiene elementos inválidos')
+        self.results = results
+
+def _parse_due_date(value):
+    if value in (None, ''):
+        return None
+    if not isinstance(value, str) or not validate_date(value):
+        raise ValueError('Fecha límite inválida')
+    return datetime.strptime(value, '%Y-%m-%d')
+
+def _clean_fields(item, errors):
+    values = {}
+    if 'title' in item:
+        title = item['title'].strip() if isinstance(item['title'], str) else ''
+        if not title:
+            errors.append('El título es obligatorio')
+        values['title'] = title
+    if 'description' in item:
+        if item['description'] is not None and not isinstance(item['description'], str):
+            errors.append('Descripción inválida')
+        values['description'] = item['description'] or ''
+    if 'priority' in item:
+        if not isinstance(item['priority'], str) or not validate_priority(item['priority']):
+            errors.append('Prioridad inválida')
+        values['priority'] = item['priority']
+    if 'status' in item:
+        if not isinstance(item['status'], str) or not validate_status(item['status']):
+            errors.append('Estado inválido')
+        values['status'] = item['status']
+    if 'due_date' in item:
+        try:
+            values['due_date'] = _parse_due_date(item['due_date'])
+        except ValueError as e:
+            errors.append(str(e))
+    return values
+
+def _completed_at(old_status, new_status, old_completed_at, now):
+    """completed_at coherente con la transición de estado"""
+    if new_status == 'completed':
+        return old_completed_at if old_status == 'completed' else now
+    return None
+
+def _is_ref(value):
+    """Id de otra fila: entero (no bool); listas, dicts o textos no llegan a las consultas"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _refs(items, field):
+    """Ids válidos de un campo en todo el lote (los inválidos se rechazan por elemento)"""
+    return {item.get(field) for item in items if isinstance(item, dict) and _is_ref(item.get(field))}
+
+def _item_id(item):
+    value = item.get('id') if isinstance(item, dict) else item
+    if _is_ref(value):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+def _duplicates(items):
+    """Índices de los elementos cuyo id ya apareció antes en el lote"""
+    seen, repeated = set(), set()
+    for index, item in enumerate(items):
+        task_id = _item_id(item)
+        if task_id is None:
+            continue
+        if task_id in seen:
+            repeated.add(index)
+        seen.add(task_id)
+    return repeated
+
+def _existing(user_id, ids, owner_only=False):
+    """Filas actuales de las tareas del lote que el usuario puede modificar"""
+    if not ids:
+        return {}
+    query = select(
+        Task.id, Task.status, Task.priority, Task.due_date, Task.completed_at, Task.project_id,
+        Task.assigned_to, Task.created_by, Project.owner_id
+    ).join(Project, Task.project_id == Project.id).where(Task.id.in_(ids))
+    if owner_only:
+        query = query.where(Project.owner_id == user_id)
+    else:
+        query = query.where(Task.id.in_(visible_task_ids(user_id)))
+    return {row.id: row for row in db.session.execute(query)}
+
+def _check(results):
+    if any(result['status'] == 'error' for result in results):
+        raise BulkError(results)
+
+def _result(index, task_id=None, errors=None):
+    if errors:
+        return {'index': index, 'id': task_id, 'status': 'error', 'errors': errors}
+    return {'index': index, 'id': task_id, 'status': 'ok'}
+
+def _commit(affected, op, counted):
+    """Registro de cambios, índices y contadores del lote y commit: todo en la misma transacción
+
+    counted: (valores de la tarea, +1/-1) con los mismos deltas que aplican los eventos del ORM
+    """
+    connection = db.session.connection()
+    for task_id, users in affected.items():
+        record_changes(connection, 'task', [task_id], op, users)
+    if op == DELETE:
+        remove_from_index(connection, Task, list(affected))
+    else:
+        refresh_index(connection, Task, list(affected))
+    refresh_deadlines(connection, list(affected))
+    for values, sign in counted:
+        record_task(connection, values, sign)
+    db.session.commit()
+    notify_users_changed(set().union(*affected.values()) if affected else set())
+
+def _track(affected, task_id, owner_id, assigned_to, created_by):
+    affected.setdefault(task_id, set()).update(
+        uid for uid in (owner_id, assigned_to, created_by) if uid is not None
+    )
+
+def _counted(values, **changes):
+    """Valores de la tarea que usan los contadores, con los cambios indicados aplicados"""
+    snapshot = {name: values.get(name) for name in COUNTED_FIELDS}
+    snapshot.update({name: value for name, value in changes.items() if name in COUNTED_FIELDS})
+    return snapshot
+
+def _count_change(counted, row, **changes):
+    """Resta la tarea como era y la suma como queda (solo si cambia algo que se cuenta)"""
+    before = _counted(row._mapping)
+    after = _counted(row._mapping, **changes)
+    if before != after:
+        counted += [(before, -1), (after, +1)]
+
+def _check_size(items):
+    if not isinstance(items, list) or not items:
+        raise BulkError([{'index': None, 'status': 'error', 'errors': ['Se esperaba una lista no vacía']}])
+    if len(items) > MAX_BATCH:
+        raise BulkError([{'index': None, 'status': 'error',
+                          'errors': [f'Máximo {MAX_BATCH} elementos por lote']}])
+
+def bulk_create(user_id, items, now=None):
+    """Crea tareas en proyectos propios con un único INSERT ... RETURNING multivalor"""
+    _check_size(items)
+    now = now or datetime.now()
+
+    project_ids = _refs(items, 'project_id')
+    owned = set(db.session.execute(
+        select(Project.id).where(Project.id.in_(project_ids), Project.owner_id == user_id)
+    ).scalars())
+    assignees = _refs(items, 'assigned_to')
+    known_users = set(db.session.execute(select(User.id).where(User.id.in_(assignees))).scalars())
+
+    results, rows = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append(_result(index, errors=['Elemento inválido']))
+            continue
+        errors = []
+        values = _clean_fields(item, errors)
+        if 'title' not in values:
+            errors.append('El título es obligatorio')
+        if not _is_ref(item.get('project_id')) or item['project_id'] not in owned:
+            errors.append('Proyecto inexistente o sin permiso')
+        if item.get('assigned_to') is not None and (
+            not _is_ref(item['assigned_to']) or item['assigned_to'] not in known_users
+        ):
+            errors.append('Usuario asignado inexistente')
+        values.setdefault('status', 'pending')
+        values.setdefault('priority', 'medium')
+        values.update(
+            project_id=item.get('project_id'),
+            assigned_to=item.get('assigned_to'),
+            created_by=user_id,
+            created_at=now,
+            updated_at=now,
+            completed_at=now if values['status'] == 'completed' else None
+        )
+        results.append(_result(index, errors=errors))
+        rows.append(values)
+    _check(results)
+
+    ids = db.session.execute(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+
+    affected, counted = {}, []
+    for result, task_id, row in zip(results, ids, rows):
+        result['id'] = task_id
+        _track(affected, task_id, user_id, row['assigned_to'], user_id)
+        counted.append((_counted(row), +1))
+    _commit(affected, UPSERT, counted)
+    return results
+
+def bulk_update(user_id, items, now=None):
+    """Actualiza campos de tareas visibles con bulk_update_mappings (executemany)"""
+    _check_size(items)
+    now = now or datetime.now()
+    existing = _existing(user_id, {_item_id(item) for item in items} - {None})
+    repeated = _duplicates(items)
+
+    results, mappings = [], []
+    for index, item in enumerate(items):
+        task_id = _item_id(item)
+        current = existing.get(task_id)
+        if not isinstance(item, dict) or current is None:
+            results.append(_result(index, task_id, ['Tarea inexistente o sin permiso']))
+            continue
+        if index in repeated:
+            results.append(_result(index, task_id, ['Tarea repetida en el lote']))
+            continue
+        errors = []
+        values = _clean_fields({k: v for k, v in item.items() if k in UPDATABLE_FIELDS}, errors)
+        if not values:
+            errors.append('Sin campos que actualizar')
+        status = values.get('status', current.status)
+        values.update(
+            id=task_id,
+            updated_at=now,
+            completed_at=_completed_at(current.status, status, current.completed_at, now)
+        )
+        results.append(_result(index, task_id, errors))
+        mappings.append(values)
+    _check(results)
+
+    db.session.bulk_update_mappings(Task, mappings)
+
+    affected, counted = {}, []
+    for mapping in mappings:
+        row = existing[mapping['id']]
+        _track(affected, row.id, row.owner_id, row.assigned_to, row.created_by)
+        _count_change(counted, row, **mapping)
+    _commit(affected, UPSERT, counted)
+    return results
+
+def bulk_reassign(user_id, items, now=None):
+    """Cambia el asignado de tareas visibles; valida todos los usuarios destino en una consulta"""
+    _check_size(items)
+    now = now or datetime.now()
+    existing = _existing(user_id, {_item_id(item) for item in items} - {None})
+    repeated = _duplicates(items)
+    targets = _refs(items, 'assigned_to')
+    known_users = set(db.session.execute(select(User.id).where(User.id.in_(targets))).scalars())
+
+    results, mappings = [], []
+    for index, item in enumerate(items):
+        task_id = _item_id(item)
+        if not isinstance(item, dict) or task_id not in existing:
+            results.append(_result(index, task_id, ['Tarea inexistente o sin permiso']))
+            continue
+        if index in repeated:
+            results.append(_result(index, task_id, ['Tarea repetida en el lote']))
+            continue
+        assigned_to = item.get('assigned_to')
+        errors = []
+        if assigned_to is not None and (not _is_ref(assigned_to) or assigned_to not in known_users):
+            errors.append('Usuario asignado inexistente')
+        results.append(_result(index, task_id, errors))
+        mappings.append({'id': task_id, 'assigned_to': assigned_to, 'updated_at': now})
+    _check(results)
+
+    db.session.bulk_update_mappings(Task, mappings)
+
+    affected, counted = {}, []
+    for mapping in mappings:
+        row = existing[mapping['id']]
+        _track(affected, row.id, row.owner_id, row.assigned_to, row.created_by)
+        _track(affected, row.id, row.owner_id, mapping['assigned_to'], row.created_by)
+        _count_change(counted, row, assigned_to=mapping['assigned_to'])
+    _commit(affected, UPSERT, counted)
+    return results
+
+def bulk_delete(user_id, items):
+    """Borra tareas de proyectos propios con un único DELETE ... WHERE id IN (...)"""
+    _check_size(items)
+    existing = _existing(user_id, {_item_id(item) for item in items} - {None}, owner_only=True)
+    repeated = _duplicates(items)
+
+    results = []
+    for index, item in enumerate(items):
+        task_id = _item_id(item)
+        errors = None
+        if task_id not in existing:
+            errors = ['Tarea inexistente o sin permiso']
+        elif index in repeated:
+            errors = ['Tarea repetida en el lote']
+        results.append(_result(index, task_id, errors))
+    _check(results)
+
+    db.session.execute(
+        delete(Task).where(Task.id.in_(list(existing))).execution_options(synchronize_session=False)
+    )
+
+    affected, counted = {}, []
+    for row in existing.values():
+        _track(affected, row.id, row.owner_id, row.assigned_to, row.created_by)
+        counted.append((_counted(row._mapping), -1))
+    _commit(affected, DELETE, counted)
+    return results
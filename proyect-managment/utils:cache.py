@@ -0,0 +1,178 @@
+"""
+Caché de estadísticas por usuario
+LRU en memoria con TTL y backend opcional en disco compartido entre workers
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+class MemoryBackend:
+    """LRU en memoria del proceso con expiración por TTL"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class FileBackend:
+    """Backend en disco local: un fichero JSON por clave, visible para todos los workers"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{digest}.json')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                item = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if item['expires'] < time.time():
+            self.delete(key)
+            return None
+        return item['value']
+
+    def set(self, key, value, ttl):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'expires': time.time() + ttl, 'value': value}, f)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.json'))
+
+class StatsCache:
+    """Caché de estadísticas por usuario con contadores de aciertos y fallos"""
+
+    KINDS = ('dashboard', 'profile')
+
+    def __init__(self, backend, ttl=60, enabled=True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    @staticmethod
+    def key(kind, user_id):
+        return f'stats:{kind}:{user_id}'
+
+    def _incr(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def get_or_set(self, kind, user_id, compute):
+        """Devuelve el valor cacheado o lo calcula y lo guarda"""
+        if not self.enabled:
+            return compute()
+
+        key = self.key(kind, user_id)
+        value = self.backend.get(key)
+        if value is not None:
+            self._incr('hits')
+            return value
+
+        self._incr('misses')
+        from utils.replica import cache_ttl
+        value = compute()
+        # Calculado en la réplica si la petición lee de ella: no se guarda más que su retraso
+        self.backend.set(key, value, cache_ttl(self.ttl))
+        return value
+
+    def invalidate_user(self, user_id):
+        """Descarta todas las estadísticas cacheadas de un usuario"""
+        for kind in self.KINDS:
+            self.backend.delete(self.key(kind, user_id))
+        self._incr('invalidations')
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else 0.0
+        counters['entries'] = len(self.backend)
+        counters['backend'] = type(self.backend).__name__
+        return counters
+
+def init_stats_cache(app):
+    """Crea la caché según la configuración y la conecta a los eventos de los modelos"""
+    from models.events import on_users_changed
+
+    if app.config.get('STATS_CACHE_BACKEND', 'memory') == 'file':
+        directory = app.config.get('STATS_CACHE_DIR') or os.path.join(app.instance_path, 'stats_cache')
+        backend = FileBackend(directory)
+    else:
+        backend = MemoryBackend(app.config.get('STATS_CACHE_MAX_ENTRIES', 1024))
+
+    cache = StatsCache(
+        backend,
+        ttl=app.config.get('STATS_CACHE_TTL', 60),
+        enabled=app.config.get('STATS_CACHE_ENABLED', True)
+    )
+    app.extensions['stats_cache'] = cache
+
+    @on_users_changed(app)
+    def invalidate(user_ids):
+        for user_id in user_ids:
+            cache.invalidate_user(user_id)
+
+    return cache
+
+def get_stats_cache():
+    """Caché de la aplicación actual"""
+    from flask import current_app
+    return current_app.extensions['stats_cache']
@@ -0,0 +1,150 @@
+"""
+Motor de estadísticas del dashboard
+Calcula todos los contadores con agregados SQL en lugar de recorrer las tareas en Python
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import and_, case, func, select, union
+from models import db, Project, Task
+from models.counters import get_counter
+from models.archive import archived_count
+from models.deadlines import bucket_counts
+
+PROJECT_STATUSES = ('active', 'completed', 'archived')
+TASK_STATUSES = ('pending', 'in_progress', 'completed')
+PRIORITIES = ('high', 'medium', 'low')
+
+def _count_if(condition):
+    """Expresión SUM(CASE WHEN ... THEN 1 ELSE 0 END)"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+def visible_task_ids(user_id):
+    """Ids de tareas de sus proyectos UNION ids de tareas asignadas (dos búsquedas por índice)"""
+    owned = select(Task.id).join(Project, Task.project_id == Project.id).where(
+        Project.owner_id == user_id
+    )
+    assigned = select(Task.id).where(Task.assigned_to == user_id)
+    return union(owned, assigned)
+
+def visible_tasks_query(user_id):
+    """Tareas visibles para el usuario: de sus proyectos o asignadas a él"""
+    return Task.query.join(Project).filter(
+        Task.id.in_(visible_task_ids(user_id))
+    )
+
+def get_project_stats(user_id, now=None):
+    """Contadores de proyectos del usuario en una sola consulta agrupada"""
+    now = now or datetime.now()
+    week_ago = now - timedelta(days=7)
+
+    rows = db.session.query(
+        Project.status,
+        func.count(Project.id),
+        _count_if(Project.created_at >= week_ago)
+    ).filter(Project.owner_id == user_id).group_by(Project.status).all()
+
+    stats = {'total': 0, 'created_last_week': 0}
+    stats.update({status: 0 for status in PROJECT_STATUSES})
+    for status, total, created in rows:
+        stats['total'] += total
+        stats['created_last_week'] += created
+        if status in stats:
+            stats[status] = total
+    return stats
+
+def get_task_stats(user_id, now=None):
+    """Contadores de tareas (estado x prioridad, vencidas y actividad) en un solo agregado"""
+    now = now or datetime.now()
+    week_ago = now - timedelta(days=7)
+    is_open = Task.status != 'completed'
+    owned = Project.owner_id == user_id
+
+    columns = [func.count(Task.id).label('total')]
+    columns += [_count_if(Task.status == s).label(s) for s in TASK_STATUSES]
+    columns += [_count_if(and_(is_open, Task.priority == p)).label(f'open_{p}') for p in PRIORITIES]
+    columns += [
+        _count_if(and_(is_open, Task.due_date < now)).label('overdue'),
+        _count_if(and_(owned, Task.created_at >= week_ago)).label('created_last_week'),
+        _count_if(and_(owned, Task.completed_at >= week_ago)).label('completed_last_week')
+    ]
+
+    row = visible_tasks_query(user_id).with_entities(*columns).one()
+    return {key: int(value or 0) for key, value in row._mapping.items()}
+
+def get_dashboard_stats(user_id, now=None):
+    """Contadores completos del dashboard listos para la plantilla"""
+    now = now or datetime.now()
+    projects = get_project_stats(user_id, now)
+    tasks = get_task_stats(user_id, now)
+    # Las tareas archivadas ya no están en tasks: cuentan como completadas en los totales
+    archived = archived_count('visible', user_id)
+
+    task_stats = {
+        'total': tasks['total'] + archived,
+        'pending': tasks['pending'],
+        'in_progress': tasks['in_progress'],
+        'completed': tasks['completed'] + archived,
+        'overdue': tasks['overdue']
+    }
+
+    if task_stats['total'] > 0:
+        overall_progress = int((task_stats['completed'] / task_stats['total']) * 100)
+    else:
+        overall_progress = 0
+
+    return {
+        'project_stats': {
+            'total': projects['total'],
+            'active': projects['active'],
+            'completed': projects['completed'],
+            'archived': projects['archived']
+        },
+        'task_stats': task_stats,
+        'overall_progress': overall_progress,
+        'priority_stats': {p: tasks[f'open_{p}'] for p in PRIORITIES},
+        'deadline_buckets': bucket_counts(user_id),
+        'archived_tasks': archived,
+        'recent_activity': {
+            'projects_created': projects['created_last_week'],
+            'tasks_created': tasks['created_last_week'],
+            'tasks_completed': tasks['completed_last_week']
+        }
+    }
+
+def get_profile_stats(user_id):
+    """Estadísticas del perfil: proyectos propios y tareas creadas por el usuario"""
+    total_projects = Project.query.filter_by(owner_id=user_id).count()
+    counter = get_counter('creator', user_id)
+    archived = archived_count('creator', user_id)
+    total_tasks = (counter.total if counter else 0) + archived
+    completed_tasks = (counter.completed if counter else 0) + archived
+
+    return {
+        'total_projects': total_projects,
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'completion_rate': int((completed_tasks / total_tasks * 100)) if total_tasks > 0 else 0,
+        'archived_tasks': archived
+    }
+
+def get_recent_tasks(user_id, limit=5):
+    """Últimas tareas creadas (ORDER BY created_at DESC LIMIT n)"""
+    return visible_tasks_query(user_id).order_by(
+        Task.created_at.desc()
+    ).limit(limit).all()
+
+def get_upcoming_tasks(user_id, days=7, limit=5, now=None):
+    """Tareas pendientes que vencen en los próximos días (ORDER BY due_date LIMIT n)"""
+    now = now or datetime.now()
+    return visible_tasks_query(user_id).filter(
+        Task.status != 'completed',
+        Task.due_date >= now,
+        Task.due_date <= now + timedelta(days=days)
+    ).order_by(Task.due_date.asc()).limit(limit).all()
+
+def get_active_projects(user_id, limit=5):
+    """Proyectos activos actualizados más recientemente"""
+    return Project.query.filter_by(
+        owner_id=user_id,
+        status='active'
+    ).order_by(Project.updated_at.desc()).limit(limit).all()
@@ -0,0 +1,94 @@
+"""
+Perfiles del motor de base de datos
+SQLite: WAL y PRAGMAs en cada conexión; bases de datos servidor: QueuePool dimensionado con pre-ping y reciclado
+"""
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+
+# PRAGMA -> clave de configuración y valor por defecto
+SQLITE_PRAGMAS = {
+    'journal_mode': ('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': ('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': ('SQLITE_BUSY_TIMEOUT_MS', 5000),
+    'mmap_size': ('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+    'cache_size': ('SQLITE_CACHE_SIZE', -64000),
+    'temp_store': ('SQLITE_TEMP_STORE', 'MEMORY')
+}
+
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+def engine_options(config, uri=None):
+    """SQLALCHEMY_ENGINE_OPTIONS según el dialecto de la URI y el perfil del entorno"""
+    uri = uri or config['SQLALCHEMY_DATABASE_URI']
+    if is_sqlite(uri):
+        busy_timeout = config.get('SQLITE_BUSY_TIMEOUT_MS', 5000)
+        return {
+            'connect_args': {'timeout': busy_timeout / 1000, 'check_same_thread': False}
+        }
+    return {
+        'pool_size': config.get('DB_POOL_SIZE', 10),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 20),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True)
+    }
+
+def configure_engine_options(app):
+    """Rellena SQLALCHEMY_ENGINE_OPTIONS antes de db.init_app (sin pisar valores explícitos)"""
+    options = engine_options(app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    # Las binds adicionales (réplica) reciben el perfil de su propio dialecto. Dict nuevo: el de la
+    # configuración es un atributo de clase y modificarlo afectaría a las siguientes create_app
+    app.config['SQLALCHEMY_BINDS'] = {
+        key: {'url': bind, **engine_options(app.config, bind)} if isinstance(bind, str) else bind
+        for key, bind in (app.config.get('SQLALCHEMY_BINDS') or {}).items()
+    }
+    return options
+
+def sqlite_pragmas(config):
+    return {pragma: config.get(key, default) for pragma, (key, default) in SQLITE_PRAGMAS.items()}
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Aplica los PRAGMAs en cada conexión nueva del pool"""
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f'PRAGMA {pragma}={value}')
+        finally:
+            cursor.close()
+
+def init_db_tuning(app, db):
+    """Instala los eventos de conexión de cada motor SQLite, réplicas incluidas (tras db.init_app)"""
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                install_sqlite_pragmas(engine, sqlite_pragmas(app.config))
+
+def effective_settings(engine):
+    """Valores reales del motor: PRAGMAs leídos de una conexión o estado del pool"""
+    settings = {
+        'dialect': engine.dialect.name,
+        'pool': type(engine.pool).__name__,
+        'pool_status': engine.pool.status()
+    }
+    with engine.connect() as connection:
+        if engine.dialect.name == 'sqlite':
+            for pragma in SQLITE_PRAGMAS:
+                settings[pragma] = connection.execute(text(f'PRAGMA {pragma}')).scalar()
+        else:
+            pool = engine.pool
+            settings.update({
+                'pool_size': getattr(pool, 'size', lambda: None)(),
+                'max_overflow': getattr(pool, '_max_overflow', None),
+                'pool_timeout': getattr(pool, '_timeout', None),
+                'pool_recycle': getattr(pool, '_recycle', None),
+                'pool_pre_ping': getattr(pool, '_pre_ping', None)
+            })
+    return settings
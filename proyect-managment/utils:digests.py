@@ -0,0 +1,263 @@
+"""
+Resúmenes de tareas próximas a vencer
+Una consulta por rango de fecha límite sobre task_deadlines, agrupada por asignado mientras se lee
+(memoria acotada a un usuario), un correo por usuario y registro de (usuario, tarea, fecha límite)
+avisados para no reenviar nunca
+"""
+
+import abc
+import fcntl
+import logging
+import os
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from itertools import groupby
+from operator import attrgetter
+from sqlalchemy import and_, exists, select
+from models import db, Project, Task, User
+from models.deadlines import TaskDeadline
+from models.digests import DigestSent, claim, prune_sent, release
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+MAX_TASKS_PER_DIGEST = 50
+
+class DigestSender(abc.ABC):
+    """Interfaz de envío; se usa como contexto para reutilizar la conexión durante una ejecución"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @abc.abstractmethod
+    def send(self, message):
+        """Entrega un EmailMessage; cualquier excepción libera los avisos reservados"""
+
+class FileSender(DigestSender):
+    """Escribe cada resumen como .eml en un directorio (desarrollo y pruebas)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, message):
+        name = f"{message['X-Digest-User']}-{time.time_ns()}.eml"
+        with open(os.path.join(self.directory, name), 'wb') as f:
+            f.write(bytes(message))
+
+class SMTPSender(DigestSender):
+    """Envío SMTP con una sola conexión por ejecución (en local: python -m aiosmtpd -n -l localhost:1025)"""
+
+    def __init__(self, host='localhost', port=1025, username=None, password=None, use_tls=False):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self._smtp = None
+
+    def __enter__(self):
+        self._smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.use_tls:
+            self._smtp.starttls()
+        if self.username:
+            self._smtp.login(self.username, self.password)
+        return self
+
+    def __exit__(self, *exc):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+        return False
+
+    def send(self, message):
+        self._smtp.send_message(message)
+
+def digest_query(now, horizon):
+    """Tareas abiertas asignadas que vencen en [now, horizon) y aún no avisadas, por asignado
+
+    Rango sobre el índice (due_date, assigned_to) de task_deadlines; los pares ya avisados se
+    descartan en la misma consulta (NOT EXISTS por clave primaria de digest_sent)
+    """
+    already_sent = exists().where(and_(
+        DigestSent.user_id == TaskDeadline.assigned_to,
+        DigestSent.task_id == TaskDeadline.task_id,
+        DigestSent.due_date == TaskDeadline.due_date
+    ))
+    return select(
+        TaskDeadline.assigned_to.label('user_id'),
+        TaskDeadline.task_id,
+        TaskDeadline.due_date,
+        Task.title,
+        Project.name.label('project'),
+        User.email,
+        User.full_name,
+        User.username
+    ).join(Task, Task.id == TaskDeadline.task_id).join(
+        Project, Project.id == Task.project_id
+    ).join(User, User.id == TaskDeadline.assigned_to).where(
+        TaskDeadline.due_date >= now,
+        TaskDeadline.due_date < horizon,
+        User.is_active.is_(True),
+        ~already_sent
+    ).order_by(TaskDeadline.assigned_to, TaskDeadline.due_date)
+
+def render_digest(user, tasks, total, window_hours, sender_address):
+    """Correo de texto con las tareas del usuario ordenadas por fecha límite"""
+    message = EmailMessage()
+    message['Subject'] = f'{total} tareas vencen en las próximas {window_hours} h'
+    message['From'] = sender_address
+    message['To'] = user.email
+    message['X-Digest-User'] = str(user.user_id)
+
+    lines = [f'Hola {user.full_name or user.username},', '', 'Estas tareas asignadas a ti vencen pronto:', '']
+    lines += [f'- {task.due_date:%Y-%m-%d %H:%M}  {task.title} ({task.project})' for task in tasks]
+    if total > len(tasks):
+        lines.append(f'... y {total - len(tasks)} más')
+    lines += ['', 'Flask Project Manager']
+    message.set_content('\n'.join(lines))
+    return message
+
+class DigestService:
+    """Una ejecución: lee en streaming, agrupa por usuario, reclama sus avisos y envía"""
+
+    def __init__(self, sender, window_hours=24, sender_address='no-reply@localhost', batch_size=BATCH_SIZE):
+        self.sender = sender
+        self.window_hours = window_hours
+        self.sender_address = sender_address
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+
+    def run(self, now=None):
+        """Devuelve usuarios avisados, tareas incluidas, usuarios omitidos (ya reclamados) y fallos"""
+        now = now or datetime.now()
+        horizon = now + timedelta(hours=self.window_hours)
+        totals = {'users': 0, 'tasks': 0, 'skipped': 0, 'failed': 0}
+
+        # Una ejecución a la vez por proceso; entre procesos decide la reserva de avisos
+        with self._lock, self.sender, db.engine.connect() as reader:
+            # Lectura en una conexión propia: los commit de las reservas no cierran el cursor
+            result = reader.execution_options(yield_per=self.batch_size).execute(digest_query(now, horizon))
+            for _, rows in groupby(result, key=attrgetter('user_id')):
+                tasks, total, first = [], 0, None
+                for row in rows:
+                    first = first or row
+                    total += 1
+                    if len(tasks) < MAX_TASKS_PER_DIGEST:
+                        tasks.append(row)
+                self._deliver(first, tasks, total, now, totals)
+        return totals
+
+    def _deliver(self, user, tasks, total, now, totals):
+        # Solo se reservan las tareas listadas: las que quedan en "y N más" salen en el siguiente correo
+        pairs = [(task.task_id, task.due_date) for task in tasks]
+        if not claim(user.user_id, pairs, now):
+            totals['skipped'] += 1
+            return
+        try:
+            self.sender.send(render_digest(user, tasks, total, self.window_hours, self.sender_address))
+        except Exception:
+            logger.exception('No se pudo enviar el resumen al usuario %s', user.user_id)
+            release(user.user_id, pairs)
+            totals['failed'] += 1
+            return
+        totals['users'] += 1
+        totals['tasks'] += len(tasks)
+
+class DigestScheduler(threading.Thread):
+    """Hilo que lanza una ejecución cada interval segundos dentro del contexto de la aplicación"""
+
+    def __init__(self, app, service, interval):
+        super().__init__(name='digest-scheduler', daemon=True)
+        self.app = app
+        self.service = service
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    self.service.run()
+                    prune_sent(datetime.now())
+                except Exception:
+                    logger.exception('Fallo en la ejecución programada de resúmenes')
+                finally:
+                    db.session.remove()
+
+    def stop(self):
+        self._stopped.set()
+
+def _make_sender(app):
+    if app.config.get('DIGEST_SENDER', 'file') == 'smtp':
+        return SMTPSender(
+            app.config.get('DIGEST_SMTP_HOST', 'localhost'),
+            app.config.get('DIGEST_SMTP_PORT', 1025),
+            app.config.get('DIGEST_SMTP_USERNAME'),
+            app.config.get('DIGEST_SMTP_PASSWORD'),
+            app.config.get('DIGEST_SMTP_TLS', False)
+        )
+    directory = app.config.get('DIGEST_OUTBOX_DIR') or os.path.join(app.instance_path, 'outbox')
+    return FileSender(directory)
+
+def init_digests(app):
+    """Crea el servicio de resúmenes; el hilo programador lo arranca el punto de entrada del servidor"""
+    service = DigestService(
+        _make_sender(app),
+        window_hours=app.config.get('DIGEST_WINDOW_HOURS', 24),
+        sender_address=app.config.get('DIGEST_FROM', 'no-reply@localhost')
+    )
+    app.extensions['digests'] = service
+    return service
+
+def _elect_runner(app):
+    """True si este proceso es el único programador: cerrojo exclusivo sobre un fichero
+
+    El sistema lo suelta cuando el proceso termina, así que el worker que sustituye a uno
+    reciclado o caído lo vuelve a tomar al arrancar
+    """
+    path = os.path.join(app.instance_path, 'digest-scheduler.lock')
+    os.makedirs(app.instance_path, exist_ok=True)
+    handle = open(path, 'a')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        return False
+    # El descriptor abierto mantiene el cerrojo mientras viva el proceso
+    app.extensions['digest_scheduler_lock'] = handle
+    return True
+
+def start_digest_scheduler(app):
+    """Arranca el programador si DIGEST_SCHEDULER_ENABLED (un solo proceso servidor en la máquina)
+
+    Se llama desde post_worker_init de gunicorn o desde main(), nunca en create_app: los tests,
+    los comandos flask y el master de gunicorn (antes del fork) no deben tener el hilo.
+    Con varios workers solo lo arranca el que obtiene el cerrojo; el resto devuelve None
+    """
+    if not app.config.get('DIGEST_SCHEDULER_ENABLED', False):
+        return None
+    scheduler = app.extensions.get('digest_scheduler')
+    if scheduler is None:
+        if 'digest_scheduler_lock' not in app.extensions and not _elect_runner(app):
+            return None
+        scheduler = DigestScheduler(
+            app, app.extensions['digests'], app.config.get('DIGEST_INTERVAL_SECONDS', 3600)
+        )
+        scheduler.start()
+        app.extensions['digest_scheduler'] = scheduler
+    return scheduler
+
+def get_digest_service():
+    """Servicio de resúmenes de la aplicación actual"""
+    from flask import current_app
+    return current_app.extensions['digests']
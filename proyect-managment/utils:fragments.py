@@ -0,0 +1,166 @@
+"""
+Caché de fragmentos de plantilla
+Etiqueta {% cache 'nombre', ttl %}...{% endcache %} con LRU limitado en bytes; la clave incluye
+el usuario y su versión de datos (última secuencia del registro de cambios), así que cualquier
+escritura en sus proyectos o tareas invalida sus fragmentos en todos los workers
+La versión se consulta solo al renderizar la primera etiqueta de la petición: una página sin
+{% cache %} no paga la consulta
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from flask import g, has_request_context
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+class FragmentStore:
+    """LRU de HTML renderizado limitado por tamaño total en bytes, con TTL por entrada"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    self._remove(key)
+                self.counters['misses'] += 1
+                return None
+            self._data.move_to_end(key)
+            self.counters['hits'] += 1
+            return item[1]
+
+    def set(self, key, html, ttl):
+        cost = len(html.encode('utf-8'))
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.monotonic() + ttl, html, cost)
+            self.size += cost
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.counters['evictions'] += 1
+
+    def _remove(self, key):
+        _, _, cost = self._data.pop(key)
+        self.size -= cost
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            counters['entries'] = len(self._data)
+            counters['bytes'] = self.size
+        counters['max_bytes'] = self.max_bytes
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else 0.0
+        return counters
+
+def data_version(user_id):
+    """Versión de los datos del usuario, calculada una vez por petición"""
+    from models.changes import current_token
+
+    versions = g.setdefault('_data_versions', {})
+    if user_id not in versions:
+        versions[user_id] = current_token(user_id)
+    return versions[user_id]
+
+def _key_prefix():
+    from flask_login import current_user
+
+    if not has_request_context() or not current_user.is_authenticated:
+        return None
+    return f'{current_user.id}:{data_version(current_user.id)}'
+
+class FragmentCacheExtension(Extension):
+    """{% cache 'active_projects', 300 %} ... {% endcache %}"""
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_store=None, fragment_cache_ttl=300)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        if parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_cache_support', args), [], [], body
+        ).set_lineno(lineno)
+
+    def _cache_support(self, name, ttl, caller):
+        store = self.environment.fragment_store
+        prefix = _key_prefix() if store is not None else None
+        if prefix is None:
+            # Sin usuario no hay versión con la que invalidar: se renderiza siempre
+            return caller()
+
+        key = f'{prefix}:{name}'
+        html = store.get(key)
+        if html is None:
+            from utils.replica import cache_ttl
+            html = caller()
+            store.set(key, str(html), cache_ttl(ttl or self.environment.fragment_cache_ttl))
+        return Markup(html)
+
+class Lazy:
+    """Resultado de consulta diferido: solo se ejecuta si la plantilla lo recorre
+
+    Si el fragmento que lo usa sale de la caché, la consulta no llega a lanzarse
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._value = None
+        self._loaded = False
+
+    def _get(self):
+        if not self._loaded:
+            self._value = self._loader()
+            self._loaded = True
+        return self._value
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __len__(self):
+        return len(self._get())
+
+    def __bool__(self):
+        return bool(self._get())
+
+    def __getitem__(self, index):
+        return self._get()[index]
+
+def init_fragment_cache(app):
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    store = FragmentStore(app.config.get('FRAGMENT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    enabled = app.config.get('FRAGMENT_CACHE_ENABLED', True)
+    app.jinja_env.fragment_store = store if enabled else None
+    app.jinja_env.fragment_cache_ttl = app.config.get('FRAGMENT_CACHE_TTL', 300)
+    app.extensions['fragment_cache'] = store
+    return store
+
+def get_fragment_store():
+    """Almacén de fragmentos de la aplicación actual"""
+    from flask import current_app
+    return current_app.extensions['fragment_cache']
@@ -0,0 +1,123 @@
+"""
+Caché de identidades para Flask-Login
+Guarda una instantánea de las columnas de User y la vuelve a adjuntar a la sesión sin SELECT
+"""
+
+import os
+import threading
+from datetime import date, datetime
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from models import db, User
+from utils.cache import FileBackend, MemoryBackend
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    return value
+
+def _decode(value):
+    if isinstance(value, dict):
+        if '__datetime__' in value:
+            return datetime.fromisoformat(value['__datetime__'])
+        if '__date__' in value:
+            return date.fromisoformat(value['__date__'])
+    return value
+
+# Nunca se cachean (el backend en disco escribe JSON en claro); quedan sin cargar y,
+# si algo los lee, salen de la base de datos
+SECRET_COLUMNS = ('password_hash',)
+
+def snapshot(user):
+    """Valores de columna del usuario serializables en JSON (sin relaciones ni secretos)"""
+    return {
+        attr.key: _encode(getattr(user, attr.key))
+        for attr in inspect(User).column_attrs
+        if attr.key not in SECRET_COLUMNS
+    }
+
+def restore(values):
+    """Instancia persistente a partir de la instantánea; relaciones y secretos se cargan al usarse"""
+    user = User(**{
+        key: _decode(value) for key, value in values.items() if key not in SECRET_COLUMNS
+    })
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+class IdentityCache:
+    """Instantáneas de User por id con TTL acotado, invalidadas al cambiar la fila"""
+
+    def __init__(self, backend, ttl=30, enabled=True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    @staticmethod
+    def key(user_id):
+        return f'identity:{user_id}'
+
+    def _incr(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def load(self, user_id):
+        """Usuario para el user_loader: instantánea cacheada o un SELECT por clave primaria"""
+        if not self.enabled:
+            return db.session.get(User, user_id)
+
+        values = self.backend.get(self.key(user_id))
+        if values is not None:
+            self._incr('hits')
+            return restore(values)
+
+        self._incr('misses')
+        user = db.session.get(User, user_id)
+        if user is not None:
+            self.backend.set(self.key(user_id), snapshot(user), self.ttl)
+        return user
+
+    def invalidate(self, user_id):
+        self.backend.delete(self.key(user_id))
+        self._incr('invalidations')
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else 0.0
+        counters['entries'] = len(self.backend)
+        counters['backend'] = type(self.backend).__name__
+        return counters
+
+def init_identity_cache(app):
+    """Crea la caché de identidades y la invalida con los cambios de filas de User"""
+    from models.events import on_identity_changed
+
+    if app.config.get('USER_CACHE_BACKEND', 'memory') == 'file':
+        directory = app.config.get('USER_CACHE_DIR') or os.path.join(app.instance_path, 'identity_cache')
+        backend = FileBackend(directory)
+    else:
+        backend = MemoryBackend(app.config.get('USER_CACHE_MAX_ENTRIES', 4096))
+
+    cache = IdentityCache(
+        backend,
+        ttl=app.config.get('USER_CACHE_TTL', 30),
+        enabled=app.config.get('USER_CACHE_ENABLED', True)
+    )
+    app.extensions['identity_cache'] = cache
+
+    @on_identity_changed(app)
+    def invalidate(user_ids):
+        for user_id in user_ids:
+            cache.invalidate(user_id)
+
+    return cache
+
+def get_identity_cache():
+    """Caché de identidades de la aplicación actual"""
+    from flask import current_app
+    return current_app.extensions['identity_cache']
@@ -0,0 +1,105 @@
+"""
+Paginación por cursor (keyset) y selección de campos para la API
+El cursor codifica la última clave (updated_at, id) vista: cada página es una búsqueda por índice, sin OFFSET
+"""
+
+import base64
+import hashlib
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_, select
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(values):
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """(updated_at, id) a partir del cursor opaco"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        updated_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(updated_at), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+def decode_keyset(cursor, sort_is_datetime):
+    """(valor de orden, id) de un cursor con columna de orden arbitraria"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if sort_is_datetime:
+            value = datetime.fromisoformat(value)
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+def keyset_after(sort_column, id_column, value, row_id, descending=False):
+    """Condición 'después del cursor' para ORDER BY sort_column, id en el sentido indicado"""
+    if descending:
+        return or_(sort_column < value, and_(sort_column == value, id_column < row_id))
+    return or_(sort_column > value, and_(sort_column == value, id_column > row_id))
+
+def parse_limit(value):
+    try:
+        limit = int(value) if value else DEFAULT_LIMIT
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    return max(1, min(limit, MAX_LIMIT))
+
+def parse_fields(value, available, required=('id', 'updated_at')):
+    """Campos pedidos en ?fields= (o todos); siempre incluye las columnas del cursor"""
+    if not value:
+        names = list(available)
+    else:
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError(f"Campos desconocidos: {', '.join(unknown)}")
+    for name in required:
+        if name not in names:
+            names.append(name)
+    return names
+
+def keyset_select(columns, updated_column, id_column, where=(), cursor=None, limit=DEFAULT_LIMIT):
+    """SELECT de una página ordenada por (updated_at, id) con solo las columnas pedidas
+
+    Pide limit + 1 filas para saber si hay página siguiente sin contar
+    """
+    stmt = select(*[column.label(name) for name, column in columns.items()]).where(*where)
+    if cursor:
+        updated_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            updated_column > updated_at,
+            and_(updated_column == updated_at, id_column > row_id)
+        ))
+    return stmt.order_by(updated_column, id_column).limit(limit + 1)
+
+def split_page(rows, limit):
+    """Filas de la página como dicts y cursor de la siguiente (None en la última)"""
+    rows = [dict(row._mapping) for row in rows]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor((rows[-1]['updated_at'], rows[-1]['id'])) if has_more else None
+    return rows, next_cursor
+
+def page_etag(rows, fields, next_cursor):
+    """ETag débil de la página: claves (id, updated_at), campos y cursor siguiente"""
+    digest = hashlib.sha1()
+    digest.update(','.join(fields).encode('utf-8'))
+    digest.update((next_cursor or '').encode('utf-8'))
+    for row in rows:
+        updated_at = row['updated_at']
+        digest.update(f"{row['id']}:{updated_at.isoformat() if updated_at else ''};".encode('utf-8'))
+    return digest.hexdigest()
+
+def serialize(rows):
+    return [
+        {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+        for row in rows
+    ]
@@ -0,0 +1,133 @@
+"""
+Servicio de hashing de contraseñas
+bcrypt en un pool de hilos acotado (bcrypt libera el GIL) con contrapresión, métricas y rehash al cambiar el coste
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import bcrypt
+
+class HasherBusy(RuntimeError):
+    """Hay demasiados hashes en curso: el llamante debe responder 503 en lugar de encolar"""
+
+class PasswordHasher:
+    """bcrypt con coste configurable ejecutado en un pool de tamaño fijo"""
+
+    def __init__(self, rounds=12, workers=None, max_pending=64, timeout=10):
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count() or 2
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='kdf')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self.counters = {'hashes': 0, 'verifications': 0, 'rehashes': 0, 'rejected': 0, 'seconds': 0.0}
+
+    def _incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            self._incr('rejected')
+            raise HasherBusy()
+        start = time.perf_counter()
+        try:
+            future = self._pool.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # El hueco se libera cuando bcrypt termina de verdad, no cuando el llamante deja de esperar
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            self._incr('rejected')
+            raise HasherBusy()
+        self._incr('seconds', time.perf_counter() - start)
+        return result
+
+    def record_rehash(self):
+        self._incr('rehashes')
+
+    def hash(self, password, rounds=None):
+        self._incr('hashes')
+        salt = bcrypt.gensalt(rounds or self.rounds)
+        return self._run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password, password_hash):
+        self._incr('verifications')
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    @staticmethod
+    def is_bcrypt(password_hash):
+        return bool(password_hash) and password_hash.startswith(('$2a$', '$2b$', '$2y$'))
+
+    def needs_rehash(self, password_hash):
+        """True si el hash no es bcrypt o su coste difiere del configurado"""
+        if not self.is_bcrypt(password_hash):
+            return True
+        return int(password_hash.split('$')[2]) != self.rounds
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        operations = counters['hashes'] + counters['verifications']
+        counters['avg_ms'] = round(counters['seconds'] * 1000 / operations, 2) if operations else 0.0
+        counters['rounds'] = self.rounds
+        counters['workers'] = self.workers
+        return counters
+
+def calibrate(target_ms=250, min_rounds=10, max_rounds=16, samples=3):
+    """Mide bcrypt en este host; devuelve el mayor coste bajo el objetivo y los tiempos por coste"""
+    timings = {}
+    chosen = min_rounds
+    password = b'benchmark-password'
+    for rounds in range(min_rounds, max_rounds + 1):
+        salt = bcrypt.gensalt(rounds)
+        elapsed = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            bcrypt.hashpw(password, salt)
+            elapsed.append((time.perf_counter() - start) * 1000)
+        timings[rounds] = round(sorted(elapsed)[len(elapsed) // 2], 1)
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+def set_user_password(user, password):
+    """Sustituto de User.set_password que calcula el hash en el pool"""
+    user.password_hash = get_password_hasher().hash(password)
+
+def verify_user_password(user, password):
+    """Comprueba la contraseña y, si el hash es antiguo o de otro coste, lo rehace (sin commit)
+
+    Un usuario restaurado de la caché de identidades no trae password_hash: se carga al leerlo
+    """
+    hasher = get_password_hasher()
+    if hasher.is_bcrypt(user.password_hash):
+        valid = hasher.verify(password, user.password_hash)
+    else:
+        # Hashes previos al servicio: se validan con el método original del modelo y se migran
+        valid = user.check_password(password)
+    if valid and hasher.needs_rehash(user.password_hash):
+        user.password_hash = hasher.hash(password)
+        hasher.record_rehash()
+    return valid
+
+def init_password_hasher(app):
+    hasher = PasswordHasher(
+        rounds=app.config.get('BCRYPT_LOG_ROUNDS', 12),
+        workers=app.config.get('PASSWORD_HASH_WORKERS'),
+        max_pending=app.config.get('PASSWORD_HASH_MAX_PENDING', 64),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+    )
+    app.extensions['password_hasher'] = hasher
+    return hasher
+
+def get_password_hasher():
+    """Servicio de hashing de la aplicación actual"""
+    from flask import current_app
+    return current_app.extensions['password_hasher']
@@ -0,0 +1,145 @@
+"""
+Perfilado de peticiones e instrumentación SQL
+Opcional: si PROFILING_ENABLED es falso no se registra ningún evento ni hook (coste nulo)
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+_WHITESPACE = re.compile(r'\s+')
+
+class EndpointMetrics:
+    """Acumulados por endpoint, protegidos por un lock (workers con hilos)"""
+
+    FIELDS = ('requests', 'wall_seconds', 'sql_statements', 'sql_seconds', 'rows_loaded', 'n_plus_one')
+
+    # rows_loaded cuenta instancias ORM cargadas (evento 'load'); las filas de consultas Core,
+    # scalars() sobre columnas o agregados no pasan por ese evento y no se cuentan
+    HELP = {
+        'rows_loaded': 'Instancias ORM cargadas (no incluye filas Core ni consultas de columnas)'
+    }
+
+    def __init__(self, n_plus_one_threshold=5):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._data = {}
+        self._patterns = Counter()
+
+    def record(self, endpoint, profile, wall):
+        repeated = {
+            shape: count for shape, count in profile['shapes'].items()
+            if count >= self.n_plus_one_threshold
+        }
+        with self._lock:
+            totals = self._data.setdefault(endpoint, dict.fromkeys(self.FIELDS, 0))
+            totals['requests'] += 1
+            totals['wall_seconds'] += wall
+            totals['sql_statements'] += profile['statements']
+            totals['sql_seconds'] += profile['sql_seconds']
+            totals['rows_loaded'] += profile['rows']
+            totals['n_plus_one'] += 1 if repeated else 0
+            for shape in repeated:
+                self._patterns[(endpoint, shape)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: dict(totals) for endpoint, totals in self._data.items()}, dict(self._patterns)
+
+    def prometheus(self):
+        """Exposición en formato de texto de Prometheus"""
+        data, patterns = self.snapshot()
+        lines = []
+        for field in self.FIELDS:
+            name = f'app_endpoint_{field}_total'
+            if field in self.HELP:
+                lines.append(f'# HELP {name} {self.HELP[field]}')
+            lines.append(f'# TYPE {name} counter')
+            for endpoint, totals in sorted(data.items()):
+                lines.append(f'{name}{{endpoint="{endpoint}"}} {totals[field]}')
+        lines.append('# TYPE app_n_plus_one_pattern_total counter')
+        for (endpoint, shape), count in sorted(patterns.items(), key=lambda item: -item[1])[:50]:
+            label = shape[:200].replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'app_n_plus_one_pattern_total{{endpoint="{endpoint}",statement="{label}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+def _current_profile():
+    if not has_request_context():
+        return None
+    return g.get('_profile')
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile() is not None:
+        conn.info.setdefault('_profile_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile()
+    if profile is None:
+        return
+    stack = conn.info.get('_profile_start')
+    if not stack:
+        return
+    profile['sql_seconds'] += time.perf_counter() - stack.pop()
+    profile['statements'] += 1
+    profile['shapes'][_WHITESPACE.sub(' ', statement).strip()] += 1
+
+def _instance_loaded(target, context):
+    profile = _current_profile()
+    if profile is not None:
+        profile['rows'] += 1
+
+def init_profiling(app):
+    """Registra los eventos SQL y los hooks de Flask si el perfilado está activado"""
+    if not app.config.get('PROFILING_ENABLED', False):
+        return None
+
+    from models import db
+
+    metrics = EndpointMetrics(app.config.get('PROFILING_N_PLUS_ONE_THRESHOLD', 5))
+    app.extensions['profiling'] = metrics
+
+    # Todas las binds: las lecturas @read_only van a la réplica y también deben contarse
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(db.Model, 'load', _instance_loaded, propagate=True)
+
+    @app.before_request
+    def _start_profile():
+        g._profile = {
+            'start': time.perf_counter(),
+            'statements': 0,
+            'sql_seconds': 0.0,
+            'rows': 0,
+            'shapes': Counter()
+        }
+
+    @app.after_request
+    def _server_timing(response):
+        profile = g.get('_profile')
+        if profile is not None:
+            wall_ms = (time.perf_counter() - profile['start']) * 1000
+            sql_ms = profile['sql_seconds'] * 1000
+            response.headers['Server-Timing'] = (
+                f'db;dur={sql_ms:.1f};desc="{profile["statements"]} queries", '
+                f'app;dur={wall_ms:.1f}'
+            )
+        return response
+
+    @app.teardown_request
+    def _finish_profile(exc):
+        profile = g.pop('_profile', None)
+        if profile is not None:
+            metrics.record(request.endpoint or 'unknown', profile, time.perf_counter() - profile['start'])
+
+    return metrics
+
+def get_profiling_metrics():
+    """Métricas de la aplicación actual (None si el perfilado está desactivado)"""
+    from flask import current_app
+    return current_app.extensions.get('profiling')
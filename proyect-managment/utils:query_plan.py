@@ -0,0 +1,78 @@
+"""
+Comprobación de planes de consulta (EXPLAIN QUERY PLAN en SQLite)
+Ejecuta las consultas calientes, captura su SQL y falla si alguna recorre una tabla completa
+"""
+
+import re
+from contextlib import contextmanager
+from sqlalchemy import event
+from models import db
+
+# 'SCAN tasks' (SQLite >= 3.36) o 'SCAN TABLE tasks' (versiones anteriores); también
+# 'SCAN tasks USING INDEX ...', que recorre el índice entero sin acotar por clave
+_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)')
+
+def hot_queries(user_id, now=None):
+    """Funciones de lectura de los caminos calientes (nombre, llamada)"""
+    from utils.dashboard_stats import (
+        get_dashboard_stats,
+        get_profile_stats,
+        get_recent_tasks,
+        get_upcoming_tasks,
+        get_active_projects
+    )
+    return [
+        ('dashboard_stats', lambda: get_dashboard_stats(user_id, now)),
+        ('profile_stats', lambda: get_profile_stats(user_id)),
+        ('recent_tasks', lambda: get_recent_tasks(user_id)),
+        ('upcoming_tasks', lambda: get_upcoming_tasks(user_id, now=now)),
+        ('active_projects', lambda: get_active_projects(user_id))
+    ]
+
+@contextmanager
+def capture_statements(engine):
+    """Registra las sentencias SELECT (sql, parámetros) emitidas dentro del bloque"""
+    captured = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            captured.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', _before)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, 'before_cursor_execute', _before)
+
+def explain(connection, statement, parameters=()):
+    """Líneas 'detail' del plan de SQLite para una sentencia"""
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters or ())
+    return [row[-1] for row in rows]
+
+def full_scans(plan, tables):
+    """Tablas del esquema que el plan recorre completas"""
+    scanned = []
+    for detail in plan:
+        match = _SCAN.match(detail)
+        if match and match.group(1) in tables:
+            scanned.append(detail)
+    return scanned
+
+def check_query_plans(user_id=1, now=None, engine=None):
+    """Ejecuta las consultas calientes y devuelve las que provocan un recorrido completo"""
+    engine = engine or db.engine
+    if engine.dialect.name != 'sqlite':
+        raise RuntimeError('EXPLAIN QUERY PLAN solo está disponible en SQLite')
+
+    tables = set(db.metadata.tables)
+    violations = []
+    with engine.connect() as connection:
+        for name, call in hot_queries(user_id, now):
+            with capture_statements(engine) as captured:
+                call()
+            for statement, parameters in captured:
+                scans = full_scans(explain(connection, statement, parameters), tables)
+                if scans:
+                    violations.append({'query': name, 'sql': statement, 'scans': scans})
+    db.session.rollback()
+    return violations
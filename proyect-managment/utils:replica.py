@@ -0,0 +1,106 @@
+"""
+Enrutado de lecturas a una réplica
+Los endpoints marcados con @read_only envían sus SELECT a la bind 'replica'; tras una escritura
+el usuario queda fijado al primario unos segundos (read-your-writes) mediante su cookie de sesión
+
+Solo cuentan como escritura las que tocan Project, Task o User: flush de esas filas, sentencias ORM
+sobre ellas y los avisos de models.events, que cubren también las escrituras masivas sin flush.
+Los commits incidentales (reservas de resúmenes, colas) no fijan al primario
+
+Un valor cacheado a partir de una lectura de la réplica vive como mucho READ_REPLICA_MAX_LAG_SECONDS:
+si la réplica iba retrasada, el dato viejo no se sirve durante todo el TTL de la caché
+"""
+
+import time
+from flask import current_app, g, has_request_context, request, session
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+REPLICA_BIND = 'replica'
+_PIN_KEY = '_primary_until'
+
+def read_only(view):
+    """Marca una vista como de solo lectura: puede leer de la réplica
+
+    La marca es un atributo de la función; functools.wraps la copia a los decoradores exteriores
+    """
+    view._read_only = True
+    return view
+
+def reading_replica():
+    """True si las lecturas de esta petición van a la réplica"""
+    return has_request_context() and g.get('_replica_engine') is not None and not g.get('_wrote')
+
+def cache_ttl(ttl):
+    """TTL para un valor calculado en esta petición: acotado al retraso de la réplica si se leyó de ella"""
+    if reading_replica():
+        return min(ttl, current_app.config.get('READ_REPLICA_MAX_LAG_SECONDS', 5))
+    return ttl
+
+def _tracked():
+    from models import Project, Task, User
+    return (Project, Task, User)
+
+def _route_reads(orm_execute_state):
+    if not has_request_context():
+        return
+    if not orm_execute_state.is_select:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, _tracked()):
+            g._wrote = True
+        return
+    if g.get('_wrote'):
+        return
+    engine = g.get('_replica_engine')
+    if engine is not None and 'bind' not in orm_execute_state.bind_arguments:
+        orm_execute_state.bind_arguments['bind'] = engine
+
+def _mark_flush(session, flush_context):
+    if not has_request_context() or g.get('_wrote'):
+        return
+    tracked = _tracked()
+    if any(isinstance(obj, tracked) for obj in (*session.new, *session.dirty, *session.deleted)):
+        g._wrote = True
+
+def _mark_write(user_ids):
+    if has_request_context():
+        g._wrote = True
+
+def _install_listeners():
+    """Eventos de Session registrados una sola vez por proceso, aunque se creen varias aplicaciones"""
+    if not event.contains(Session, 'do_orm_execute', _route_reads):
+        event.listen(Session, 'do_orm_execute', _route_reads)
+        event.listen(Session, 'after_flush', _mark_flush)
+
+def init_read_replica(app, db):
+    """Activa el enrutado si SQLALCHEMY_BINDS define la bind 'replica'"""
+    if REPLICA_BIND not in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        return None
+
+    pin_seconds = app.config.get('READ_REPLICA_PIN_SECONDS', 5)
+    with app.app_context():
+        replica = db.engines[REPLICA_BIND]
+
+    _install_listeners()
+    # bulk_update_mappings y connection().execute no hacen flush ni pasan por do_orm_execute:
+    # sus avisos explícitos (notify_users_changed / notify_identity_changed) marcan la escritura
+    from models.events import on_identity_changed, on_users_changed
+    on_users_changed(app)(_mark_write)
+    on_identity_changed(app)(_mark_write)
+
+    @app.before_request
+    def _choose_bind():
+        view = app.view_functions.get(request.endpoint)
+        if view is None or not getattr(view, '_read_only', False):
+            return
+        if session.get(_PIN_KEY, 0) > time.time():
+            return
+        g._replica_engine = replica
+
+    @app.after_request
+    def _pin_after_write(response):
+        if g.get('_wrote'):
+            session[_PIN_KEY] = time.time() + pin_seconds
+        return response
+
+    return replica
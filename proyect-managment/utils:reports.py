@@ -0,0 +1,316 @@
+"""
+Generación asíncrona de informes PDF
+Cola de trabajos en SQLite local, renderizado en un pool de procesos y caché en disco con expulsión por tamaño
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import func
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS report_jobs (
+    id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    filters TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+'''
+
+class ReportQueue:
+    """Cola de trabajos en un fichero SQLite compartido por todos los workers"""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            # Colas creadas antes de started_at
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(report_jobs)')}
+            if 'started_at' not in columns:
+                conn.execute('ALTER TABLE report_jobs ADD COLUMN started_at REAL')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_report_jobs_status ON report_jobs (status)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS report_recoveries (deployment TEXT PRIMARY KEY, at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, user_id, filters, cache_key, status=QUEUED):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO report_jobs (id, user_id, filters, cache_key, status, created_at, finished_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, user_id, json.dumps(filters, sort_keys=True), cache_key, status, now,
+                 now if status == DONE else None)
+            )
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM report_jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['filters'] = json.loads(job['filters'])
+        return job
+
+    def claim(self, job_id):
+        """Pasa el trabajo a 'running' solo si seguía en cola (un único proceso lo ejecuta)"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE report_jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?',
+                (RUNNING, time.time(), job_id, QUEUED)
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, job_id, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE report_jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+                (FAILED if error else DONE, error, time.time(), job_id)
+            )
+
+    def pending_ids(self):
+        with self._connect() as conn:
+            return [row['id'] for row in conn.execute(
+                'SELECT id FROM report_jobs WHERE status = ? ORDER BY created_at', (QUEUED,)
+            )]
+
+    def requeue_stale(self, older_than):
+        """Devuelve a la cola los trabajos que llevan más de older_than segundos en 'running' (proceso caído)
+
+        Cuenta desde que empezó a ejecutarse, no desde que se encoló: un trabajo que esperó mucho
+        en la cola y acaba de arrancar no se renderiza dos veces
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE report_jobs SET status = ?, started_at = NULL '
+                'WHERE status = ? AND COALESCE(started_at, created_at) < ?',
+                (QUEUED, RUNNING, time.time() - older_than)
+            )
+        return cursor.rowcount
+
+    def claim_recovery(self, deployment):
+        """True solo para el primer proceso que lo pide con este identificador de despliegue"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO report_recoveries (deployment, at) VALUES (?, ?)',
+                (str(deployment), time.time())
+            )
+        return cursor.rowcount == 1
+
+    def purge(self, older_than):
+        """Borra los trabajos terminados hace más de older_than segundos"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'DELETE FROM report_jobs WHERE status IN (?, ?) AND finished_at < ?',
+                (DONE, FAILED, time.time() - older_than)
+            )
+        return cursor.rowcount
+
+class ReportCache:
+    """PDFs renderizados en disco por clave; expulsa los menos usados al superar max_bytes"""
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.pdf')
+
+    def get(self, key):
+        """Ruta del PDF si existe; se actualiza su fecha de uso para la expulsión LRU"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, data):
+        tmp_path = f'{self.path(key)}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pdf'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def size(self):
+        return sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory) if name.endswith('.pdf')
+        )
+
+def report_tasks_query(user_id, filters):
+    """Tareas del informe: visibles para el usuario con los filtros de proyecto y estado"""
+    from models import Task
+    from utils.dashboard_stats import visible_tasks_query
+
+    query = visible_tasks_query(user_id)
+    if filters.get('project_id') is not None:
+        query = query.filter(Task.project_id == filters['project_id'])
+    if filters.get('status'):
+        query = query.filter(Task.status == filters['status'])
+    return query
+
+def data_version(user_id, filters):
+    """Versión de los datos del informe: número de tareas y última modificación"""
+    from models import Task
+
+    total, last_update = report_tasks_query(user_id, filters).with_entities(
+        func.count(Task.id), func.max(Task.updated_at)
+    ).one()
+    return f'{total}:{last_update.isoformat() if last_update else ""}'
+
+def cache_key(user_id, filters, version):
+    raw = json.dumps([user_id, filters, version], sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def render_report(user_id, filters):
+    """Bytes del PDF con export_tasks_to_pdf (reportlab)"""
+    from models import Task
+    from utils.exports import export_tasks_to_pdf
+
+    tasks = report_tasks_query(user_id, filters).order_by(Task.due_date.asc()).all()
+    output = export_tasks_to_pdf(tasks)
+    return output.getvalue() if hasattr(output, 'getvalue') else output
+
+# Estado de cada proceso del pool: aplicación propia creada tras el fork
+_worker_app = None
+
+def _init_worker(config_name):
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app(config_name)
+
+def _run_job(job_id):
+    service = _worker_app.extensions['reports']
+    with _worker_app.app_context():
+        service.execute(job_id)
+    return job_id
+
+class ReportService:
+    """Encola informes, los reparte al pool de procesos y sirve los resultados cacheados"""
+
+    def __init__(self, queue, cache, config_name, workers=2):
+        self.queue = queue
+        self.cache = cache
+        self.config_name = config_name
+        self.workers = workers
+        self.stale_after = 600
+        self._pool = None
+
+    def _executor(self):
+        # El pool se crea en el primer uso, después del fork de gunicorn
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.config_name,)
+            )
+        return self._pool
+
+    def submit(self, user_id, filters):
+        """Crea el trabajo; si el PDF de esta versión ya está en caché, nace terminado"""
+        key = cache_key(user_id, filters, data_version(user_id, filters))
+        if self.cache.get(key):
+            return self.queue.enqueue(user_id, filters, key, status=DONE)
+
+        job_id = self.queue.enqueue(user_id, filters, key)
+        self._executor().submit(_run_job, job_id)
+        return job_id
+
+    def execute(self, job_id):
+        """Renderiza un trabajo en cola (se ejecuta dentro del pool)"""
+        if not self.queue.claim(job_id):
+            return
+        job = self.queue.get(job_id)
+        try:
+            if not self.cache.get(job['cache_key']):
+                self.cache.put(job['cache_key'], render_report(job['user_id'], job['filters']))
+        except Exception as e:
+            self.queue.finish(job_id, error=str(e))
+        else:
+            self.queue.finish(job_id)
+
+    def resume_pending(self):
+        """Reenvía al pool los trabajos que quedaron en cola (p. ej. tras un reinicio)"""
+        pending = self.queue.pending_ids()
+        for job_id in pending:
+            self._executor().submit(_run_job, job_id)
+        return len(pending)
+
+    def recover(self, deployment, stale_after=None):
+        """Recuperación al arrancar, una vez por despliegue: reencola los trabajos huérfanos y los lanza
+
+        Devuelve los trabajos reenviados, o None si otro proceso ya la hizo
+        """
+        if not self.queue.claim_recovery(deployment):
+            return None
+        self.queue.requeue_stale(self.stale_after if stale_after is None else stale_after)
+        return self.resume_pending()
+
+    def result_path(self, job):
+        if job['status'] != DONE:
+            return None
+        return self.cache.get(job['cache_key'])
+
+def init_reports(app, config_name):
+    """Crea la cola y la caché de informes según la configuración"""
+    directory = app.config.get('REPORTS_DIR') or os.path.join(app.instance_path, 'reports')
+    os.makedirs(directory, exist_ok=True)
+
+    service = ReportService(
+        ReportQueue(os.path.join(directory, 'jobs.db')),
+        ReportCache(
+            os.path.join(directory, 'cache'),
+            max_bytes=app.config.get('REPORTS_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+        ),
+        config_name,
+        workers=app.config.get('REPORTS_WORKERS', 2)
+    )
+    service.stale_after = app.config.get('REPORTS_STALE_AFTER', 600)
+    app.extensions['reports'] = service
+    return service
+
+def get_report_service():
+    """Servicio de informes de la aplicación actual"""
+    from flask import current_app
+    return current_app.extensions['reports']
@@ -0,0 +1,115 @@
+"""
+Generador de datos a escala de producción
+Inserta usuarios, proyectos y tareas con distribuciones sesgadas (pocos usuarios concentran la mayoría) por lotes executemany
+"""
+
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from sqlalchemy import func, insert, select
+from models import db, User, Project, Task
+from models.counters import rebuild_counters
+from models.search import reindex
+from models.deadlines import rebuild as rebuild_deadlines
+from utils.passwords import get_password_hasher
+
+BATCH_SIZE = 5000
+USERNAME_PREFIX = 'load_user_'
+SEED_PASSWORD = 'LoadTest123!'
+
+PROJECT_STATUSES = (('active', 0.6), ('completed', 0.25), ('archived', 0.15))
+TASK_STATUSES = (('pending', 0.35), ('in_progress', 0.2), ('completed', 0.45))
+PRIORITIES = (('high', 0.2), ('medium', 0.5), ('low', 0.3))
+
+def _zipf_weights(n, s=1.1):
+    """Pesos acumulados 1/rango^s: el primer usuario es el más cargado"""
+    return list(accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+def _pick(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+def _insert_batches(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+def seed_scale(users, projects, tasks, seed=42, now=None):
+    """Genera el conjunto de datos; devuelve el número de filas insertadas por tabla"""
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    start_id = db.session.execute(
+        select(func.count(User.id)).where(User.username.like(f'{USERNAME_PREFIX}%'))
+    ).scalar()
+    # Un único hash para todos: bcrypt por fila dominaría el tiempo de carga
+    password_hash = get_password_hasher().hash(SEED_PASSWORD)
+
+    user_rows = [
+        {
+            'username': f'{USERNAME_PREFIX}{start_id + i}',
+            'email': f'{USERNAME_PREFIX}{start_id + i}@example.com',
+            'full_name': f'Usuario de carga {start_id + i}',
+            'role': 'user',
+            'is_active': True,
+            'password_hash': password_hash,
+            'created_at': now - timedelta(days=rng.randint(0, 1000))
+        }
+        for i in range(users)
+    ]
+    _insert_batches(User, user_rows)
+    user_ids = list(db.session.execute(
+        select(User.id).where(User.username.like(f'{USERNAME_PREFIX}%'))
+        .order_by(User.id.desc()).limit(users)
+    ).scalars())[::-1]
+
+    user_weights = _zipf_weights(len(user_ids))
+    project_rows = []
+    for i in range(projects):
+        created = now - timedelta(days=rng.randint(0, 900), minutes=rng.randint(0, 1440))
+        project_rows.append({
+            'name': f'Proyecto de carga {i}',
+            'description': f'Proyecto generado {i}',
+            'priority': _pick(rng, PRIORITIES),
+            'status': _pick(rng, PROJECT_STATUSES),
+            'owner_id': rng.choices(user_ids, cum_weights=user_weights)[0],
+            'created_at': created,
+            'updated_at': created + timedelta(days=rng.randint(0, 60))
+        })
+    _insert_batches(Project, project_rows)
+    project_ids = list(db.session.execute(
+        select(Project.id, Project.owner_id).where(Project.name.like('Proyecto de carga %'))
+        .order_by(Project.id.desc()).limit(projects)
+    ))
+
+    project_weights = _zipf_weights(len(project_ids), s=0.8)
+    task_rows = []
+    for i in range(tasks):
+        project_id, owner_id = rng.choices(project_ids, cum_weights=project_weights)[0]
+        status = _pick(rng, TASK_STATUSES)
+        created = now - timedelta(days=rng.randint(0, 700), minutes=rng.randint(0, 1440))
+        assignee = owner_id if rng.random() < 0.5 else rng.choices(user_ids, cum_weights=user_weights)[0]
+        task_rows.append({
+            'title': f'Tarea de carga {i}',
+            'description': f'Descripción de la tarea generada {i}',
+            'priority': _pick(rng, PRIORITIES),
+            'status': status,
+            'project_id': project_id,
+            'created_by': owner_id,
+            'assigned_to': assignee,
+            'due_date': now + timedelta(days=rng.randint(-60, 60)),
+            'created_at': created,
+            'updated_at': created + timedelta(days=rng.randint(0, 30)),
+            'completed_at': created + timedelta(days=rng.randint(1, 30)) if status == 'completed' else None
+        })
+        if len(task_rows) >= BATCH_SIZE:
+            _insert_batches(Task, task_rows)
+            task_rows = []
+    _insert_batches(Task, task_rows)
+    db.session.commit()
+
+    # Las inserciones en bloque no pasan por los eventos del ORM
+    rebuild_counters()
+    db.session.commit()
+    rebuild_deadlines(now)
+    reindex()
+
+    return {'users': users, 'projects': projects, 'tasks': tasks}
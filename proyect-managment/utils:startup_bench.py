@@ -0,0 +1,58 @@
+"""
+Medición del arranque en frío de un worker
+Lanza un proceso nuevo con python -X importtime que crea la aplicación y reporta tiempos de import y memoria
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+_CHILD = '''
+import json, os, resource, sys, time
+start = time.perf_counter()
+from app import create_app
+app = create_app(os.getenv("FLASK_ENV", "production"))
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# Linux informa en KiB, macOS en bytes
+rss_kb = rss // 1024 if sys.platform == "darwin" else rss
+print(json.dumps({"create_app_seconds": round(elapsed, 3), "max_rss_kb": rss_kb,
+                  "modules": len(sys.modules), "reportlab_loaded": "reportlab" in sys.modules}))
+'''
+
+def parse_importtime(stderr):
+    """[(módulo, self_us, cumulative_us, nivel)] a partir de la salida de -X importtime
+
+    El nivel sale de la sangría del nombre (dos espacios por nivel): un módulo de primer
+    nivel puede no tener punto en el nombre y aun así haber sido importado por otro
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, raw_name = line[len('import time:'):].split('|', 2)
+            name = raw_name.strip()
+            depth = (len(raw_name) - len(raw_name.lstrip(' ')) - 1) // 2
+            entries.append((name, int(self_us), int(cumulative_us), depth))
+        except ValueError:
+            continue
+    return entries
+
+def measure_startup(cwd=None, top=15):
+    """Arranque en frío en un proceso aparte: tiempo total, RSS y módulos más caros"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _CHILD],
+        cwd=cwd or os.getcwd(), capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    entries = parse_importtime(result.stderr)
+    # Los imports de nivel 0 llevan el acumulado de todo lo que importaron: sumar solo esos
+    top_level = [entry for entry in entries if entry[3] == 0]
+    report['import_seconds'] = round(sum(cumulative for _, _, cumulative, _ in top_level) / 1e6, 3)
+    report['slowest_imports'] = [
+        {'module': name, 'cumulative_ms': round(cumulative / 1000, 1)}
+        for name, _, cumulative, _ in sorted(top_level, key=lambda entry: -entry[2])[:top]
+    ]
+    return report
@@ -0,0 +1,99 @@
+"""
+Exportación CSV en streaming
+Lee las filas por lotes con cursor de servidor (yield_per) y emite el CSV por trozos con memoria constante
+"""
+
+import csv
+import io
+from sqlalchemy import select
+from models import db, Project, Task
+from utils.dashboard_stats import visible_task_ids
+
+BATCH_SIZE = 1000
+
+TASK_COLUMNS = (
+    ('id', Task.id),
+    ('title', Task.title),
+    ('description', Task.description),
+    ('status', Task.status),
+    ('priority', Task.priority),
+    ('project_id', Task.project_id),
+    ('project', Project.name),
+    ('assigned_to', Task.assigned_to),
+    ('due_date', Task.due_date),
+    ('created_at', Task.created_at),
+    ('completed_at', Task.completed_at)
+)
+
+PROJECT_COLUMNS = (
+    ('id', Project.id),
+    ('name', Project.name),
+    ('description', Project.description),
+    ('status', Project.status),
+    ('priority', Project.priority),
+    ('created_at', Project.created_at),
+    ('updated_at', Project.updated_at)
+)
+
+def tasks_export_query(user_id, project_id=None, status=None, date_from=None, date_to=None, after_id=None):
+    """Tareas visibles para el usuario ordenadas por id, con filtros opcionales"""
+    query = select(*[column for _, column in TASK_COLUMNS]).join(
+        Project, Task.project_id == Project.id
+    ).where(Task.id.in_(visible_task_ids(user_id)))
+
+    if project_id is not None:
+        query = query.where(Task.project_id == project_id)
+    if status:
+        query = query.where(Task.status == status)
+    if date_from is not None:
+        query = query.where(Task.created_at >= date_from)
+    if date_to is not None:
+        query = query.where(Task.created_at < date_to)
+    if after_id is not None:
+        query = query.where(Task.id > after_id)
+    return query.order_by(Task.id)
+
+def projects_export_query(user_id, status=None, date_from=None, date_to=None, after_id=None):
+    """Proyectos del usuario ordenados por id, con filtros opcionales"""
+    query = select(*[column for _, column in PROJECT_COLUMNS]).where(Project.owner_id == user_id)
+
+    if status:
+        query = query.where(Project.status == status)
+    if date_from is not None:
+        query = query.where(Project.created_at >= date_from)
+    if date_to is not None:
+        query = query.where(Project.created_at < date_to)
+    if after_id is not None:
+        query = query.where(Project.id > after_id)
+    return query.order_by(Project.id)
+
+def _format(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+def stream_csv(query, columns, batch_size=BATCH_SIZE, header=True):
+    """Generador de trozos CSV: una cabecera y luego un trozo por lote de filas"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if header:
+        writer.writerow([name for name, _ in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    result = db.session.execute(query.execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        writer.writerows([_format(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def stream_tasks_csv(user_id, batch_size=BATCH_SIZE, header=True, **filters):
+    return stream_csv(tasks_export_query(user_id, **filters), TASK_COLUMNS, batch_size, header)
+
+def stream_projects_csv(user_id, batch_size=BATCH_SIZE, header=True, **filters):
+    return stream_csv(projects_export_query(user_id, **filters), PROJECT_COLUMNS, batch_size, header)
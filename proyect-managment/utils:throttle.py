@@ -0,0 +1,206 @@
+"""
+Limitación de intentos de login por ventana deslizante
+Cuenta fallos por IP y por usuario y rechaza antes de consultar la base de datos o calcular el hash
+
+La IP es request.remote_addr: detrás de un proxy todos los clientes comparten la del proxy
+salvo que se configure PROXY_FIX_X_FOR con el número de proxies de confianza (ver create_app)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+
+class MemoryWindowStore:
+    """Búfer circular de marcas de tiempo por clave (deque con maxlen) y LRU de claves"""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(self, key, since):
+        with self._lock:
+            ring = self._data.get(key)
+            if ring is None:
+                return 0
+            while ring and ring[0] < since:
+                ring.popleft()
+            return len(ring)
+
+    def add(self, key, now, limit):
+        with self._lock:
+            ring = self._data.get(key)
+            if ring is None:
+                # Solo interesa saber si se llega al límite: no hace falta guardar más marcas
+                ring = self._data[key] = deque(maxlen=limit)
+            ring.append(now)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_keys:
+                self._data.popitem(last=False)
+
+    def oldest(self, key, since):
+        """Marca más antigua aún dentro de la ventana (None si no hay)"""
+        with self._lock:
+            ring = self._data.get(key)
+            if not ring:
+                return None
+            return next((ts for ts in ring if ts >= since), None)
+
+    def reset(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def purge(self, before):
+        """Olvida las claves cuya última marca ya salió de la ventana"""
+        with self._lock:
+            stale = [key for key, ring in self._data.items() if not ring or ring[-1] < before]
+            for key in stale:
+                del self._data[key]
+        return len(stale)
+
+    def __len__(self):
+        return len(self._data)
+
+class SQLiteWindowStore:
+    """Marcas de tiempo en un fichero SQLite compartido por todos los workers"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute('CREATE TABLE IF NOT EXISTS login_attempts (key TEXT NOT NULL, ts REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_login_attempts_key_ts ON login_attempts (key, ts)')
+        conn.commit()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def count(self, key, since):
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM login_attempts WHERE key = ? AND ts >= ?', (key, since)
+        ).fetchone()[0]
+
+    def add(self, key, now, limit):
+        conn = self._connect()
+        conn.execute('INSERT INTO login_attempts (key, ts) VALUES (?, ?)', (key, now))
+        # Conserva como mucho las últimas `limit` marcas de la clave
+        conn.execute(
+            'DELETE FROM login_attempts WHERE key = ? AND ts < ('
+            'SELECT ts FROM login_attempts WHERE key = ? ORDER BY ts DESC LIMIT 1 OFFSET ?)',
+            (key, key, limit - 1)
+        )
+
+    def oldest(self, key, since):
+        return self._connect().execute(
+            'SELECT MIN(ts) FROM login_attempts WHERE key = ? AND ts >= ?', (key, since)
+        ).fetchone()[0]
+
+    def reset(self, key):
+        self._connect().execute('DELETE FROM login_attempts WHERE key = ?', (key,))
+
+    def purge(self, before):
+        return self._connect().execute('DELETE FROM login_attempts WHERE ts < ?', (before,)).rowcount
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(DISTINCT key) FROM login_attempts').fetchone()[0]
+
+class LoginThrottle:
+    """Límites de fallos por IP y por usuario dentro de una ventana deslizante"""
+
+    def __init__(self, store, window=900, max_per_ip=20, max_per_user=5, enabled=True, purge_interval=300):
+        self.store = store
+        self.window = window
+        self.purge_interval = purge_interval
+        self._next_purge = time.time() + purge_interval
+        self.limits = {'ip': max_per_ip, 'user': max_per_user}
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.counters = {'checks': 0, 'rejected_ip': 0, 'rejected_user': 0, 'failures': 0, 'purged': 0}
+
+    def _incr(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    @staticmethod
+    def _keys(ip, username):
+        return {'ip': f'ip:{ip}', 'user': f'user:{(username or "").lower()}'}
+
+    def check(self, ip, username):
+        """Devuelve (permitido, segundos hasta que la marca más antigua salga de la ventana)"""
+        if not self.enabled:
+            return True, 0
+        self._incr('checks')
+        now = time.time()
+        since = now - self.window
+        for kind, key in self._keys(ip, username).items():
+            if self.store.count(key, since) >= self.limits[kind]:
+                self._incr(f'rejected_{kind}')
+                # Cada clave guarda como mucho `limit` marcas: al caducar la más antigua vuelve a haber hueco
+                oldest = self.store.oldest(key, since)
+                retry_after = self.window if oldest is None else oldest + self.window - now
+                return False, max(1, int(retry_after + 0.999))
+        return True, 0
+
+    def record_failure(self, ip, username):
+        if not self.enabled:
+            return
+        self._incr('failures')
+        now = time.time()
+        for kind, key in self._keys(ip, username).items():
+            self.store.add(key, now, self.limits[kind])
+        self._maybe_purge(now)
+
+    def _maybe_purge(self, now):
+        """Borra como mucho cada purge_interval segundos las marcas ya fuera de la ventana"""
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+        purged = self.store.purge(now - self.window)
+        with self._lock:
+            self.counters['purged'] += purged
+
+    def record_success(self, ip, username):
+        """Un login correcto limpia el contador del usuario (no el de la IP)"""
+        if self.enabled:
+            self.store.reset(self._keys(ip, username)['user'])
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        counters['tracked_keys'] = len(self.store)
+        counters['backend'] = type(self.store).__name__
+        counters['window'] = self.window
+        counters.update({f'max_per_{kind}': limit for kind, limit in self.limits.items()})
+        return counters
+
+def init_login_throttle(app):
+    if app.config.get('LOGIN_THROTTLE_BACKEND', 'memory') == 'sqlite':
+        path = app.config.get('LOGIN_THROTTLE_PATH') or os.path.join(app.instance_path, 'login_attempts.db')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        store = SQLiteWindowStore(path)
+    else:
+        store = MemoryWindowStore(app.config.get('LOGIN_THROTTLE_MAX_KEYS', 100000))
+
+    throttle = LoginThrottle(
+        store,
+        window=app.config.get('LOGIN_THROTTLE_WINDOW', 900),
+        max_per_ip=app.config.get('LOGIN_MAX_FAILURES_PER_IP', 20),
+        max_per_user=app.config.get('LOGIN_MAX_FAILURES_PER_USER', 5),
+        enabled=app.config.get('LOGIN_THROTTLE_ENABLED', True),
+        purge_interval=app.config.get('LOGIN_THROTTLE_PURGE_INTERVAL', 300)
+    )
+    app.extensions['login_throttle'] = throttle
+    return throttle
+
+def get_login_throttle():
+    """Limitador de login de la aplicación actual"""
+    from flask import current_app
+    return current_app.extensions['login_throttle']
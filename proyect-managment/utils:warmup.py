@@ -0,0 +1,55 @@
+"""
+Calentamiento de la aplicación antes de aceptar tráfico
+Compila las plantillas Jinja, abre conexiones del pool y compila las consultas calientes
+"""
+
+import time
+from sqlalchemy import text
+from models import db
+
+def compile_templates(app):
+    """Carga todas las plantillas en la caché de Jinja (se hereda tras el fork)"""
+    compiled = 0
+    for name in app.jinja_env.list_templates(extensions=('html',)):
+        app.jinja_env.get_template(name)
+        compiled += 1
+    return compiled
+
+def prime_connections(size=2):
+    """Abre a la vez hasta `size` conexiones y las devuelve al pool"""
+    connections = []
+    try:
+        for _ in range(size):
+            connection = db.engine.connect()
+            connection.execute(text('SELECT 1'))
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+def prime_queries():
+    """Ejecuta las lecturas del dashboard con un usuario inexistente para llenar la caché de SQL compilado"""
+    from utils.dashboard_stats import (
+        get_dashboard_stats,
+        get_profile_stats,
+        get_recent_tasks,
+        get_upcoming_tasks,
+        get_active_projects
+    )
+    for call in (get_dashboard_stats, get_profile_stats, get_recent_tasks,
+                 get_upcoming_tasks, get_active_projects):
+        call(0)
+    db.session.rollback()
+
+def warm_up(app, connections=True):
+    """Fase de calentamiento; devuelve lo que se ha hecho y cuánto ha tardado"""
+    start = time.perf_counter()
+    report = {'templates': compile_templates(app)}
+    with app.app_context():
+        if connections:
+            report['connections'] = prime_connections(app.config.get('WARMUP_CONNECTIONS', 2))
+            prime_queries()
+        db.session.remove()
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    return report
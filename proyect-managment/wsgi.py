@@ -0,0 +1,14 @@
+"""
+Punto de entrada WSGI para producción
+gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+from app import create_app
+from utils.warmup import warm_up
+
+app = create_app(os.getenv('FLASK_ENV', 'production'))
+
+# Con preload_app esto se ejecuta una vez en el master, antes del fork:
+# plantillas compiladas e imports quedan compartidos (copy-on-write) por todos los workers
+warm_up(app, connections=False)